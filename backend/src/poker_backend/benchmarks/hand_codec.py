@@ -0,0 +1,183 @@
+"""
+The packed hand encoding (models/hand_codec.py) against the column layout
+it replaced as the read path, on bot-played hands.
+
+    python -m poker_backend.benchmarks.hand_codec --hands 20000
+    python -m poker_backend.benchmarks.hand_codec --hands 20000 --db   # also row sizes and fetch+decode in Postgres
+
+Offline, the sizes are the text Postgres sends for each column. "before" is
+a row as it was written next to ``packed`` (every column in full), "now"
+is what HandRepository writes (the search projections plus ``packed``).
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+from typing import List
+
+from poker_backend.models.hand import Hand
+from poker_backend.models.hand_codec import decode, encode
+
+
+def _synthetic_hands(count: int, seed: int) -> List[Hand]:
+    """Bot-played hands (6 seats, real action logs) as they would be stored."""
+    import numpy as np
+    from poker_backend.services.bot_policies import make_policies
+    from poker_backend.services.self_play import SelfPlayTable
+
+    policies = make_policies(["random", "fixed:fold=0.2,call=0.5,raise=0.3", "random",
+                              "fixed:fold=0.4,call=0.4,raise=0.2", "random", "random"])
+    table = SelfPlayTable(policies, [10000] * 6, (50, 100), 0, np.random.default_rng(seed))
+    hands = []
+    while len(hands) < count:
+        entry = table.play_hand(log=True)
+        hands.append(Hand(None, entry["players"], entry["actions"], entry["board_cards"],
+                          [float(s) for s in entry["stacks"]], entry["winner_index"]))
+    return hands
+
+
+def _rate(n: int, seconds: float) -> str:
+    return f"{n / seconds:>12,.0f} hands/s  ({seconds * 1e6 / n:.2f} us/hand)"
+
+
+def _text_array(values) -> str:
+    return "{" + ",".join(str(v) for v in values) + "}"
+
+
+def _bench_offline(hands: List[Hand]):
+    """
+    Decodes both layouts from the text Postgres sends for them, through
+    psycopg's own loaders, so driver-side parsing (arrays, JSONB, NUMERIC
+    to Decimal) is counted without needing a server.
+    """
+    from psycopg import postgres
+    from psycopg.adapt import Transformer
+    from psycopg.pq import Format
+    from poker_backend.repositories.hand_repository import HandRepository
+    from poker_backend.repositories.hand_search import search_actions
+
+    tx = Transformer()
+    load_text_array = tx.get_loader(postgres.types["text"].array_oid, Format.TEXT).load
+    load_jsonb = tx.get_loader(postgres.types["jsonb"].oid, Format.TEXT).load
+    load_numeric_array = tx.get_loader(postgres.types["numeric"].array_oid, Format.TEXT).load
+    load_bytea = tx.get_loader(postgres.types["bytea"].oid, Format.TEXT).load
+
+    normalized = [HandRepository._normalize(h) for h in hands]
+    legacy = [
+        (_text_array(p).encode(), json.dumps(a).encode(), _text_array(b).encode(),
+         _text_array(repr(x) for x in st).encode(), w)
+        for p, a, b, st, w in normalized
+    ]
+    legacy_bytes = sum(len(p) + len(a) + len(b) + len(st) + 4 for p, a, b, st, w in legacy)
+    projection_bytes = sum(
+        len(p) + len(json.dumps(search_actions(n[1]))) + len(b) + 4
+        for (p, _, b, _, _), n in zip(legacy, normalized)
+    )
+
+    started = time.perf_counter()
+    packed = [encode(*n) for n in normalized]
+    encode_s = time.perf_counter() - started
+    packed_bytes = sum(len(b) for b in packed)
+    wire = [b"\\x" + blob.hex().encode() for blob in packed]
+
+    # Both sides keep their results and start from a collected heap, so GC cost is comparable
+    gc.collect()
+    started = time.perf_counter()
+    decoded = [
+        Hand(None, load_text_array(p), load_jsonb(a), load_text_array(b), [float(x) for x in load_numeric_array(st)], w)
+        for p, a, b, st, w in legacy
+    ]
+    legacy_s = time.perf_counter() - started
+    del decoded
+
+    gc.collect()
+    started = time.perf_counter()
+    decoded = [decode(load_bytea(blob)) for blob in wire]
+    packed_s = time.perf_counter() - started
+
+    mismatches = sum(
+        (d.players, d.actions, d.board_cards, d.stacks, d.winner_index) != n for d, n in zip(decoded, normalized)
+    )
+    n = len(hands)
+    print(f"Offline, {n} hands ({sum(len(h.actions) for h in hands) / n:.1f} actions/hand)")
+    print(f"  column bytes/hand    legacy {legacy_bytes / n:8.1f}   packed {packed_bytes / n:8.1f}")
+    print(f"  row bytes/hand       before {(legacy_bytes + packed_bytes) / n:8.1f}   "
+          f"now {(projection_bytes + packed_bytes) / n:8.1f}   (columns + packed)")
+    print(f"  encode packed        {_rate(n, encode_s)}")
+    print(f"  decode legacy        {_rate(n, legacy_s)}   (TEXT[] / JSONB / NUMERIC[] loaders + float())")
+    print(f"  decode packed        {_rate(n, packed_s)}   (bytea loader + decode)")
+    print(f"  round-trip mismatches: {mismatches}")
+    return packed
+
+
+def _bench_db(hands: List[Hand], packed: List[bytes]):
+    from psycopg.types.json import Jsonb
+    from poker_backend.db.connection import get_connection
+    from poker_backend.repositories.hand_repository import HandRepository, _row_to_hand
+    from poker_backend.repositories.hand_search import search_actions
+
+    with get_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            CREATE TEMP TABLE codec_bench (
+                hand_id BIGINT PRIMARY KEY,
+                players TEXT[], actions JSONB, board_cards TEXT[], stacks NUMERIC[], winner_index INT,
+                packed BYTEA, searched JSONB
+            );
+        """)
+        with cur.copy("COPY codec_bench FROM STDIN") as copy:
+            for i, (hand, blob) in enumerate(zip(hands, packed)):
+                p, a, b, st, w = HandRepository._normalize(hand)
+                copy.write_row((i, p, Jsonb(a), b, st, w, blob, Jsonb(search_actions(a))))
+        cur.execute("ANALYZE codec_bench;")
+        cur.execute("""
+            SELECT avg(pg_column_size(players) + pg_column_size(actions) + pg_column_size(board_cards)
+                       + pg_column_size(stacks) + pg_column_size(winner_index)),
+                   avg(pg_column_size(packed)),
+                   avg(pg_column_size(players) + pg_column_size(searched) + pg_column_size(board_cards)
+                       + pg_column_size(winner_index))
+            FROM codec_bench;
+        """)
+        legacy_size, packed_size, projection_size = cur.fetchone()
+
+        n = len(hands)
+        gc.collect()
+        started = time.perf_counter()
+        cur.execute("""
+            SELECT hand_id, NULL::timestamptz, NULL::bytea, players, actions, board_cards, stacks, winner_index
+            FROM codec_bench;
+        """)
+        decoded = [_row_to_hand(r) for r in cur.fetchall()]
+        legacy_s = time.perf_counter() - started
+        del decoded
+
+        gc.collect()
+        started = time.perf_counter()
+        cur.execute("SELECT hand_id, packed FROM codec_bench;")
+        decoded = [decode(blob, hand_id) for hand_id, blob in cur.fetchall()]
+        packed_s = time.perf_counter() - started
+
+    print("Postgres")
+    print(f"  stored bytes/hand    legacy {float(legacy_size):8.1f}   packed {float(packed_size):8.1f}")
+    print(f"  row bytes/hand       before {float(legacy_size + packed_size):8.1f}   "
+          f"now {float(projection_size + packed_size):8.1f}   (columns + packed)")
+    print(f"  fetch+decode legacy  {_rate(n, legacy_s)}")
+    print(f"  fetch+decode packed  {_rate(n, packed_s)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the packed hand encoding with the column layout.")
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", action="store_true", help="also measure row sizes and fetch+decode in Postgres")
+    args = parser.parse_args()
+
+    print(f"Generating {args.hands} self-play hands...", file=sys.stderr)
+    hands = _synthetic_hands(args.hands, args.seed)
+    packed = _bench_offline(hands)
+    if args.db:
+        _bench_db(hands, packed)
+
+
+if __name__ == "__main__":
+    main()
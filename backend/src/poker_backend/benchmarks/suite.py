@@ -0,0 +1,683 @@
+"""
+Benchmark suite for the simulation and persistence paths.
+
+    python -m poker_backend.benchmarks.suite run --out bench.json
+    python -m poker_backend.benchmarks.suite run --only simulate,batch --hands 5000 --seed 3
+    python -m poker_backend.benchmarks.suite compare baseline.json bench.json --threshold 0.10
+
+Groups (all by default):
+
+    simulate  PokerSimulationService.simulate_hand in-process, per hand kind
+              (see benchmarks/synthetic.py): latency percentiles and hands/s
+    batch     BatchSimulationService on the shared process pool vs. serial,
+              plus time to the first streamed entry
+    serialization
+              per-request parsing and response rendering of the /hand routes:
+              the typed request models and orjson listings ("typed", "orjson")
+              next to the untyped dict + ast.literal_eval + jsonable_encoder
+              path they replaced ("legacy"), with the speedup
+    repo      HandRepository save_hand / save_hands / get_hands_page /
+              get_all_hands against Postgres (DB_* settings)
+    http      the FastAPI app through an in-process ASGI client (needs httpx):
+              POST /hand/simulate (cache miss and hit), POST /hand/,
+              GET /hand/, GET /hand/search, GET /stats
+    deal      Dealer (services/dealer.py): one hand at a time vs. batches of
+              hands into NumPy arrays, next to rebuilding pokerkit's dealable
+              card list per seat (the dealing it replaced)
+    live      live tables (services/live_tables.py) without the socket: every
+              hand open at once, --concurrency clients acting round-robin,
+              per-action latency and diff size next to replaying the prefix
+              per click, and the memory one live table holds
+    ranges    POST /equity/ranges in-process (services/range_equity.py): a
+              wide range against a 3-bet range on K72 rainbow, cold (combo
+              pairs x runouts scored per second), cached, and cached under
+              other suits; next to one exact EquityService call per combo pair
+
+repo and http run in a scratch schema (bench_<pid>) that is dropped
+afterwards, so they never touch the real hands table. Groups that cannot run
+(no database, no httpx) are listed under "skipped" in the results.
+
+The input is generated from --seed, so two runs measure the same hands.
+compare matches benchmarks by name and flags a regression when a latency
+(mean/p50/p95) grew or a throughput shrank by more than --threshold; it
+exits with status 1 if any regression was found.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from poker_backend.benchmarks.synthetic import KINDS, generate, to_hand
+
+GROUPS = ("simulate", "batch", "serialization", "repo", "http", "deal", "live", "ranges")
+
+# Compared metrics and their direction
+LOWER_IS_BETTER = ("mean_ms", "p50_ms", "p95_ms")
+HIGHER_IS_BETTER = ("throughput_per_s",)
+
+
+class Skipped(Exception):
+    """A benchmark group cannot run in this environment."""
+
+
+# --- Measurement ---
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples: List[float], items: Optional[int] = None, elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Latency percentiles (ms) of per-call ``samples`` (seconds) and the
+    throughput of ``items`` over ``elapsed`` seconds (defaults: one item
+    per sample, sum of samples).
+    """
+    ordered = sorted(samples)
+    items = len(samples) if items is None else items
+    elapsed = sum(samples) if elapsed is None else elapsed
+    result = {"n": items}
+    if ordered:
+        result.update({
+            "mean_ms": round(sum(ordered) / len(ordered) * 1e3, 4),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1e3, 4),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1e3, 4),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1e3, 4),
+            "max_ms": round(ordered[-1] * 1e3, 4),
+        })
+    result["throughput_per_s"] = round(items / elapsed, 2) if elapsed > 0 else None
+    return result
+
+
+def _time_each(fn: Callable, args_list: List[Any]) -> List[float]:
+    gc.collect()
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+# --- Groups ---
+
+def bench_simulate(hands: int, seed: int, warmup: int) -> Dict[str, Any]:
+    from poker_backend.services.poker_service import PokerSimulationService
+
+    out = {}
+    for spec in generate(warmup, seed + 1):
+        PokerSimulationService.simulate_hand(spec)
+    for kind in KINDS:
+        specs = generate(hands, seed, kinds=[kind])
+        out[f"simulate.{kind}"] = summarize(_time_each(PokerSimulationService.simulate_hand, specs))
+    specs = generate(hands, seed)
+    out["simulate.mix"] = summarize(_time_each(PokerSimulationService.simulate_hand, specs))
+    return out
+
+
+def bench_batch(hands: int, seed: int, warmup: int) -> Dict[str, Any]:
+    from poker_backend.services.batch_service import BatchSimulationService, _simulate_chunk
+    from poker_backend.services.worker_pool import get_process_pool, pool_size, shutdown_process_pool
+
+    specs = generate(hands, seed)
+    out = {}
+
+    gc.collect()
+    started = time.perf_counter()
+    _simulate_chunk(0, specs)
+    out["batch.serial"] = summarize([], hands, time.perf_counter() - started)
+
+    # Worker start-up (spawn + imports) is measured on its own, not in the batch numbers
+    started = time.perf_counter()
+    get_process_pool()
+    BatchSimulationService.simulate_batch(generate(max(warmup, pool_size()), seed + 1), chunk_size=1)
+    out["batch.pool_startup"] = {"n": pool_size(), "seconds": round(time.perf_counter() - started, 3)}
+
+    try:
+        gc.collect()
+        started = time.perf_counter()
+        BatchSimulationService.simulate_batch(specs)
+        out["batch.pool"] = summarize([], hands, time.perf_counter() - started)
+        out["batch.pool"]["workers"] = pool_size()
+
+        gc.collect()
+        started = time.perf_counter()
+        first = None
+        for _ in BatchSimulationService.iter_batch(specs):
+            if first is None:
+                first = time.perf_counter() - started
+        out["batch.stream"] = summarize([], hands, time.perf_counter() - started)
+        out["batch.stream"]["first_result_ms"] = round((first or 0.0) * 1e3, 3)
+    finally:
+        shutdown_process_pool()
+    return out
+
+
+def _legacy_save(body: bytes):
+    # POST /hand/ before the typed models: untyped dict, literal_eval per stringified holding
+    import ast
+    from poker_backend.models.hand import Hand
+
+    data = json.loads(body)
+    players = []
+    for p in data.get("players", []):
+        if isinstance(p, str):
+            try:
+                players.append(ast.literal_eval(p))
+            except Exception:
+                players.append([p])
+        else:
+            players.append(p)
+    return Hand(None, players, data["actions"], data.get("board_cards", []), data["stacks"], data.get("winner_index"))
+
+
+def _typed_save(body: bytes):
+    from poker_backend.models.hand import Hand
+    from poker_backend.models.schemas import SaveHandRequest
+
+    # FastAPI decodes the body, then validates the model
+    req = SaveHandRequest.model_validate(json.loads(body))
+    return Hand(None, req.players, req.actions, req.board_cards, req.stacks, req.winner_index)
+
+
+def bench_serialization(hands: int, seed: int, warmup: int) -> Dict[str, Any]:
+    import uuid
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from pydantic import TypeAdapter
+    from poker_backend.models.schemas import SimulateRequest, SimulateResponse
+    from poker_backend.services.poker_service import PokerSimulationService
+
+    specs = generate(hands, seed)
+    out = {}
+
+    def pair(name: str, legacy: Callable, typed: Callable, inputs: List[Any], new_label: str = "typed"):
+        for fn in (legacy, typed):
+            for x in inputs[:warmup]:
+                fn(x)
+        out[f"serialization.{name}.legacy"] = before = summarize(_time_each(legacy, inputs))
+        out[f"serialization.{name}.{new_label}"] = after = summarize(_time_each(typed, inputs))
+        if after.get("mean_ms"):
+            after["speedup"] = round(before["mean_ms"] / after["mean_ms"], 2)
+
+    # Frontend-style saves: holdings as stringified lists
+    saves = []
+    for s in specs:
+        h = to_hand(s)
+        saves.append(json.dumps({"players": [str(list(p)) for p in s["players"]], "actions": h.actions,
+                                 "board_cards": h.board_cards, "stacks": h.stacks}).encode())
+    pair("save_parse", _legacy_save, _typed_save, saves)
+
+    bodies = [json.dumps(s).encode() for s in specs]
+    simulate_request = TypeAdapter(SimulateRequest)
+    pair("simulate_parse", json.loads, lambda b: simulate_request.validate_python(json.loads(b)), bodies)
+
+    results = [PokerSimulationService.simulate_hand(s) for s in specs[:min(hands, 500)]]
+    pair("simulate_response",
+         lambda r: JSONResponse(jsonable_encoder(r)).body,
+         lambda r: JSONResponse(SimulateResponse.model_validate(r).model_dump(mode="json", exclude_unset=True)).body,
+         results)
+
+    # GET /hand/ pages of the default size, as the repository returns them
+    now = datetime.now(timezone.utc)
+    rows = []
+    for s in specs:
+        h = to_hand(s)
+        h.hand_id, h.created_at = uuid.uuid4(), now
+        rows.append(h)
+    pages = [[h.to_dict() for h in rows[i:i + 100]] for i in range(0, max(len(rows) - 99, 1), 10)]
+    pair("list_page", lambda p: JSONResponse(jsonable_encoder(p)).body, lambda p: ORJSONResponse(p).body,
+         pages, new_label="orjson")
+    return out
+
+
+@contextmanager
+def scratch_schema() -> Iterator[str]:
+    """
+    Points every new connection (PGOPTIONS) at a fresh schema and drops it
+    on exit. Raises Skipped when Postgres is not reachable.
+    """
+    import psycopg
+    from poker_backend.db.connection import conninfo
+
+    schema = f"bench_{os.getpid()}"
+    try:
+        admin = psycopg.connect(conninfo(), autocommit=True, connect_timeout=5)
+    except psycopg.OperationalError as e:
+        raise Skipped(f"Postgres not reachable ({str(e).strip().splitlines()[0]})")
+    previous = os.environ.get("PGOPTIONS")
+    try:
+        admin.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+        admin.execute(f"CREATE SCHEMA {schema};")
+        os.environ["PGOPTIONS"] = f"-c search_path={schema},public"
+        yield schema
+    finally:
+        if previous is None:
+            os.environ.pop("PGOPTIONS", None)
+        else:
+            os.environ["PGOPTIONS"] = previous
+        admin.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+        admin.close()
+
+
+def bench_repo(hands: int, seed: int, warmup: int) -> Dict[str, Any]:
+    import uuid
+    from psycopg_pool import ConnectionPool
+    from poker_backend.db.connection import conninfo
+    from poker_backend.repositories.hand_repository import HandRepository
+
+    specs = generate(hands, seed)
+    out = {}
+    with scratch_schema(), ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        repo = HandRepository(pool)
+        repo.create_table()
+
+        singles = [to_hand(s) for s in specs[:min(hands, 500)]]
+        # save_hand prints every hand it saves; that is part of its cost but not of this output
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                for hand in [to_hand(s) for s in generate(warmup, seed + 1)]:
+                    repo.save_hand(hand)
+                out["repo.save_hand"] = summarize(_time_each(repo.save_hand, singles))
+            finally:
+                sys.stdout = stdout
+
+        bulk = [to_hand(s) for s in specs]
+        now = datetime.now(timezone.utc)
+        for hand in bulk:
+            hand.hand_id, hand.created_at = uuid.uuid4(), now
+        gc.collect()
+        started = time.perf_counter()
+        repo.save_hands(bulk)
+        out["repo.save_hands"] = summarize([], len(bulk), time.perf_counter() - started)
+
+        with pool.connection() as conn:
+            conn.execute("ANALYZE hands;")
+        out["repo.get_hands_page"] = summarize(_time_each(lambda _: repo.get_hands_page(100), range(50)))
+        gc.collect()
+        started = time.perf_counter()
+        total = len(repo.get_all_hands())
+        out["repo.get_all_hands"] = summarize([], total, time.perf_counter() - started)
+    return out
+
+
+async def _http(hands: int, seed: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    try:
+        import httpx
+    except ImportError:
+        raise Skipped("httpx is not installed (pip install httpx)")
+    from poker_backend.main import app
+
+    specs = generate(hands, seed)
+    out = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def measure(name: str, requests: List[Callable]):
+                queue = list(reversed(requests))
+                samples: List[float] = []
+                statuses: Dict[int, int] = {}
+
+                async def worker():
+                    while queue:
+                        send = queue.pop()
+                        started = time.perf_counter()
+                        response = await send()
+                        samples.append(time.perf_counter() - started)
+                        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+                gc.collect()
+                started = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                out[name] = summarize(samples, elapsed=time.perf_counter() - started)
+                out[name]["status"] = {str(k): v for k, v in sorted(statuses.items())}
+
+            def post(path, body):
+                return lambda: client.post(path, json=body)
+
+            def get(path):
+                return lambda: client.get(path)
+
+            for spec in generate(warmup, seed + 1):
+                await client.post("/hand/simulate", json=spec)
+            await measure("http.simulate_miss", [post("/hand/simulate", s) for s in specs])
+            await measure("http.simulate_hit", [post("/hand/simulate", s) for s in specs])
+
+            saves = []
+            for s in specs[:min(hands, 500)]:
+                h = to_hand(s)
+                saves.append(post("/hand/", {"players": h.players, "actions": h.actions,
+                                             "board_cards": h.board_cards, "stacks": h.stacks}))
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    await measure("http.save_hand", saves)
+                finally:
+                    sys.stdout = stdout
+
+            reads = max(20, min(hands, 200))
+            await measure("http.list_hands", [get("/hand/?limit=100") for _ in range(reads)])
+            await measure("http.search_hands", [get("/hand/search?street=river&action_type=allin&limit=50")
+                                                for _ in range(reads)])
+            await measure("http.stats", [get("/stats?bucket=day") for _ in range(reads)])
+    return out
+
+
+def bench_http(hands: int, seed: int, warmup: int, concurrency: int = 1) -> Dict[str, Any]:
+    with scratch_schema():
+        return asyncio.run(_http(hands, seed, warmup, concurrency))
+
+
+def bench_deal(hands: int, seed: int, warmup: int) -> Dict[str, Any]:
+    from poker_backend.services.dealer import Dealer
+    from poker_backend.services.poker_service import PokerSimulationService
+
+    dealer = Dealer(seed)
+    out = {}
+    cards = 2 * 6 + 5
+    out["deal.single"] = summarize(_time_each(lambda _: dealer.deal(cards), range(hands)))
+    batch = max(hands, 10000)
+    gc.collect()
+    started = time.perf_counter()
+    dealer.deal_hands(batch, 6)
+    out["deal.batch"] = summarize([], batch, time.perf_counter() - started)
+
+    def dealable(state):
+        for _ in range(6):
+            list(state.get_dealable_cards())
+
+    states = [PokerSimulationService.create_state({}, hole_cards=[[]] * 6)[0] for _ in range(min(hands, 1000))]
+    out["deal.pokerkit_dealable"] = summarize(_time_each(dealable, states))
+    return out
+
+
+RANGE_SPOT = {
+    "hero": "22+, A2s+, K9s+, Q9s+, J9s+, T8s+, 97s+, 87s, 76s, 65s, ATo+, KTo+, QTo+, JTo",
+    "villain": "QQ+, AKs, AKo, A5s-A4s",
+    "board": "Kh7c2d",
+}
+
+
+def bench_ranges(seed: int, warmup: int) -> Dict[str, Any]:
+    from poker_backend.services.equity_service import EquityService
+    from poker_backend.services.range_equity import RangeEquityCache, RangeEquityService
+
+    service = RangeEquityService(RangeEquityCache(max_entries=16, max_bytes=1 << 30))
+    out = {}
+    if warmup:
+        RangeEquityService(RangeEquityCache(1, 1 << 30)).calculate({**RANGE_SPOT, "seed": seed})
+    gc.collect()
+    started = time.perf_counter()
+    result, _ = service.calculate({**RANGE_SPOT, "seed": seed})
+    elapsed = time.perf_counter() - started
+    out["ranges.cold"] = summarize([elapsed], result["matchups"] * result["runouts"], elapsed)
+    out["ranges.cached"] = summarize(_time_each(lambda _: service.calculate(RANGE_SPOT), range(20)))
+    out["ranges.cached_isomorphic"] = summarize(
+        _time_each(lambda _: service.calculate({**RANGE_SPOT, "board": "Ks7d2h"}), range(20))
+    )
+    pairs = [["AsKs", "QhQd"], ["7s7d", "AcKd"], ["9h8h", "AsAd"], ["JcTc", "KcKs"]]
+    out["ranges.per_pair_equity"] = summarize(
+        _time_each(lambda p: EquityService.calculate({"players": p, "board": ["Kh", "7c", "2d"]}), pairs * 5)
+    )
+    return out
+
+
+async def _live(hands: int, seed: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    import orjson
+    import tracemalloc
+    from poker_backend.services.live_tables import LiveTableHub
+    from poker_backend.services.poker_service import PokerSimulationService
+    from poker_backend.services.session_store import SessionStore
+    from poker_backend.services.table_session_service import TableSessionService
+    from poker_backend.services.work_classes import WorkClass
+
+    def hub_for(tables: int) -> LiveTableHub:
+        # Every state stays live: the ceiling is memory, not the store's limits
+        store = SessionStore(ttl=3600, max_sessions=tables, max_states=tables, max_bytes=1 << 40)
+        work = WorkClass("simulate", concurrency=concurrency, max_queue=tables + concurrency)
+        return LiveTableHub(TableSessionService(store), work, max_tables_per_socket=tables, send_queue=1 << 20)
+
+    def config(spec):
+        return {k: v for k, v in spec.items() if k != "actions"}
+
+    async def play(hub: LiveTableHub, specs) -> List[float]:
+        clients = [hub.connect() for _ in range(concurrency)]
+        tables = []
+        for i, spec in enumerate(specs):
+            sub = clients[i % concurrency]
+            view = await hub.open(sub, config(spec))
+            tables.append((sub, view["table"], spec["actions"]))
+        samples: List[float] = []
+
+        async def client(sub):
+            mine = [t for t in tables if t[0] is sub]
+            for step in range(max((len(t[2]) for t in mine), default=0)):
+                for _, table_id, actions in mine:
+                    if step < len(actions):
+                        started = time.perf_counter()
+                        await hub.act(sub, table_id, actions[step])
+                        samples.append(time.perf_counter() - started)
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+
+        await asyncio.gather(*(client(sub) for sub in clients))
+        return samples
+
+    out = {}
+    specs = generate(hands, seed)
+    hub = hub_for(warmup)
+    await play(hub, generate(warmup, seed + 1))
+    hub.work.shutdown()
+
+    hub = hub_for(hands)
+    gc.collect()
+    started = time.perf_counter()
+    samples = await play(hub, specs)
+    out["live.act"] = summarize(samples, elapsed=time.perf_counter() - started)
+    out["live.act"].update({
+        "tables": hands,
+        "clients": concurrency,
+        "diff_bytes_avg": round(hub.bytes_out / max(1, hub.messages_out)),
+    })
+    hub.work.shutdown()
+
+    # What the channel replaces: each click resends the hand so far to /hand/simulate
+    clicks = [dict(spec, actions=spec["actions"][:i + 1]) for spec in specs[:200] for i in range(len(spec["actions"]))]
+    out["live.replay_per_click"] = summarize(_time_each(PokerSimulationService.simulate_hand, clicks))
+    out["live.replay_per_click"]["snapshot_bytes_avg"] = round(
+        sum(len(orjson.dumps(PokerSimulationService.simulate_hand(c), default=str)) for c in clicks[:500])
+        / max(1, min(len(clicks), 500)))
+
+    # Memory held per live table (state, session, view), at the end of its hand
+    sample = specs[:min(hands, 200)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        hub = hub_for(len(sample))
+        await play(hub, sample)
+        gc.collect()
+        per_table = (tracemalloc.get_traced_memory()[0] - before) / max(1, len(sample))
+    finally:
+        tracemalloc.stop()
+    hub.work.shutdown()
+    out["live.memory"] = {
+        "n": len(sample),
+        "bytes_per_table": round(per_table),
+        "tables_per_gib": int((1 << 30) / per_table) if per_table > 0 else None,
+    }
+    return out
+
+
+def bench_live(hands: int, seed: int, warmup: int, concurrency: int = 1) -> Dict[str, Any]:
+    return asyncio.run(_live(hands, seed, warmup, concurrency))
+
+
+# --- Results ---
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    def package(name):
+        try:
+            return version(name)
+        except PackageNotFoundError:
+            return None
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pokerkit": package("pokerkit"),
+        "psycopg": package("psycopg"),
+        "fastapi": package("fastapi"),
+    }
+
+
+def run(groups: List[str], hands: int, seed: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    runners = {
+        "simulate": lambda: bench_simulate(hands, seed, warmup),
+        "batch": lambda: bench_batch(hands, seed, warmup),
+        "serialization": lambda: bench_serialization(hands, seed, warmup),
+        "repo": lambda: bench_repo(hands, seed, warmup),
+        "http": lambda: bench_http(hands, seed, warmup, concurrency),
+        "deal": lambda: bench_deal(hands, seed, warmup),
+        "live": lambda: bench_live(hands, seed, warmup, concurrency),
+        "ranges": lambda: bench_ranges(seed, warmup),
+    }
+    results = {
+        "environment": environment(),
+        "config": {"groups": groups, "hands": hands, "seed": seed, "warmup": warmup, "concurrency": concurrency},
+        "benchmarks": {},
+        "skipped": {},
+    }
+    for group in groups:
+        print(f"▶ {group}", file=sys.stderr)
+        started = time.perf_counter()
+        try:
+            results["benchmarks"].update(runners[group]())
+        except Skipped as e:
+            results["skipped"][group] = str(e)
+            print(f"  skipped: {e}", file=sys.stderr)
+            continue
+        print(f"  done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """One row per metric present in both runs; "verdict" is regression / improvement / ok."""
+    rows = []
+    before_all, after_all = baseline.get("benchmarks", {}), current.get("benchmarks", {})
+    for name in sorted(set(before_all) & set(after_all)):
+        before, after = before_all[name], after_all[name]
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            b, a = before.get(metric), after.get(metric)
+            if not b or a is None:
+                continue
+            change = (a - b) / b
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            better = change < -threshold if metric in LOWER_IS_BETTER else change > threshold
+            rows.append({
+                "benchmark": name, "metric": metric, "baseline": b, "current": a,
+                "change": round(change, 4),
+                "verdict": "regression" if worse else "improvement" if better else "ok",
+            })
+    return rows
+
+
+def _print_results(results: Dict[str, Any]):
+    print(f"{'benchmark':<24} {'n':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'per s':>12}")
+    for name, r in results["benchmarks"].items():
+        def cell(key):
+            v = r.get(key)
+            return f"{v:,.3f}" if isinstance(v, (int, float)) else "-"
+        print(f"{name:<24} {r.get('n', 0):>7} {cell('p50_ms'):>10} {cell('p95_ms'):>10} {cell('p99_ms'):>10} "
+              f"{cell('throughput_per_s'):>12}")
+    for group, reason in results["skipped"].items():
+        print(f"{group:<24} skipped: {reason}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmarks and write JSON results")
+    p_run.add_argument("--only", default=",".join(GROUPS), help=f"comma-separated groups ({', '.join(GROUPS)})")
+    p_run.add_argument("--hands", type=int, default=1000, help="hands per benchmark")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--warmup", type=int, default=50)
+    p_run.add_argument("--concurrency", type=int, default=1, help="concurrent HTTP requests / live table clients")
+    p_run.add_argument("--out", help="results file (default: stdout)")
+
+    p_cmp = sub.add_parser("compare", help="flag regressions between two result files")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="relative change that counts (0.10 = 10%%)")
+    p_cmp.add_argument("--json", action="store_true", help="print the comparison as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        groups = [g.strip() for g in args.only.split(",") if g.strip()]
+        unknown = set(groups) - set(GROUPS)
+        if unknown:
+            parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+        results = run(groups, args.hands, args.seed, args.warmup, max(1, args.concurrency))
+        text = json.dumps(results, indent=2)
+        if args.out:
+            with open(args.out, "w") as f:
+                f.write(text + "\n")
+            _print_results(results)
+            print(f"✅ Results written to {args.out}")
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    regressions = [r for r in rows if r["verdict"] == "regression"]
+    if args.json:
+        print(json.dumps({"threshold": args.threshold, "rows": rows, "regressions": len(regressions)}, indent=2))
+    else:
+        print(f"{'benchmark':<24} {'metric':<18} {'baseline':>12} {'current':>12} {'change':>8}")
+        for r in rows:
+            mark = {"regression": "  ❌", "improvement": "  ✅"}.get(r["verdict"], "")
+            print(f"{r['benchmark']:<24} {r['metric']:<18} {r['baseline']:>12,.3f} {r['current']:>12,.3f} "
+                  f"{r['change']:>+8.1%}{mark}")
+        missing = sorted(set(baseline.get("benchmarks", {})) ^ set(current.get("benchmarks", {})))
+        if missing:
+            print(f"only in one run: {', '.join(missing)}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
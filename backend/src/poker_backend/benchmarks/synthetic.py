@@ -0,0 +1,160 @@
+"""
+Synthetic /hand/simulate payloads for the benchmark suite.
+
+Three shapes, mixed by weight and fully determined by the seed:
+
+    fold       everyone folds to the big blind (shortest legal hand)
+    allin      3-way to the river with bets on every street, a river shove,
+               two calls and a showdown (longest common hand)
+    malformed  a plausible hand with broken actions mixed in: unknown types,
+               bets without amounts, raises below the minimum, boards dealt
+               while a player still has to act, unparseable cards
+
+Payloads use the API frontend's format (6 seats, explicit hole cards, actions
+with "type" / "amount" and "deal_board" entries), so they exercise the same
+code as real requests. Hole cards are explicit, so /hand/simulate caches them.
+"""
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from poker_backend.models.hand import Hand
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+DECK = [r + s for r in RANKS for s in SUITS]
+
+KINDS = ("fold", "allin", "malformed")
+DEFAULT_MIX = {"fold": 0.4, "allin": 0.4, "malformed": 0.2}
+
+SEATS = 6
+BLINDS = (20, 40)
+STACK = 5000
+
+
+def _deal(rng: random.Random):
+    cards = rng.sample(DECK, 2 * SEATS + 5)
+    hole = [cards[2 * i:2 * i + 2] for i in range(SEATS)]
+    return hole, cards[2 * SEATS:]
+
+
+def _payload(hole, actions, stacks: Optional[List[int]] = None) -> Dict[str, Any]:
+    return {
+        "players": hole,
+        "stacks": stacks or [STACK] * SEATS,
+        "blinds": list(BLINDS),
+        "min_bet": BLINDS[1],
+        "actions": actions,
+    }
+
+
+def fold_hand(rng: random.Random) -> Dict[str, Any]:
+    """UTG through the small blind fold; the big blind wins the blinds."""
+    hole, _ = _deal(rng)
+    return _payload(hole, [{"type": "fold"} for _ in range(SEATS - 1)])
+
+
+def allin_hand(rng: random.Random) -> Dict[str, Any]:
+    """
+    UTG raises, the button and big blind call; bets and calls on flop and
+    turn, then the big blind shoves the river and both others call.
+    Postflop order is big blind (1), UTG (2), button (5).
+    """
+    hole, board = _deal(rng)
+    open_to = BLINDS[1] * rng.choice((2, 3, 4))
+    actions: List[Dict[str, Any]] = [
+        {"type": "raise", "amount": open_to},  # 2 UTG
+        {"type": "fold"},                      # 3
+        {"type": "fold"},                      # 4
+        {"type": "call"},                      # 5 button
+        {"type": "fold"},                      # 0 small blind
+        {"type": "call"},                      # 1 big blind
+        {"deal_board": "".join(board[:3])},
+    ]
+    for street_board in (board[3], board[4]):
+        bet = rng.randrange(BLINDS[1], 4 * BLINDS[1] + 1, 10)
+        actions += [
+            {"type": "check"},
+            {"type": "bet", "amount": bet},
+            {"type": "call"},
+            {"type": "call"},
+            {"deal_board": street_board},
+        ]
+    actions += [
+        {"type": "allin"},
+        {"type": "call"},
+        {"type": "call"},
+        {"type": "show"},
+        {"type": "show"},
+        {"type": "show"},
+    ]
+    # Uneven stacks make the shove create side pots
+    stacks = [STACK + rng.randrange(0, 4 * STACK, 100) for _ in range(SEATS)]
+    return _payload(hole, actions, stacks)
+
+
+def malformed_hand(rng: random.Random) -> Dict[str, Any]:
+    """An all-in hand with a few actions replaced or joined by broken ones."""
+    spec = allin_hand(rng)
+    broken = [
+        {"type": "raise"},                          # no amount
+        {"type": "bet", "amount": 1},               # below the minimum
+        {"type": "teleport", "amount": 100},        # unknown type
+        {"deal_board": "XxYyZz"},                   # unparseable cards
+        {"deal_board": spec["players"][0][0]},      # a card already dealt
+        {"type": "show"},                           # not in showdown
+        {},
+    ]
+    actions = spec["actions"]
+    for _ in range(rng.randint(1, 3)):
+        bad = dict(rng.choice(broken))
+        at = rng.randrange(len(actions) + 1)
+        if rng.random() < 0.5 and at < len(actions):
+            actions[at] = bad
+        else:
+            actions.insert(at, bad)
+    return spec
+
+
+GENERATORS = {"fold": fold_hand, "allin": allin_hand, "malformed": malformed_hand}
+
+
+def generate(count: int, seed: int = 0, mix: Optional[Dict[str, float]] = None,
+             kinds: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    ``count`` payloads in a reproducible order. Each carries its shape under
+    "kind" (ignored by the simulator). ``kinds`` restricts to one or more
+    shapes with equal weight; otherwise ``mix`` (default DEFAULT_MIX) weighs them.
+    """
+    rng = random.Random(seed)
+    if kinds:
+        weights = {k: 1.0 for k in kinds}
+    else:
+        weights = dict(mix or DEFAULT_MIX)
+    unknown = set(weights) - set(GENERATORS)
+    if unknown:
+        raise ValueError(f"Unknown hand kinds: {', '.join(sorted(unknown))} (one of {', '.join(KINDS)})")
+    names = list(weights)
+    picks = rng.choices(names, weights=[weights[k] for k in names], k=count)
+    out = []
+    for kind in picks:
+        spec = GENERATORS[kind](rng)
+        spec["kind"] = kind
+        out.append(spec)
+    return out
+
+
+def to_hand(spec: Dict[str, Any], winner_index: Optional[int] = None) -> Hand:
+    """The payload as a stored hand (what POST /hand/ would save)."""
+    board = []
+    for a in spec["actions"]:
+        cards = a.get("deal_board")
+        if isinstance(cards, str) and all(cards[i:i + 2] in DECK for i in range(0, len(cards), 2)):
+            board += [cards[i:i + 2] for i in range(0, len(cards), 2)]
+    return Hand(
+        hand_id=None,
+        players=["".join(cards) for cards in spec["players"]],
+        actions=[a for a in spec["actions"] if a],
+        board_cards=board[:5],
+        stacks=[float(s) for s in spec["stacks"]],
+        winner_index=winner_index,
+    )
@@ -0,0 +1,47 @@
+"""
+Fills ``hands.packed`` for rows stored before the compact encoding existed,
+and slims rows that were stored with it next to the full columns.
+
+    python -m poker_backend.db.backfill_packed [--batch-size 5000]
+
+Adds the column if needed, then encodes rows in batches, each batch in its
+own transaction, and trims each row's legacy columns to what new rows keep
+(stacks cleared, actions reduced to the search projection; VACUUM returns
+the space). Safe to interrupt and re-run, and to run several copies side by
+side (locked rows are skipped). Until a row is backfilled, reads fall back
+to its column values.
+"""
+import argparse
+import sys
+import time
+
+from psycopg_pool import ConnectionPool
+
+from poker_backend.db.connection import conninfo
+from poker_backend.repositories.hand_repository import HandRepository
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    with ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        repo = HandRepository(pool)
+        repo.create_table()
+        started = time.perf_counter()
+        total = 0
+        while True:
+            updated = repo.backfill_packed(args.batch_size)
+            if not updated:
+                break
+            total += updated
+            elapsed = time.perf_counter() - started
+            print(f"\r{total:,} hands packed ({total / elapsed:,.0f}/s)", end="", file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+    print(f"✅ Backfilled {total:,} hands in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
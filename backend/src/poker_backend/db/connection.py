@@ -1,11 +1,88 @@
 import psycopg
 import os
+from fastapi import Request
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
-def get_connection():
-    return psycopg.connect(
+
+def conninfo() -> str:
+    return make_conninfo(
         host=os.getenv("DB_HOST", "db"),
         dbname=os.getenv("DB_NAME", "poker"),
         user=os.getenv("DB_USER", "app"),
         password=os.getenv("DB_PASSWORD", "app_pw"),
         port=os.getenv("DB_PORT", "5432"),
     )
+
+
+def get_connection():
+    """Standalone connection for scripts and one-off jobs (not used by the API)."""
+    return psycopg.connect(conninfo())
+
+
+def _pool_settings(prefix: str, min_size: int, max_size: int) -> dict:
+    return dict(
+        min_size=int(os.getenv(f"{prefix}_MIN_SIZE", str(min_size))),
+        max_size=int(os.getenv(f"{prefix}_MAX_SIZE", str(max_size))),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        max_waiting=int(os.getenv("DB_POOL_MAX_WAITING", "0")),
+        max_idle=float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+    )
+
+
+def create_pool() -> ConnectionPool:
+    """
+    Builds the sync connection pool (not opened yet; the app lifespan owns it).
+    Request handlers use the async pool; this one serves background threads
+    (write-behind flusher, simulation cache) and startup DDL.
+
+    Connections are health-checked on checkout, recycled after DB_POOL_MAX_LIFETIME
+    seconds and closed after DB_POOL_MAX_IDLE seconds idle above the minimum size.
+    """
+    return ConnectionPool(
+        conninfo(),
+        **_pool_settings("DB_SYNC_POOL", 1, 4),
+        check=ConnectionPool.check_connection,
+        name="poker-sync",
+        open=False,
+    )
+
+
+def create_async_pool() -> AsyncConnectionPool:
+    """The request handlers' pool, sized by DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE."""
+    return AsyncConnectionPool(
+        conninfo(),
+        **_pool_settings("DB_POOL", 2, 10),
+        check=AsyncConnectionPool.check_connection,
+        name="poker",
+        open=False,
+    )
+
+
+def pool_stats(pool) -> dict:
+    stats = pool.get_stats()
+    requests = stats.get("requests_num", 0)
+    return {
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": stats.get("pool_size", 0),
+        "idle": stats.get("pool_available", 0),
+        "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": requests,
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_timed_out": stats.get("requests_errors", 0),
+        "wait_ms_total": stats.get("requests_wait_ms", 0),
+        "wait_ms_avg": stats.get("requests_wait_ms", 0) / requests if requests else 0.0,
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def get_pool(request: Request) -> ConnectionPool:
+    return request.app.state.db_pool
+
+
+def get_async_pool(request: Request) -> AsyncConnectionPool:
+    return request.app.state.db_async_pool
@@ -1,12 +1,109 @@
 CREATE EXTENSION IF NOT EXISTS pgcrypto;
 
--- 🃏 Hands table (main record)
+-- 🃏 Hands table (main record), range-partitioned by month on created_at
+-- (partitions are created ahead by the API / python -m poker_backend.services.hand_partitions maintain)
 CREATE TABLE IF NOT EXISTS hands (
-  hand_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  players TEXT[] NOT NULL,             -- ["AhKh", "QsQd", "9c8c"]
-  actions JSONB NOT NULL,              -- full list of betting actions
-  board_cards TEXT[] DEFAULT '{}',     -- ["Jh", "7c", "2h", "Tc", "Qc"]
-  stacks NUMERIC[] DEFAULT '{}',       -- final stack amounts
+  hand_id UUID NOT NULL DEFAULT gen_random_uuid(),
+  players TEXT[] NOT NULL,             -- ["AhKh", "QsQd", "9c8c"], searched
+  actions JSONB NOT NULL,              -- distinct street / type / all_in of the actions, searched
+  board_cards TEXT[] DEFAULT '{}',     -- ["Jh", "7c", "2h", "Tc", "Qc"], searched
+  stacks NUMERIC[],                    -- legacy: final stacks of rows written before packed
   winner_index INT,                    -- optional: which player won
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  packed BYTEA,                        -- the whole hand (models/hand_codec.py), read path
+  PRIMARY KEY (hand_id, created_at)    -- the partition key must be part of it
+) PARTITION BY RANGE (created_at);
+-- Rows outside every partition; maintenance moves them into partitions of their own
+CREATE TABLE IF NOT EXISTS hands_default PARTITION OF hands DEFAULT;
+
+-- Partitions exported to Parquet and detached by the retention job (... hand_partitions archive)
+CREATE TABLE IF NOT EXISTS hands_archive (
+  partition TEXT PRIMARY KEY,          -- hands_p20250101
+  range_start TIMESTAMPTZ NOT NULL,
+  range_end TIMESTAMPTZ NOT NULL,
+  path TEXT NOT NULL,                  -- Parquet file on the archiving host (HANDS_ARCHIVE_DIR)
+  rows BIGINT NOT NULL,
+  bytes BIGINT NOT NULL,
+  archived_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS hands_archive_range_idx ON hands_archive (range_start, range_end);
+
+-- Newest-first keyset pagination over (created_at, hand_id), also used for date ranges
+CREATE INDEX IF NOT EXISTS hands_created_at_hand_id_idx ON hands (created_at, hand_id);
+
+-- Hand search: board / holding containment and action containment (GET /hand/search)
+CREATE INDEX IF NOT EXISTS hands_board_cards_gin ON hands USING GIN (board_cards);
+CREATE INDEX IF NOT EXISTS hands_players_gin ON hands USING GIN (players);
+CREATE INDEX IF NOT EXISTS hands_actions_gin ON hands USING GIN (actions jsonb_path_ops);
+
+-- Shared tier of the /hand/simulate result cache (SIM_CACHE_SHARED=1)
+CREATE TABLE IF NOT EXISTS simulation_cache (
+  cache_key TEXT PRIMARY KEY,          -- sha256 of the canonical simulate payload
+  result JSONB NOT NULL,
   created_at TIMESTAMPTZ DEFAULT now()
 );
+CREATE INDEX IF NOT EXISTS simulation_cache_created_at_idx ON simulation_cache (created_at);
+
+-- Hourly aggregates for GET /stats, updated in the same transaction as every hand insert
+-- (python -m poker_backend.services.hand_stats --rebuild recomputes them from hands)
+CREATE TABLE IF NOT EXISTS hand_stats_hourly (
+  bucket_start TIMESTAMPTZ PRIMARY KEY,
+  hands BIGINT NOT NULL DEFAULT 0,
+  showdowns BIGINT NOT NULL DEFAULT 0,
+  pot_total DOUBLE PRECISION NOT NULL DEFAULT 0   -- chips committed through logged actions
+);
+CREATE TABLE IF NOT EXISTS hand_stats_seats (
+  bucket_start TIMESTAMPTZ NOT NULL,
+  seat INT NOT NULL,
+  dealt BIGINT NOT NULL DEFAULT 0,
+  wins BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket_start, seat)
+);
+CREATE TABLE IF NOT EXISTS hand_stats_actions (
+  bucket_start TIMESTAMPTZ NOT NULL,
+  street TEXT NOT NULL,
+  action TEXT NOT NULL,
+  count BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket_start, street, action)
+);
+
+-- Durable job queue (POST /jobs, workers: python -m poker_backend.services.jobs worker)
+CREATE TABLE IF NOT EXISTS sim_jobs (
+  job_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind TEXT NOT NULL,                  -- simulate | self_play
+  params JSONB NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued', -- queued | running | succeeded | failed | cancelled
+  tasks_total INT NOT NULL,
+  tasks_done INT NOT NULL DEFAULT 0,
+  tasks_failed INT NOT NULL DEFAULT 0,
+  items_total INT NOT NULL,
+  items_done INT NOT NULL DEFAULT 0,
+  items_failed INT NOT NULL DEFAULT 0,
+  max_attempts INT NOT NULL DEFAULT 3,
+  error TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  started_at TIMESTAMPTZ,
+  finished_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS sim_jobs_created_at_idx ON sim_jobs (created_at);
+CREATE TABLE IF NOT EXISTS sim_job_tasks (
+  job_id UUID NOT NULL REFERENCES sim_jobs ON DELETE CASCADE,
+  task_no INT NOT NULL,
+  payload JSONB NOT NULL,
+  status TEXT NOT NULL DEFAULT 'queued', -- queued | running | done | failed
+  attempts INT NOT NULL DEFAULT 0,
+  available_at TIMESTAMPTZ NOT NULL DEFAULT now(), -- claimable from; for running tasks the lease expiry
+  worker TEXT,
+  last_error TEXT,
+  PRIMARY KEY (job_id, task_no)
+);
+CREATE INDEX IF NOT EXISTS sim_job_tasks_claim_idx
+  ON sim_job_tasks (available_at) WHERE status IN ('queued', 'running');
+CREATE TABLE IF NOT EXISTS sim_job_results (
+  job_id UUID NOT NULL REFERENCES sim_jobs ON DELETE CASCADE,
+  item_index INT NOT NULL,
+  ok BOOLEAN NOT NULL,
+  result JSONB,
+  error TEXT,
+  PRIMARY KEY (job_id, item_index)
+);
@@ -0,0 +1,52 @@
+from typing import List
+
+# Compact card encoding shared by the evaluator, equity and dealing code:
+# a card is one int 0..51 = rank_index * 4 + suit_index.
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+CARD_COUNT = 52
+
+
+def parse_cards(value) -> List[str]:
+    """Accepts "AhKh", "Ah Kh", ["Ah", "Kh"] (or nested lists) and returns ["Ah", "Kh"]."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        cards = []
+        for v in value:
+            cards.extend(parse_cards(v))
+        return cards
+    raw = "".join(str(value).split())
+    if len(raw) % 2:
+        raise ValueError(f"Invalid card string: {value!r}")
+    cards = [raw[i:i + 2] for i in range(0, len(raw), 2)]
+    for c in cards:
+        if c[0].upper() not in RANKS or c[1].lower() not in SUITS:
+            raise ValueError(f"Invalid card: {c!r}")
+    return [c[0].upper() + c[1].lower() for c in cards]
+
+
+def is_unknown(value) -> bool:
+    """True for seats without hole cards: None, "", "????" or ["??", "??"]."""
+    if value is None:
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(is_unknown(v) for v in value)
+    return str(value).strip().strip("?") == ""
+
+
+def card_to_int(card: str) -> int:
+    return RANKS.index(card[0].upper()) * 4 + SUITS.index(card[1].lower())
+
+
+def int_to_card(value: int) -> str:
+    return RANKS[value >> 2] + SUITS[value & 3]
+
+
+def encode_cards(value) -> List[int]:
+    """Any format accepted by ``parse_cards`` -> list of card ints."""
+    return [card_to_int(c) for c in parse_cards(value)]
+
+
+def decode_cards(values) -> List[str]:
+    return [int_to_card(int(v)) for v in values]
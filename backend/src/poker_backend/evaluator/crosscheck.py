@@ -0,0 +1,63 @@
+"""
+Cross-checks the lookup-table evaluator against pokerkit.
+
+    python -m poker_backend.evaluator.crosscheck --samples 200000 --seed 7
+    python -m poker_backend.evaluator.crosscheck --exhaustive5
+
+Hands are sorted by our strength and every neighbouring pair must compare the
+same way (less / equal) under pokerkit's StandardHighHand, which checks that
+both evaluators induce the same total order.
+"""
+import argparse
+import sys
+import time
+from itertools import combinations
+
+import numpy as np
+from pokerkit import StandardHighHand
+
+from poker_backend.evaluator.cards import decode_cards
+from poker_backend.evaluator.hand_evaluator import evaluate, evaluate_batch
+
+
+def check_hands(hands: np.ndarray) -> int:
+    """Number of disagreements with pokerkit over ``hands`` ((N, 5..7) card ints), each printed."""
+    strengths = evaluate_batch(hands)
+    order = np.argsort(strengths, kind="stable")
+    mismatches = 0
+    prev_strength, prev_hand = None, None
+    for i in order:
+        cards = "".join(decode_cards(hands[i]))
+        pk = StandardHighHand.from_game(cards)
+        if evaluate(hands[i].tolist()) != strengths[i]:
+            mismatches += 1
+            print(f"scalar/batch disagree on {cards}")
+        if prev_hand is not None:
+            ours_equal = strengths[i] == prev_strength
+            if ours_equal != (pk == prev_hand) or (not ours_equal and not prev_hand < pk):
+                mismatches += 1
+                print(f"order mismatch: {prev_hand} ({prev_strength}) vs {pk} ({strengths[i]})")
+        prev_strength, prev_hand = strengths[i], pk
+    return mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=100000, help="random 7-card hands to check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--exhaustive5", action="store_true", help="check all 2,598,960 five-card hands (slow)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.exhaustive5:
+        hands = np.array(list(combinations(range(52), 5)), dtype=np.int64)
+    else:
+        rng = np.random.default_rng(args.seed)
+        hands = np.argsort(rng.random((args.samples, 52)), axis=1)[:, :7]
+    mismatches = check_hands(hands)
+    print(f"checked {len(hands)} hands in {time.perf_counter() - started:.1f}s, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
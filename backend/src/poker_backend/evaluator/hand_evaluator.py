@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from poker_backend.evaluator.cards import encode_cards
+from poker_backend.evaluator.tables import CATEGORY_NAMES, POW5, get_tables
+
+# Hand strengths are ints 1..7462 (higher wins, equal is a tie) for the best
+# five cards out of 5, 6 or 7. Cards are ints from poker_backend.evaluator.cards.
+
+_POW5 = [int(p) for p in POW5]
+_noflush: Optional[Dict[int, int]] = None
+
+
+def _noflush_lookup() -> Dict[int, int]:
+    # Dict view of the sorted key table for the scalar path
+    global _noflush
+    if _noflush is None:
+        tables = get_tables()
+        _noflush = dict(zip(tables.noflush_keys.tolist(), tables.noflush_values.tolist()))
+    return _noflush
+
+
+def evaluate(cards) -> int:
+    """Strength of one 5-7 card hand (card ints, or strings such as "AhKhQhJhTh2c3d")."""
+    if not cards or isinstance(cards[0], str):
+        cards = encode_cards(cards)
+    if not 5 <= len(cards) <= 7 or len(set(cards)) != len(cards):
+        raise ValueError("A hand needs 5 to 7 distinct cards")
+
+    suit_counts = [0, 0, 0, 0]
+    key = 0
+    for c in cards:
+        suit_counts[c & 3] += 1
+        key += _POW5[c >> 2]
+    for suit, n in enumerate(suit_counts):
+        if n >= 5:
+            mask = 0
+            for c in cards:
+                if c & 3 == suit:
+                    mask |= 1 << (c >> 2)
+            return int(get_tables().flush_values[mask])
+    return _noflush_lookup()[key]
+
+
+def evaluate_batch(hands: np.ndarray) -> np.ndarray:
+    """
+    Strengths for an (N, k) integer array of hands, k in 5..7, in one vectorized
+    pass. Rows are assumed to hold distinct, valid cards.
+    """
+    # Widen compact decks (int8, see services/dealer.py): rank bit masks need 13 bits
+    hands = np.asarray(hands, dtype=np.intp)
+    if hands.ndim != 2 or not 5 <= hands.shape[1] <= 7:
+        raise ValueError("Expected an (N, 5..7) array of cards")
+    tables = get_tables()
+    ranks = hands >> 2
+    suits = hands & 3
+
+    keys = POW5[ranks].sum(axis=1)
+    result = tables.noflush_values[np.searchsorted(tables.noflush_keys, keys)]
+
+    suit_counts = np.stack([(suits == s).sum(axis=1) for s in range(4)], axis=1)
+    flushes = np.nonzero(suit_counts.max(axis=1) >= 5)[0]
+    if flushes.size:
+        flush_suit = suit_counts[flushes].argmax(axis=1)
+        in_suit = suits[flushes] == flush_suit[:, None]
+        # Ranks within one suit are distinct, so the sum is a bitwise OR
+        masks = np.where(in_suit, np.left_shift(1, ranks[flushes]), 0).sum(axis=1)
+        result[flushes] = tables.flush_values[masks]
+    return result
+
+
+def category(strength: int) -> str:
+    """Name of the hand category for a strength, e.g. "full_house"."""
+    floor = get_tables().category_floor
+    return CATEGORY_NAMES[int(np.searchsorted(floor, strength, side="right")) - 1]
@@ -0,0 +1,63 @@
+from typing import Dict
+
+from pokerkit import Card, NoLimitTexasHoldem, StandardHighHand
+
+from poker_backend.evaluator.cards import card_to_int
+from poker_backend.evaluator.hand_evaluator import evaluate
+
+_CARD_INTS: Dict[Card, int] = {}
+
+
+def _card_int(card: Card) -> int:
+    value = _CARD_INTS.get(card)
+    if value is None:
+        value = _CARD_INTS[card] = card_to_int(repr(card))
+    return value
+
+
+class FastHighHand(StandardHighHand):
+    """
+    Drop-in ``StandardHighHand`` for pokerkit states, ranked with the lookup
+    table evaluator: one lookup per hand instead of pokerkit scoring all 21
+    five-card combinations. ``cards`` holds all 5-7 cards the hand was built
+    from, so it only supports comparisons (not ``entry``/labels).
+
+    ``Hand.__init__`` is not called: it would look the 5-7 cards up in the
+    five-card table and reject them. ``cards`` is overridden instead.
+    """
+
+    __slots__ = ("_cards", "strength")
+
+    def __init__(self, cards):
+        cards = Card.clean(cards)
+        if any(c.unknown_status for c in cards):
+            raise ValueError("Unknown cards cannot form a hand")
+        self._cards = cards
+        self.strength = evaluate([_card_int(c) for c in cards])
+
+    @property
+    def cards(self):
+        return self._cards
+
+    @classmethod
+    def from_game(cls, hole_cards, board_cards=()):
+        return cls(tuple(Card.clean(hole_cards)) + tuple(Card.clean(board_cards)))
+
+    def __eq__(self, other):
+        if type(self) != type(other):  # noqa: E721
+            return NotImplemented
+        return self.strength == other.strength
+
+    def __hash__(self):
+        return hash(self.strength)
+
+    def __lt__(self, other):
+        if type(self) != type(other):  # noqa: E721
+            return NotImplemented
+        return self.strength < other.strength
+
+
+class FastNoLimitTexasHoldem(NoLimitTexasHoldem):
+    """No-limit hold'em whose showdowns and hand killing use ``FastHighHand``."""
+
+    hand_types = (FastHighHand,)
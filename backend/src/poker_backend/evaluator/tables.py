@@ -0,0 +1,176 @@
+import os
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+# Rank tables for 5- to 7-card high hands.
+#
+# Non-flush hands only depend on the multiset of ranks. Each card adds
+# 5**rank to a key, which is collision free because no rank appears more
+# than 4 times; the sorted keys are binary searched. Hands with five or more
+# cards of one suit are always decided by that suit (no quads or full house
+# fits next to a 7-card flush), so they are looked up directly by the
+# 13-bit rank mask of the flush suit.
+#
+# Values are hand strengths 1..7462, higher is better.
+
+TABLE_VERSION = 1
+HAND_CLASSES = 7462
+POW5 = np.array([5 ** r for r in range(13)], dtype=np.int64)
+
+# Category codes; a strength falls in the category whose threshold it reaches
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORY_NAMES = (
+    "high_card", "pair", "two_pair", "three_of_a_kind", "straight",
+    "flush", "full_house", "four_of_a_kind", "straight_flush",
+)
+
+
+class RankTables(NamedTuple):
+    noflush_keys: np.ndarray    # int64, sorted
+    noflush_values: np.ndarray  # uint16, aligned with noflush_keys
+    flush_values: np.ndarray    # uint16[8192], indexed by rank mask
+    category_floor: np.ndarray  # uint16[9], lowest strength of each category
+
+
+def _straight_high(mask: int) -> int:
+    """Top rank of the best straight in a 13-bit rank mask, or -1."""
+    for high in range(12, 3, -1):
+        run = 0b11111 << (high - 4)
+        if mask & run == run:
+            return high
+    if mask & 0b1000000001111 == 0b1000000001111:  # wheel: A-2-3-4-5
+        return 3
+    return -1
+
+
+def _top(mask: int, n: int) -> Tuple[int, ...]:
+    return tuple(r for r in range(12, -1, -1) if mask >> r & 1)[:n]
+
+
+def _best_of_counts(counts: List[int]) -> Tuple[int, ...]:
+    """Best non-flush 5-card hand from rank counts, as a comparable tuple."""
+    present = 0
+    for r in range(13):
+        if counts[r]:
+            present |= 1 << r
+    by_count = {n: [r for r in range(12, -1, -1) if counts[r] == n] for n in (1, 2, 3, 4)}
+
+    if by_count[4]:
+        q = by_count[4][0]
+        return (QUADS, q) + _top(present & ~(1 << q), 1)
+    trips = by_count[3]
+    if trips:
+        pairs = sorted(trips[1:] + by_count[2], reverse=True)
+        if pairs:
+            return (FULL_HOUSE, trips[0], pairs[0])
+    high = _straight_high(present)
+    if high >= 0:
+        return (STRAIGHT, high)
+    if trips:
+        return (TRIPS, trips[0]) + _top(present & ~(1 << trips[0]), 2)
+    pairs = by_count[2]
+    if len(pairs) >= 2:
+        p1, p2 = pairs[0], pairs[1]
+        return (TWO_PAIR, p1, p2) + _top(present & ~(1 << p1) & ~(1 << p2), 1)
+    if pairs:
+        return (PAIR, pairs[0]) + _top(present & ~(1 << pairs[0]), 3)
+    return (HIGH_CARD,) + _top(present, 5)
+
+
+def _best_of_flush(mask: int) -> Tuple[int, ...]:
+    high = _straight_high(mask)
+    if high >= 0:
+        return (STRAIGHT_FLUSH, high)
+    return (FLUSH,) + _top(mask, 5)
+
+
+def _rank_multisets(size: int, rank: int = 0):
+    """All rank-count vectors with ``size`` cards and at most 4 of a rank."""
+    if rank == 12:
+        if size <= 4:
+            yield [size]
+        return
+    for n in range(min(size, 4) + 1):
+        for rest in _rank_multisets(size - n, rank + 1):
+            yield [n] + rest
+
+
+def build_tables() -> RankTables:
+    # Strength order of every distinct 5-card hand class
+    classes = set()
+    for counts in _rank_multisets(5):
+        classes.add(_best_of_counts(counts))
+    for mask in range(1 << 13):
+        if bin(mask).count("1") == 5:
+            classes.add(_best_of_flush(mask))
+    ordered = sorted(classes)
+    if len(ordered) != HAND_CLASSES:
+        raise RuntimeError(f"Expected {HAND_CLASSES} hand classes, built {len(ordered)}")
+    strength: Dict[Tuple[int, ...], int] = {key: i + 1 for i, key in enumerate(ordered)}
+
+    keys, values = [], []
+    for size in (5, 6, 7):
+        for counts in _rank_multisets(size):
+            keys.append(sum(c * 5 ** r for r, c in enumerate(counts)))
+            values.append(strength[_best_of_counts(counts)])
+    order = np.argsort(np.array(keys, dtype=np.int64))
+    noflush_keys = np.array(keys, dtype=np.int64)[order]
+    noflush_values = np.array(values, dtype=np.uint16)[order]
+
+    flush_values = np.zeros(1 << 13, dtype=np.uint16)
+    for mask in range(1 << 13):
+        if bin(mask).count("1") >= 5:
+            flush_values[mask] = strength[_best_of_flush(mask)]
+
+    floor = np.zeros(len(CATEGORY_NAMES), dtype=np.uint16)
+    for key in reversed(ordered):
+        floor[key[0]] = strength[key]
+    return RankTables(noflush_keys, noflush_values, flush_values, floor)
+
+
+def cache_dir() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache", "poker_backend")
+    return os.getenv("EVALUATOR_CACHE_DIR", default)
+
+
+def _path(name: str) -> str:
+    return os.path.join(cache_dir(), f"evaluator_v{TABLE_VERSION}_{name}.npy")
+
+
+def _save(tables: RankTables):
+    os.makedirs(cache_dir(), exist_ok=True)
+    for name, array in tables._asdict().items():
+        # Write then rename so a concurrent loader never sees a partial file
+        tmp = f"{_path(name)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, _path(name))
+
+
+def load_tables() -> RankTables:
+    """Memory-maps the cached tables, building and caching them on first use."""
+    try:
+        return RankTables(*(np.load(_path(name), mmap_mode="r") for name in RankTables._fields))
+    except (OSError, ValueError):
+        pass
+    tables = build_tables()
+    try:
+        _save(tables)
+    except OSError:
+        pass  # read-only cache dir: keep the in-memory tables
+    return tables
+
+
+_tables = None
+_lock = threading.Lock()
+
+
+def get_tables() -> RankTables:
+    global _tables
+    if _tables is None:
+        with _lock:
+            if _tables is None:
+                _tables = load_tables()
+    return _tables
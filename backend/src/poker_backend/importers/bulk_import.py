@@ -0,0 +1,174 @@
+"""
+Bulk import of hand histories into the hands table.
+
+    python -m poker_backend.importers.bulk_import hands.txt [more files...]
+        [--format auto|text|json] [--batch-size 5000]
+        [--checkpoint-dir .import_state] [--quarantine bad_hands.ndjson] [--no-resume]
+
+Text hand histories (PokerStars style) and JSON dumps (NDJSON or one big
+array) are parsed as streams and loaded with COPY in large batches. After
+every committed batch the byte offset is written to a checkpoint file, so a
+re-run resumes where the last one stopped. Hand ids are deterministic, so a
+batch replayed after a crash is skipped rather than duplicated. Records that
+fail to parse are written to the quarantine file and do not stop the import.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Callable, Iterator, List, Optional
+
+from psycopg_pool import ConnectionPool
+
+from poker_backend.db.connection import conninfo
+from poker_backend.importers.hand_history import ParsedRecord, iter_hand_histories
+from poker_backend.importers.json_dump import iter_json_records
+from poker_backend.models.hand import Hand
+from poker_backend.repositories.hand_repository import HandRepository
+
+
+@dataclass
+class ImportReport:
+    path: str
+    offset: int = 0
+    parsed: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    quarantined: int = 0
+    batches: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self.parsed / self.elapsed_s * 60 if self.elapsed_s else 0.0
+
+
+def detect_format(path: str) -> str:
+    with open(path, "rb") as f:
+        head = f.read(4096).lstrip()
+    return "json" if head[:1] in (b"{", b"[") else "text"
+
+
+def _records(f: BinaryIO, fmt: str, start: int) -> Iterator[ParsedRecord]:
+    return iter_json_records(f, start) if fmt == "json" else iter_hand_histories(f, start)
+
+
+class BulkHandImporter:
+    def __init__(self, repo: HandRepository, batch_size: int = 5000,
+                 checkpoint_dir: Optional[str] = None, quarantine_path: Optional[str] = None,
+                 progress: Optional[Callable[[ImportReport, int], None]] = None):
+        self.repo = repo
+        self.batch_size = batch_size
+        self.checkpoint_dir = checkpoint_dir
+        self.quarantine_path = quarantine_path
+        self.progress = progress
+
+    def _checkpoint_path(self, path: str) -> Optional[str]:
+        if not self.checkpoint_dir:
+            return None
+        name = os.path.abspath(path).strip(os.sep).replace(os.sep, "__")
+        return os.path.join(self.checkpoint_dir, f"{name}.checkpoint.json")
+
+    def load_checkpoint(self, path: str) -> Optional[ImportReport]:
+        checkpoint = self._checkpoint_path(path)
+        if not checkpoint or not os.path.exists(checkpoint):
+            return None
+        with open(checkpoint) as f:
+            data = json.load(f)
+        data.pop("size", None)
+        return ImportReport(**data)
+
+    def _save_checkpoint(self, report: ImportReport, size: int):
+        checkpoint = self._checkpoint_path(report.path)
+        if not checkpoint:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        tmp = checkpoint + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({**asdict(report), "size": size}, f)
+        os.replace(tmp, checkpoint)
+
+    def _quarantine(self, quarantine, path: str, record: ParsedRecord):
+        if quarantine is not None:
+            quarantine.write(json.dumps({
+                "source": path, "offset": record.start, "error": record.error, "raw": record.raw,
+            }) + "\n")
+
+    def import_file(self, path: str, fmt: str = "auto", resume: bool = True) -> ImportReport:
+        fmt = detect_format(path) if fmt == "auto" else fmt
+        report = (self.load_checkpoint(path) if resume else None) or ImportReport(path=path)
+        size = os.path.getsize(path)
+        started = time.perf_counter() - report.elapsed_s
+        quarantine = open(self.quarantine_path, "a") if self.quarantine_path else None
+        batch: List[Hand] = []
+        batch_end = report.offset
+
+        def flush():
+            inserted = self.repo.import_hands(batch)
+            report.inserted += inserted
+            report.duplicates += len(batch) - inserted
+            report.batches += 1
+            report.offset = batch_end
+            report.elapsed_s = time.perf_counter() - started
+            # Only advance the checkpoint once the batch is committed
+            self._save_checkpoint(report, size)
+            if self.progress:
+                self.progress(report, size)
+            batch.clear()
+
+        try:
+            with open(path, "rb") as f:
+                for record in _records(f, fmt, report.offset):
+                    report.parsed += 1
+                    batch_end = record.end
+                    if record.hand is None:
+                        report.quarantined += 1
+                        self._quarantine(quarantine, path, record)
+                    else:
+                        batch.append(record.hand)
+                    if len(batch) >= self.batch_size:
+                        flush()
+            if batch or batch_end != report.offset:
+                flush()
+        finally:
+            if quarantine is not None:
+                quarantine.close()
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+
+def print_progress(report: ImportReport, size: int):
+    pct = report.offset / size * 100 if size else 100.0
+    print(
+        f"📥 {report.path}: {pct:5.1f}% | {report.parsed} parsed, {report.inserted} inserted, "
+        f"{report.duplicates} duplicates, {report.quarantined} quarantined | {report.rate_per_minute:,.0f} hands/min",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--format", choices=("auto", "text", "json"), default="auto")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--checkpoint-dir", default=".import_state")
+    parser.add_argument("--quarantine", default="quarantined_hands.ndjson")
+    parser.add_argument("--no-resume", action="store_true", help="ignore existing checkpoints")
+    args = parser.parse_args(argv)
+
+    with ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        repo = HandRepository(pool)
+        repo.create_table()
+        importer = BulkHandImporter(repo, args.batch_size, args.checkpoint_dir, args.quarantine, print_progress)
+        for path in args.paths:
+            report = importer.import_file(path, args.format, resume=not args.no_resume)
+            print(f"✅ {path}: {report.inserted} inserted, {report.duplicates} duplicates, "
+                  f"{report.quarantined} quarantined in {report.elapsed_s:.1f}s "
+                  f"({report.rate_per_minute:,.0f} hands/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from poker_backend.models.hand import Hand
+
+# Namespace for deterministic hand ids, so importing the same file twice
+# (or resuming after a crash) cannot create duplicate rows.
+IMPORT_NAMESPACE = uuid.UUID("6f1c2a4e-3b9d-4c55-9a0e-2d7b1e8f4c10")
+
+HAND_START = re.compile(r"^(?P<site>[\w .'-]*?)\s*Hand #(?P<number>\d+)")
+DATE = re.compile(r"(\d{4})/(\d{2})/(\d{2}) (\d{1,2}):(\d{2}):(\d{2})")
+SEAT = re.compile(r"^Seat (\d+): (.+?) \([^\d(]*([\d,.]+) in chips")
+CARDS = re.compile(r"\[([^\]]*)\]")
+UNCALLED = re.compile(r"Uncalled bet \(([^)]+)\) returned to (.+)$")
+STREETS = {"*** FLOP ***": "flop", "*** TURN ***": "turn", "*** RIVER ***": "river"}
+
+
+@dataclass
+class ParsedRecord:
+    start: int            # byte offset where the record starts
+    end: int              # byte offset just past the record (resume point)
+    hand: Optional[Hand]
+    raw: str
+    error: Optional[str] = None
+
+
+class HandHistoryError(ValueError):
+    pass
+
+
+def _amount(text: str) -> float:
+    return float(text.strip().lstrip("$€£").replace(",", "").split()[0])
+
+
+def _cards(text: str) -> List[str]:
+    return text.split()
+
+
+def parse_hand_history(text: str) -> Hand:
+    """
+    Parses one PokerStars-style hold'em hand history into a ``Hand``.
+
+    Actions use the simulate format ({"type", "amount"} plus {"deal_board"}
+    markers), annotated with "seat", "street" and "all_in". Raises and bets
+    carry the raise-to amount for the street. Stacks are the final stacks.
+    The timestamp is taken as UTC.
+    """
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    if not lines:
+        raise HandHistoryError("empty record")
+    header = HAND_START.match(lines[0])
+    if not header:
+        raise HandHistoryError(f"not a hand history header: {lines[0][:80]!r}")
+
+    date = DATE.search(lines[0])
+    if date:
+        created_at = datetime(*map(int, date.groups()), tzinfo=timezone.utc)
+    else:
+        created_at = datetime.now(timezone.utc)
+
+    seat_of: Dict[str, int] = {}
+    stacks: List[float] = []
+    for line in lines[1:]:
+        if line.startswith("***"):
+            break
+        m = SEAT.match(line)
+        if m and m.group(2) not in seat_of:
+            seat_of[m.group(2)] = len(stacks)
+            stacks.append(_amount(m.group(3)))
+    if len(stacks) < 2:
+        raise HandHistoryError("fewer than 2 seated players")
+
+    hole: List[Optional[List[str]]] = [None] * len(stacks)
+    invested = [0.0] * len(stacks)       # total put in this hand
+    street_total = [0.0] * len(stacks)   # put in on the current street
+    collected = [0.0] * len(stacks)
+    actions: List[dict] = []
+    board: List[str] = []
+    street = "preflop"
+    in_summary = False
+
+    def put(seat: int, amount: float):
+        invested[seat] += amount
+        street_total[seat] += amount
+
+    for line in lines[1:]:
+        if line.startswith("*** SUMMARY ***"):
+            in_summary = True
+            continue
+        if line.startswith("***"):
+            for marker, name in STREETS.items():
+                if line.startswith(marker):
+                    groups = CARDS.findall(line)
+                    new_cards = _cards(groups[-1]) if groups else []
+                    board.extend(new_cards)
+                    actions.append({"deal_board": "".join(new_cards), "street": name})
+                    street = name
+                    street_total = [0.0] * len(stacks)
+            continue
+        if line.startswith("Dealt to "):
+            name, _, rest = line[len("Dealt to "):].partition(" [")
+            if name in seat_of and rest:
+                hole[seat_of[name]] = _cards(rest.rstrip("]"))
+            continue
+        if line.startswith("Uncalled bet"):
+            m = UNCALLED.match(line)
+            if m and m.group(2) in seat_of:
+                seat = seat_of[m.group(2)]
+                invested[seat] -= _amount(m.group(1))
+            continue
+        if " collected " in line and not in_summary:
+            name, _, rest = line.partition(" collected ")
+            if name in seat_of:
+                collected[seat_of[name]] += _amount(rest)
+            continue
+        if in_summary:
+            if line.startswith("Board ") and not board:
+                groups = CARDS.findall(line)
+                board = _cards(groups[0]) if groups else []
+            continue
+
+        name, sep, rest = line.partition(": ")
+        if not sep or name not in seat_of:
+            continue
+        seat = seat_of[name]
+        all_in = rest.endswith("and is all-in")
+        rest = rest.replace(" and is all-in", "")
+        if rest.startswith("posts"):
+            # "posts small blind 10", "posts big blind 20", "posts the ante 2"
+            put(seat, _amount(rest.split()[-1]))
+            if "ante" in rest:
+                street_total[seat] -= _amount(rest.split()[-1])
+            continue
+        if rest.startswith("shows ["):
+            hole[seat] = _cards(CARDS.search(rest).group(1))
+            actions.append({"type": "show", "seat": seat, "street": "showdown"})
+            continue
+
+        action = {"seat": seat, "street": street}
+        if rest.startswith("folds"):
+            action["type"] = "fold"
+        elif rest.startswith("checks"):
+            action["type"] = "check"
+        elif rest.startswith("calls "):
+            amount = _amount(rest[len("calls "):])
+            put(seat, amount)
+            action.update(type="call", amount=amount)
+        elif rest.startswith("bets "):
+            amount = _amount(rest[len("bets "):])
+            put(seat, amount)
+            action.update(type="bet", amount=street_total[seat])
+        elif rest.startswith("raises "):
+            to = _amount(rest.split(" to ")[-1])
+            put(seat, to - street_total[seat])
+            action.update(type="raise", amount=to)
+        else:
+            continue
+        if all_in:
+            action["all_in"] = True
+        actions.append(action)
+
+    final_stacks = [round(s - i + c, 2) for s, i, c in zip(stacks, invested, collected)]
+    winner_index = max(range(len(collected)), key=collected.__getitem__) if any(collected) else None
+    site = header.group("site").strip() or "unknown"
+
+    return Hand(
+        hand_id=uuid.uuid5(IMPORT_NAMESPACE, f"{site}:{header.group('number')}"),
+        players=["".join(h) if h else "????" for h in hole],
+        actions=actions,
+        board_cards=board,
+        stacks=final_stacks,
+        winner_index=winner_index,
+        created_at=created_at,
+    )
+
+
+def iter_hand_histories(f: BinaryIO, start: int = 0) -> Iterator[ParsedRecord]:
+    """
+    Streams records from a text hand-history file opened in binary mode,
+    starting at byte ``start``. Hands are split on their header lines, so
+    only one hand is held in memory at a time.
+    """
+    f.seek(start)
+    position = start
+    record_start = None
+    lines: List[str] = []
+
+    def emit(end: int) -> ParsedRecord:
+        raw = "".join(lines)
+        try:
+            return ParsedRecord(record_start, end, parse_hand_history(raw), raw)
+        except Exception as e:
+            return ParsedRecord(record_start, end, None, raw, f"{type(e).__name__}: {e}")
+
+    for line in iter(f.readline, b""):
+        text = line.decode("utf-8-sig", errors="replace")
+        if b"Hand #" in line and HAND_START.match(text.strip()):
+            if lines:
+                yield emit(position)
+            lines, record_start = [], position
+        if record_start is not None:
+            lines.append(text)
+        position += len(line)
+    if lines:
+        yield emit(position)
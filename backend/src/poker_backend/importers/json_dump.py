@@ -0,0 +1,144 @@
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from poker_backend.importers.hand_history import IMPORT_NAMESPACE, ParsedRecord
+from poker_backend.models.hand import Hand
+
+READ_SIZE = 1 << 20
+
+# Bytes that matter when finding where an array element ends
+_STRUCTURAL = re.compile(rb'[][{}",]')
+_STRING_STOPS = re.compile(rb'["\\]')
+
+
+def hand_from_dict(record: Dict[str, Any]) -> Hand:
+    """Builds a ``Hand`` from a JSON dump record (the shape GET /hand/ returns)."""
+    if not isinstance(record, dict):
+        raise ValueError("record is not a JSON object")
+    if "actions" not in record or "stacks" not in record:
+        raise ValueError("record needs 'actions' and 'stacks'")
+    hand_id = record.get("hand_id")
+    if hand_id is None:
+        # Content-derived id keeps re-imports idempotent
+        canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+        hand_id = uuid.uuid5(IMPORT_NAMESPACE, canonical)
+    created_at = record.get("created_at")
+    created_at = datetime.fromisoformat(created_at) if created_at else datetime.now(timezone.utc)
+    return Hand(
+        hand_id=uuid.UUID(str(hand_id)),
+        players=list(record.get("players") or []),
+        actions=list(record["actions"]),
+        board_cards=list(record.get("board_cards") or []),
+        stacks=[float(s) for s in record["stacks"]],
+        winner_index=record.get("winner_index"),
+        created_at=created_at,
+    )
+
+
+def _record(start: int, end: int, raw: str) -> ParsedRecord:
+    try:
+        return ParsedRecord(start, end, hand_from_dict(json.loads(raw)), raw)
+    except Exception as e:
+        return ParsedRecord(start, end, None, raw, f"{type(e).__name__}: {e}")
+
+
+def iter_json_records(f: BinaryIO, start: int = 0) -> Iterator[ParsedRecord]:
+    """
+    Streams hands from a JSON dump opened in binary mode: either NDJSON (one
+    object per line) or a single top-level array of objects. Both are read
+    incrementally; ``start`` is a byte offset returned as ``end`` earlier.
+    """
+    f.seek(0)
+    head = f.read(4096).lstrip()
+    is_array = head.startswith(b"[")
+    f.seek(start)
+    if is_array:
+        yield from _iter_array(f, start)
+        return
+    position = start
+    for line in iter(f.readline, b""):
+        line_start, position = position, position + len(line)
+        if line.strip():
+            yield _record(line_start, position, line.decode("utf-8"))
+
+
+def _element_end(buffer: bytes) -> Optional[int]:
+    """
+    Byte offset just past the array element at the start of ``buffer``, found
+    without decoding it: brackets are matched outside strings, and a closer
+    matches the nearest opener of its kind (so ``{"a": [}`` still ends at the
+    ``}``). None if the element runs past the end of ``buffer``.
+    """
+    stack = []
+    in_string = False
+    i = 0
+    while True:
+        m = (_STRING_STOPS if in_string else _STRUCTURAL).search(buffer, i)
+        if m is None:
+            return None
+        c, i = m.group(), m.end()
+        if in_string:
+            if c == b"\\":
+                i += 1  # the escaped character
+            else:
+                in_string = False
+        elif c == b'"':
+            in_string = True
+        elif c in (b"[", b"{"):
+            stack.append(c)
+        elif c in (b"]", b"}"):
+            if not stack:
+                # The array's closing bracket, or a stray brace (part of the element)
+                return m.start() if c == b"]" else i
+            opener = b"[" if c == b"]" else b"{"
+            if opener in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(opener):]
+                if not stack:
+                    return i
+        elif not stack:  # the comma after the element
+            return m.start()
+
+
+def _iter_array(f: BinaryIO, start: int) -> Iterator[ParsedRecord]:
+    decoder = json.JSONDecoder()
+    buffer = b""
+    base = start  # file offset of buffer[0]
+    eof = False
+    while True:
+        # Skip separators between elements (and the opening bracket)
+        i = 0
+        while i < len(buffer) and buffer[i:i + 1] in b" \t\r\n,[":
+            i += 1
+        buffer, base = buffer[i:], base + i
+        if buffer[:1] == b"]":
+            return
+        if buffer:
+            text = buffer.decode("utf-8", errors="ignore")
+            try:
+                _, end_char = decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                end_char = None
+            if end_char is not None and (end_char < len(text) or eof):
+                end = len(text[:end_char].encode("utf-8"))
+                yield _record(base, base + end, text[:end_char])
+                buffer, base = buffer[end:], base + end
+                continue
+            # Malformed (or not fully read): quarantine just this element once its end is in the buffer
+            end = _element_end(buffer) if end_char is None else None
+            if end is not None and end > 0:
+                raw = buffer[:end].decode("utf-8", errors="replace")
+                yield _record(base, base + end, raw)
+                buffer, base = buffer[end:], base + end
+                continue
+            if eof:
+                yield ParsedRecord(base, base + len(buffer), None, text, "Truncated JSON array element")
+                return
+        chunk = f.read(READ_SIZE)
+        if not chunk:
+            if eof or not buffer:
+                return
+            eof = True
+        buffer += chunk
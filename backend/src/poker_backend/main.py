@@ -1,10 +1,116 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from poker_backend.routes import hand_routes
-from poker_backend.db.connection import get_connection
+from fastapi.responses import JSONResponse
+from psycopg_pool import PoolTimeout, TooManyRequests
+from poker_backend.routes import (
+    branch_routes, equity_routes, hand_routes, job_routes, live_routes, metrics_routes, ops_routes, session_routes,
+    stats_routes,
+)
+from poker_backend.db.connection import create_async_pool, create_pool
 from poker_backend.repositories.hand_repository import HandRepository
+from poker_backend.repositories.job_repository import JobRepository
+from poker_backend.repositories.partition_repository import PartitionRepository
+from poker_backend.repositories.stats_repository import StatsRepository
+from poker_backend.services.branching import BranchService
+from poker_backend.services.hand_archive import HandArchive
+from poker_backend.services.hand_partitions import PartitionMaintainer
+from poker_backend.services.hand_stats import StatsBuffer
+from poker_backend.services.live_tables import LiveTableHub
+from poker_backend.services.metrics import MetricsMiddleware, register_app_gauges
+from poker_backend.services.preflop_table import PreflopTable
+from poker_backend.services.range_equity import RangeEquityCache, RangeEquityService
+from poker_backend.services.session_store import SessionStore
+from poker_backend.services.simulation_cache import SimulationCache
+from poker_backend.services.table_session_service import TableSessionService
+from poker_backend.services.work_classes import WorkQueueFull, create_work_classes
+from poker_backend.services.worker_pool import shutdown_process_pool
+from poker_backend.services.write_behind import HandWriteBehind, WriteBehindFull
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The pool lives exactly as long as the app: opened before the first
+    # request, closed (connections returned to Postgres) on shutdown.
+    pool = create_pool()
+    pool.open(wait=True)
+    app.state.db_pool = pool
+
+    # Request-path reads and writes go through the async pool; the sync pool
+    # above serves startup, the write-behind flusher and the shared cache tier.
+    async_pool = create_async_pool()
+    await async_pool.open(wait=True)
+    app.state.db_async_pool = async_pool
+
+    # Bounded executors for blocking simulation work, one per class
+    work = create_work_classes()
+    app.state.work = work
+
+    # Summary-table counts of saved hands, applied in batches off the insert path
+    hand_stats = StatsBuffer.from_env(StatsRepository(pool))
+    hand_stats.start()
+    app.state.hand_stats = hand_stats
+
+    # Create table on startup
+    repo = HandRepository(pool, hand_stats)
+    repo.create_table()
+    print("✅ Connected to PostgreSQL and ensured 'hands' table exists.")
+
+    # Future partitions of hands, checked at startup and then hourly
+    partitions = PartitionMaintainer.from_env(PartitionRepository(pool))
+    partitions.start()
+    app.state.partitions = partitions
+    # Parquet files of archived partitions, read by GET /hand/archive
+    app.state.hand_archive = HandArchive.from_env()
+
+    # Queue tables for /jobs; the workers run separately (python -m poker_backend.services.jobs worker)
+    JobRepository(pool).create_tables()
+
+    # Optional buffered ingestion for POST /hand/ (HAND_WRITE_BEHIND=1)
+    writer = HandWriteBehind.from_env(repo)
+    if writer is not None:
+        writer.start()
+    app.state.hand_writer = writer
+
+    app.state.table_sessions = TableSessionService(SessionStore.from_env())
+    # WebSocket live tables (/ws/tables) on top of the same sessions
+    app.state.live_tables = LiveTableHub.from_env(app.state.table_sessions, work["simulate"])
+
+    # Replayed stored hands and their what-if branches (street snapshots)
+    app.state.branches = BranchService.from_env()
 
-app = FastAPI(title="Poker Backend")
+    # LRU in every worker, plus the shared Postgres tier with SIM_CACHE_SHARED=1
+    app.state.simulation_cache = SimulationCache.from_env(pool)
+
+    # Memory-mapped; GET /equity/preflop answers 503 until the table is built
+    app.state.preflop_table = PreflopTable.load()
+    if app.state.preflop_table is None:
+        print("⚠️ Preflop equity table not found, run: python -m poker_backend.services.preflop_table")
+
+    # POST /equity/ranges; percent ranges ("15%") are ranked by the preflop table
+    app.state.range_equity = RangeEquityService(
+        RangeEquityCache.from_env(),
+        app.state.preflop_table.ranking() if app.state.preflop_table is not None else None,
+    )
+
+    # Pool, queue and cache gauges for GET /metrics, read at scrape time
+    register_app_gauges(app)
+
+    try:
+        yield
+    finally:
+        if writer is not None:
+            writer.stop()
+        hand_stats.stop()
+        partitions.stop()
+        for work_class in work.values():
+            work_class.shutdown()
+        shutdown_process_pool()
+        await async_pool.close()
+        pool.close()
+
+
+app = FastAPI(title="Poker Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,17 +118,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Cache"],
 )
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PoolTimeout)
+@app.exception_handler(TooManyRequests)
+async def db_pool_exhausted(request: Request, exc: Exception):
+    return JSONResponse(status_code=503, content={"detail": "Database busy, try again"})
+
+
+@app.exception_handler(WriteBehindFull)
+async def write_queue_full(request: Request, exc: WriteBehindFull):
+    return JSONResponse(status_code=503, content={"detail": "Hand ingestion queue full, try again"},
+                        headers={"Retry-After": "1"})
+
+
+@app.exception_handler(WorkQueueFull)
+async def work_queue_full(request: Request, exc: WorkQueueFull):
+    return JSONResponse(status_code=503, content={"detail": f"Too many queued {exc.name} requests, try again"},
+                        headers={"Retry-After": "1"})
 
-# Create table on startup
-@app.on_event("startup")
-def startup_event():
-    conn = get_connection()
-    HandRepository(conn).create_table()
-    print("✅ Connected to PostgreSQL and ensured 'hands' table exists.")
 
 # Register routes
 app.include_router(hand_routes.router)
+app.include_router(equity_routes.router)
+app.include_router(session_routes.router)
+app.include_router(live_routes.router)
+app.include_router(branch_routes.router)
+app.include_router(ops_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(stats_routes.router)
+app.include_router(job_routes.router)
 
 @app.get("/")
 def root():
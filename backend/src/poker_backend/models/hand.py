@@ -2,7 +2,8 @@ from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-@dataclass
+# slots: no per-instance __dict__, so large reads (get_all_hands, streams) stay small
+@dataclass(slots=True)
 class Hand:
     hand_id: Optional[str]
     players: List[str]
@@ -11,3 +12,14 @@ class Hand:
     stacks: List[float]
     winner_index: Optional[int]
     created_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hand_id": self.hand_id,
+            "players": self.players,
+            "actions": self.actions,
+            "board_cards": self.board_cards,
+            "stacks": self.stacks,
+            "winner_index": self.winner_index,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,301 @@
+"""
+Compact binary encoding of a stored hand (the ``hands.packed`` bytea column).
+
+Layout, little-endian:
+
+    header   version u8, flags u8, players u8, board u8, stacks u8, stack scale u8,
+             actions u16, winner i32
+    players  2 card bytes per seat ("????" is 0xFF 0xFF)
+    board    1 card byte per card
+    stacks   i64 per seat, in units of 10**-scale (float64 when flagged)
+    actions  12-byte records: type u8, seat u8, street u8, flags u8, amount i64
+    extras   JSON object, only for values that do not fit the layout above
+
+Cards are rank * 4 + suit, the same ints the evaluator uses. Anything the
+fixed layout cannot represent exactly (stringified player lists, unknown
+action types, extra action keys, sub-cent amounts) goes to ``extras``, so
+``decode(encode(hand))`` always returns the hand that was stored.
+
+Sizes and decode speed against the column layout: benchmarks/hand_codec.py.
+"""
+import json
+import math
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from poker_backend.models.hand import Hand
+
+VERSION = 1
+
+HEADER = struct.Struct("<BBBBBBHi")
+ACTION = struct.Struct("<BBBBq")
+ACTION_KEYED = struct.Struct("<Iq")  # the same record read as (first four bytes, amount)
+
+# header flags
+F_PLAYERS_JSON = 1
+F_BOARD_JSON = 2
+F_STACKS_FLOAT = 4
+F_EXTRAS = 8
+F_WINNER = 16
+
+# action record flags
+A_AMOUNT_INT = 1
+A_AMOUNT_CENTS = 2
+A_ALL_IN = 4
+A_CARDS_SHIFT = 4  # deal_board: card count in the high nibble, cards in the amount field
+
+NONE = 0xFF
+T_DEAL_BOARD = 7
+T_EXTRA = 0xFF
+
+ACTION_TYPES = ("fold", "check", "call", "bet", "raise", "allin", "show")
+STREETS = ("preflop", "flop", "turn", "river", "showdown")
+_TYPE_CODE = {t: i for i, t in enumerate(ACTION_TYPES)}
+_STREET_CODE = {s: i for i, s in enumerate(STREETS)}
+_PLAYER_KEYS = frozenset(("type", "seat", "street", "amount", "all_in"))
+_BOARD_KEYS = frozenset(("deal_board", "street"))
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+# Index by card byte; 0xFF (and anything else past the deck) reads as "??"
+CARD_STR = [r + s for r in RANKS for s in SUITS] + ["??"] * (256 - 52)
+_CARD_CODE = {c: i for i, c in enumerate(CARD_STR[:52])}
+_CARD_CODE["??"] = NONE
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+MAX_SCALE = 4
+
+
+# --- Encoding ---
+
+def _cards(text: str) -> Optional[bytes]:
+    """"AhKh" -> b"\\x30\\x2e"; ``None`` if ``text`` is not a run of cards."""
+    if not isinstance(text, str) or len(text) % 2:
+        return None
+    out = bytearray()
+    for i in range(0, len(text), 2):
+        code = _CARD_CODE.get(text[i:i + 2])
+        if code is None:
+            return None
+        out.append(code)
+    return bytes(out)
+
+
+def _cents(v: float) -> Optional[int]:
+    if not math.isfinite(v):
+        return None
+    c = round(v * 100)
+    return c if c / 100 == v and INT64_MIN <= c <= INT64_MAX else None
+
+
+def _pack_action(a: Any) -> Optional[bytes]:
+    """The 12-byte record for ``a``, or ``None`` when it needs the JSON escape."""
+    if not isinstance(a, dict):
+        return None
+    street = NONE
+    if "street" in a:
+        street = _STREET_CODE.get(a["street"]) if isinstance(a["street"], str) else None
+        if street is None:
+            return None
+
+    if "deal_board" in a:
+        if not _BOARD_KEYS.issuperset(a):
+            return None
+        cards = _cards(a["deal_board"])
+        if cards is None or len(cards) > 7 or NONE in cards:
+            return None
+        return ACTION.pack(T_DEAL_BOARD, NONE, street, len(cards) << A_CARDS_SHIFT,
+                           int.from_bytes(cards, "little"))
+
+    if not _PLAYER_KEYS.issuperset(a):
+        return None
+    code = _TYPE_CODE.get(a.get("type"))
+    if code is None:
+        return None
+    seat = NONE
+    if "seat" in a:
+        seat = a["seat"]
+        if not (isinstance(seat, int) and not isinstance(seat, bool) and 0 <= seat < NONE):
+            return None
+    flags, amount = 0, 0
+    if "amount" in a:
+        v = a["amount"]
+        if isinstance(v, int) and not isinstance(v, bool) and INT64_MIN <= v <= INT64_MAX:
+            flags, amount = A_AMOUNT_INT, v
+        elif isinstance(v, float) and _cents(v) is not None:
+            flags, amount = A_AMOUNT_CENTS, _cents(v)
+        else:
+            return None
+    if "all_in" in a:
+        if a["all_in"] is not True:
+            return None
+        flags |= A_ALL_IN
+    return ACTION.pack(code, seat, street, flags, amount)
+
+
+def _pack_stacks(stacks: List[float]) -> Tuple[int, int, bytes]:
+    """(flags, scale, bytes): the smallest decimal scale that stores every stack exactly."""
+    for scale in range(MAX_SCALE + 1):
+        factor = 10 ** scale
+        units = []
+        for s in stacks:
+            if not math.isfinite(s):
+                break
+            u = round(s * factor)
+            if u / factor != s or not INT64_MIN <= u <= INT64_MAX:
+                break
+            units.append(u)
+        else:
+            return 0, scale, struct.pack(f"<{len(units)}q", *units)
+    return F_STACKS_FLOAT, 0, struct.pack(f"<{len(stacks)}d", *stacks)
+
+
+def encode(players: List[str], actions: List[Any], board_cards: List[str],
+           stacks: List[float], winner_index: Optional[int]) -> bytes:
+    """Packs the normalized columns of a hand (see ``HandRepository._normalize``)."""
+    flags = 0
+    extras: Dict[str, Any] = {}
+
+    seats = [_cards(p) for p in players]
+    if len(players) < NONE and all(c is not None and len(c) == 2 for c in seats):
+        player_bytes = b"".join(seats)
+    else:
+        flags |= F_PLAYERS_JSON
+        extras["players"] = players
+        player_bytes = b""
+
+    board = [_cards(c) for c in board_cards]
+    if len(board_cards) < NONE and all(c is not None and len(c) == 1 for c in board):
+        board_bytes = b"".join(board)
+    else:
+        flags |= F_BOARD_JSON
+        extras["board_cards"] = board_cards
+        board_bytes = b""
+
+    if len(stacks) >= NONE:
+        raise ValueError(f"Too many stacks to pack ({len(stacks)})")
+    stack_flags, scale, stack_bytes = _pack_stacks(stacks)
+    flags |= stack_flags
+
+    records = []
+    escaped = []
+    for a in actions:
+        record = _pack_action(a)
+        if record is None:
+            record = ACTION.pack(T_EXTRA, NONE, NONE, 0, len(escaped))
+            escaped.append(a)
+        records.append(record)
+    if escaped:
+        extras["actions"] = escaped
+    if len(records) > 0xFFFF:
+        raise ValueError(f"Too many actions to pack ({len(records)})")
+
+    winner = 0
+    if winner_index is not None:
+        flags |= F_WINNER
+        winner = winner_index
+
+    if extras:
+        flags |= F_EXTRAS
+    header = HEADER.pack(VERSION, flags, len(seats) if not flags & F_PLAYERS_JSON else 0,
+                         len(board) if not flags & F_BOARD_JSON else 0, len(stacks), scale,
+                         len(records), winner)
+    tail = json.dumps(extras, separators=(",", ":")).encode() if extras else b""
+    return b"".join((header, player_bytes, board_bytes, stack_bytes, *records, tail))
+
+
+# --- Decoding ---
+
+# Everything in an action record except the amount field depends only on its
+# first four bytes, so each distinct (type, seat, street, flags) is turned
+# into a dict once and copied per action. At most a few thousand exist.
+_AMOUNT_NONE, _AMOUNT_INT, _AMOUNT_CENTS, _AMOUNT_EXTRA = -1, -2, -3, -4
+_TEMPLATES: Dict[int, Tuple[Dict[str, Any], int]] = {}
+
+
+def _template(code: int, seat: int, street: int, aflags: int) -> Tuple[Dict[str, Any], int]:
+    """(dict without the amount, how to fill it in: a kind above, or the deal_board card count)."""
+    if code == T_EXTRA:
+        return {}, _AMOUNT_EXTRA
+    if code == T_DEAL_BOARD:
+        a, kind = {"deal_board": ""}, aflags >> A_CARDS_SHIFT
+    else:
+        a, kind = {"type": ACTION_TYPES[code]}, _AMOUNT_NONE
+        if seat != NONE:
+            a["seat"] = seat
+        if aflags & A_AMOUNT_INT:
+            kind = _AMOUNT_INT
+            a["amount"] = 0
+        elif aflags & A_AMOUNT_CENTS:
+            kind = _AMOUNT_CENTS
+            a["amount"] = 0.0
+        if aflags & A_ALL_IN:
+            a["all_in"] = True
+    if street != NONE:
+        a["street"] = STREETS[street]
+    return a, kind
+
+
+def decode(buf: bytes, hand_id=None, created_at=None) -> Hand:
+    buf = bytes(buf)
+    version, flags, n_players, n_board, n_stacks, scale, n_actions, winner = HEADER.unpack_from(buf)
+    if version != VERSION:
+        raise ValueError(f"Unsupported packed hand version {version}")
+    offset = HEADER.size
+
+    players = [CARD_STR[buf[i]] + CARD_STR[buf[i + 1]] for i in range(offset, offset + 2 * n_players, 2)]
+    offset += 2 * n_players
+    board_cards = [CARD_STR[b] for b in buf[offset:offset + n_board]]
+    offset += n_board
+
+    if flags & F_STACKS_FLOAT:
+        stacks = list(struct.unpack_from(f"<{n_stacks}d", buf, offset))
+    elif scale:
+        factor = 10 ** scale
+        stacks = [u / factor for u in struct.unpack_from(f"<{n_stacks}q", buf, offset)]
+    else:
+        stacks = [float(u) for u in struct.unpack_from(f"<{n_stacks}q", buf, offset)]
+    offset += 8 * n_stacks
+
+    end = offset + ACTION.size * n_actions
+    extras = json.loads(buf[end:]) if flags & F_EXTRAS else {}
+    escaped = extras.get("actions")
+    actions = []
+    append = actions.append
+    templates = _TEMPLATES
+    for head, amount in ACTION_KEYED.iter_unpack(memoryview(buf)[offset:end]):
+        template = templates.get(head)
+        if template is None:
+            template = templates[head] = _template(*head.to_bytes(4, "little"))
+        a, amount_kind = template
+        if amount_kind == _AMOUNT_NONE:
+            append(a.copy())
+        elif amount_kind == _AMOUNT_INT:
+            a = a.copy()
+            a["amount"] = amount
+            append(a)
+        elif amount_kind == _AMOUNT_CENTS:
+            a = a.copy()
+            a["amount"] = amount / 100
+            append(a)
+        elif amount_kind == _AMOUNT_EXTRA:
+            append(escaped[amount])
+        else:
+            a = a.copy()
+            a["deal_board"] = "".join([CARD_STR[b] for b in amount.to_bytes(8, "little")[:amount_kind]])
+            append(a)
+
+    if flags & F_PLAYERS_JSON:
+        players = extras["players"]
+    if flags & F_BOARD_JSON:
+        board_cards = extras["board_cards"]
+
+    return Hand(
+        hand_id=hand_id,
+        players=players,
+        actions=actions,
+        board_cards=board_cards,
+        stacks=stacks,
+        winner_index=winner if flags & F_WINNER else None,
+        created_at=created_at,
+    )
@@ -0,0 +1,119 @@
+import re
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Union
+from uuid import UUID
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+from typing_extensions import TypedDict  # pydantic reads TypedDict configs from this one
+
+# Request and response bodies of the /hand routes. Validation happens once,
+# in pydantic's core, instead of key-by-key in the route functions.
+
+_CARD = r"[2-9TJQKA][cdhs]"
+_CARD_RE = re.compile(_CARD)
+_HOLDING_RE = re.compile(rf"(?:{_CARD}|\?\?)+")
+# Brackets, quotes, commas and spaces of stringified lists: "['Ah', 'Kh']"
+_HOLDING_NOISE = str.maketrans("", "", "[]'\", ")
+
+
+def parse_holding(value: Any) -> str:
+    """
+    A seat's hole cards as stored: "AhKh", or "????" when unknown. Accepts
+    the card string, a list of cards, or a stringified list ("['Ah', 'Kh']",
+    as some frontends send them).
+    """
+    if isinstance(value, (list, tuple)):
+        if not all(isinstance(c, str) for c in value):
+            raise ValueError("hole cards must be strings")
+        value = "".join(value)
+    elif not isinstance(value, str):
+        raise ValueError("hole cards must be a string or a list of cards")
+    holding = value.translate(_HOLDING_NOISE)
+    if not _HOLDING_RE.fullmatch(holding):
+        raise ValueError(f"invalid hole cards {value!r} (expected e.g. 'AhKh', ['Ah', 'Kh'] or '????')")
+    return holding
+
+
+def _parse_card(value: Any) -> str:
+    if not isinstance(value, str) or not _CARD_RE.fullmatch(value):
+        raise ValueError(f"invalid card {value!r} (expected e.g. 'Ah')")
+    return value
+
+
+Holding = Annotated[str, BeforeValidator(parse_holding)]
+Card = Annotated[str, BeforeValidator(_parse_card)]
+Chips = Union[int, float]
+
+
+# The payloads the services take are plain dicts; TypedDicts validate them
+# without building model objects that would have to be dumped again.
+
+class Action(TypedDict, total=False):
+    """
+    One logged action: {"type": "raise", "amount": 120} or {"deal_board": "Jh7c2h"}.
+    Imported and self-play hands add "seat", "street" and "all_in"; other
+    keys are kept as given. Unknown types reach the engine, which skips them.
+    """
+
+    __pydantic_config__ = ConfigDict(extra="allow")
+
+    type: Optional[str]
+    amount: Optional[Chips]
+    deal_board: Optional[str]
+    seat: Optional[int]
+    street: Optional[str]
+    all_in: Optional[bool]
+
+
+class SimulateRequest(TypedDict, total=False):
+    """POST /hand/simulate; missing fields get the engine's defaults (6 seats, 50000 chips, blinds 20/40)."""
+
+    # Fields the simulator does not read (e.g. a benchmark's "kind") are dropped
+    __pydantic_config__ = ConfigDict(extra="ignore")
+
+    players: Annotated[List[Union[List[str], str]], Field(max_length=6)]
+    stacks: Annotated[List[Union[Chips, Literal["inf"]]], Field(max_length=6)]
+    blinds: Tuple[Chips, Chips]
+    antes: Chips
+    min_bet: Chips
+    actions: List[Action]
+    # Deals the seats without explicit hole cards; responses report the seed used
+    seed: Annotated[int, Field(ge=0, lt=2 ** 53)]
+    trace: bool
+
+
+class SimulateResponse(BaseModel):
+    status: str
+    players: List[str]
+    winner_index: Optional[int]
+    actions: List[Dict[str, Any]]
+    min_raise: Optional[Chips]
+    board: List[str]
+    stacks: List[Union[float, str]]
+    engine_status: str
+    payoffs: List[Chips]
+    final_pots: Chips
+    seed: Optional[int] = None
+    trace: Optional[Dict[str, Any]] = None
+
+
+class SaveHandRequest(BaseModel):
+    """POST /hand/; echoed fields such as hand_id or created_at are ignored."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    players: List[Holding] = Field(default_factory=list)
+    actions: List[Action]
+    board_cards: List[Card] = Field(default_factory=list, max_length=5)
+    stacks: List[Chips]
+    winner_index: Optional[int] = Field(None, ge=0)
+
+
+class HandOut(BaseModel):
+    hand_id: Optional[UUID]
+    players: List[str]
+    actions: List[Dict[str, Any]]
+    board_cards: List[str]
+    stacks: List[float]
+    winner_index: Optional[int]
+    created_at: Optional[datetime]
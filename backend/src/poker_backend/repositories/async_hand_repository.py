@@ -0,0 +1,113 @@
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
+from poker_backend.models.hand import Hand
+from poker_backend.models.hand_codec import encode
+from poker_backend.repositories.hand_repository import HAND_COLUMNS, HAND_SELECT, HandRepository, _row_to_hand
+from poker_backend.repositories.hand_search import HandSearch, search_actions
+from poker_backend.repositories.stats_repository import apply_delta_async
+from poker_backend.services.hand_stats import StatsBuffer, StatsDelta
+from poker_backend.services.metrics import timed_query
+
+
+class AsyncHandRepository:
+    """
+    ``HandRepository`` on psycopg's async connections, for ``async def`` routes.
+    Same SQL and row mapping; each call awaits a connection from the async pool.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool, stats: Optional[StatsBuffer] = None):
+        self.pool = pool
+        self.stats = stats
+
+    async def _count_in_transaction(self, cur, hands: List[Hand]):
+        if self.stats is None:
+            await apply_delta_async(cur, StatsDelta.from_hands(hands))
+
+    def _count_committed(self, hands: List[Hand]):
+        if self.stats is not None:
+            self.stats.add(hands)
+
+    @timed_query
+    async def save_hand(self, hand: Hand) -> Hand:
+        players, actions, board_cards, stacks, winner_index = HandRepository._normalize(hand)
+
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute("""
+                INSERT INTO hands (players, actions, board_cards, winner_index, packed)
+                VALUES (%s::text[], %s::jsonb, %s::text[], %s, %s)
+                RETURNING hand_id, created_at;
+            """, (
+                players,
+                json.dumps(search_actions(actions)),
+                board_cards,
+                winner_index,
+                encode(players, actions, board_cards, stacks, winner_index),
+            ))
+            row = await cur.fetchone()
+            hand.hand_id, hand.created_at = row
+            await self._count_in_transaction(cur, [hand])
+        self._count_committed([hand])
+        return hand
+
+    @timed_query
+    async def save_hands(self, hands: List[Hand]):
+        """Bulk insert through COPY; hands must carry hand_id and created_at."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            async with cur.copy(f"COPY hands ({HAND_COLUMNS}) FROM STDIN") as copy:
+                for hand in hands:
+                    players, actions, board_cards, stacks, winner_index = HandRepository._normalize(hand)
+                    await copy.write_row((
+                        hand.hand_id, players, Jsonb(search_actions(actions)), board_cards, winner_index,
+                        hand.created_at, encode(players, actions, board_cards, stacks, winner_index),
+                    ))
+            await self._count_in_transaction(cur, hands)
+        self._count_committed(hands)
+
+    @timed_query
+    async def get_hand(self, hand_id: str) -> Optional[Hand]:
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(f"SELECT {HAND_SELECT} FROM hands WHERE hand_id = %s::uuid;", (hand_id,))
+            row = await cur.fetchone()
+        return _row_to_hand(row) if row else None
+
+    @timed_query
+    async def get_hands_page(self, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Hand]:
+        """Newest-first page of at most ``limit`` hands, after the (created_at, hand_id) cursor."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            if after is None:
+                await cur.execute(f"""
+                    SELECT {HAND_SELECT} FROM hands
+                    ORDER BY created_at DESC, hand_id DESC
+                    LIMIT %s;
+                """, (limit,))
+            else:
+                # The plain created_at bound lets Postgres skip newer partitions
+                await cur.execute(f"""
+                    SELECT {HAND_SELECT} FROM hands
+                    WHERE created_at <= %s AND (created_at, hand_id) < (%s, %s::uuid)
+                    ORDER BY created_at DESC, hand_id DESC
+                    LIMIT %s;
+                """, (after[0], after[0], after[1], limit))
+            rows = await cur.fetchall()
+        return [_row_to_hand(r) for r in rows]
+
+    @timed_query
+    async def search_hands(self, search: HandSearch, limit: int,
+                           after: Optional[Tuple[datetime, str]] = None) -> List[Hand]:
+        sql, params = search.query(HAND_SELECT, limit, after)
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(sql, params)
+            rows = await cur.fetchall()
+        return [_row_to_hand(r) for r in rows]
+
+    async def iter_hands(self, batch_size: int = 1000) -> AsyncIterator[Hand]:
+        """Every hand newest-first through a server-side cursor (``batch_size`` rows per fetch)."""
+        async with self.pool.connection() as conn:
+            async with conn.cursor(name="hands_stream") as cur:
+                cur.itersize = batch_size
+                await cur.execute(f"SELECT {HAND_SELECT} FROM hands ORDER BY created_at DESC, hand_id DESC;")
+                async for r in cur:
+                    yield _row_to_hand(r)
@@ -1,54 +1,127 @@
 import json
-from typing import List
-from psycopg import Connection
+import logging
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
 from poker_backend.models.hand import Hand
+from poker_backend.models.hand_codec import decode, encode
+from poker_backend.repositories.hand_search import HandSearch, search_actions
+from poker_backend.repositories.stats_repository import STATS_SCHEMA, apply_delta
+from poker_backend.services.hand_stats import StatsBuffer, StatsDelta
+from poker_backend.services.metrics import timed_query
 
-class HandRepository:
-    def __init__(self, conn: Connection):
-        self.conn = conn
+logger = logging.getLogger(__name__)
 
-    def create_table(self):
-        with self.conn.cursor() as cur:
-            cur.execute("""
-            CREATE EXTENSION IF NOT EXISTS pgcrypto;
-            CREATE TABLE IF NOT EXISTS hands (
-                hand_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                players TEXT[] NOT NULL,
-                actions JSONB NOT NULL,
-                board_cards TEXT[] DEFAULT '{}',
-                stacks NUMERIC[] DEFAULT '{}',
-                winner_index INT,
-                created_at TIMESTAMPTZ DEFAULT now()
-            );
-            """)
-        self.conn.commit()
+# Written per hand: the hand itself (packed) and the projections search
+# filters on. ``stacks`` is only set on rows from before the packed column.
+HAND_COLUMNS = "hand_id, players, actions, board_cards, winner_index, created_at, packed"
+# Every column, for moving rows between tables as they are
+ALL_COLUMNS = "hand_id, players, actions, board_cards, stacks, winner_index, created_at, packed"
+
+# Reads decode the packed column; the column values are only fetched for
+# rows written before it existed (until backfill_packed has run).
+LEGACY_COLUMNS = ("players", "actions", "board_cards", "stacks", "winner_index")
+HAND_SELECT = "hand_id, created_at, packed, " + ", ".join(
+    f"CASE WHEN packed IS NULL THEN {c} END" for c in LEGACY_COLUMNS
+)
+
+
+# Partitioned by month (HANDS_PARTITION_INTERVAL) on created_at; the key has to
+# be part of the primary key. Partitions are created ahead of time by
+# services/hand_partitions.py; rows outside every partition land in
+# hands_default until maintenance moves them into their own partition.
+HANDS_TABLE = """
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE TABLE IF NOT EXISTS hands (
+    hand_id UUID NOT NULL DEFAULT gen_random_uuid(),
+    players TEXT[] NOT NULL,
+    actions JSONB NOT NULL,
+    board_cards TEXT[] DEFAULT '{}',
+    stacks NUMERIC[],
+    winner_index INT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    packed BYTEA,
+    PRIMARY KEY (hand_id, created_at)
+) PARTITION BY RANGE (created_at);
+"""
+
+HANDS_PARTITIONING = """
+CREATE TABLE IF NOT EXISTS hands_default PARTITION OF hands DEFAULT;
+-- Partitions exported to Parquet and detached (python -m poker_backend.services.hand_partitions archive)
+CREATE TABLE IF NOT EXISTS hands_archive (
+    partition TEXT PRIMARY KEY,
+    range_start TIMESTAMPTZ NOT NULL,
+    range_end TIMESTAMPTZ NOT NULL,
+    path TEXT NOT NULL,
+    rows BIGINT NOT NULL,
+    bytes BIGINT NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS hands_archive_range_idx ON hands_archive (range_start, range_end);
+"""
+
+# Indexes on the partitioned table are created on every partition
+HANDS_INDEXES = """
+-- Tables created before the packed encoding; existing rows stay NULL until backfilled
+ALTER TABLE hands ADD COLUMN IF NOT EXISTS packed BYTEA;
+-- Stacks are only in packed now; new rows leave the legacy column NULL
+ALTER TABLE hands ALTER COLUMN stacks DROP DEFAULT;
+-- Keyset pagination walks this index backwards (newest first);
+-- it also serves created_at range filters
+CREATE INDEX IF NOT EXISTS hands_created_at_hand_id_idx
+    ON hands (created_at, hand_id);
+-- /hand/search: board and holding containment, action containment
+CREATE INDEX IF NOT EXISTS hands_board_cards_gin ON hands USING GIN (board_cards);
+CREATE INDEX IF NOT EXISTS hands_players_gin ON hands USING GIN (players);
+CREATE INDEX IF NOT EXISTS hands_actions_gin ON hands USING GIN (actions jsonb_path_ops);
+"""
+
+
+def is_partitioned(cur) -> bool:
+    """Whether ``hands`` is the partitioned table (tables from before partitioning are plain)."""
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('hands');")
+    row = cur.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def _row_to_hand(r) -> Hand:
+    """Row of ``HAND_SELECT`` -> Hand."""
+    if r[2] is not None:
+        return decode(r[2], r[0], r[1])
+    return Hand(
+        hand_id=r[0],
+        players=r[3],
+        actions=r[4],
+        board_cards=r[5],
+        stacks=[float(s) for s in r[6] or []],
+        winner_index=r[7],
+        created_at=r[1],
+    )
 
-import json
-from typing import List
-from psycopg import Connection
-from poker_backend.models.hand import Hand
 
 class HandRepository:
-    def __init__(self, conn: Connection):
-        self.conn = conn
+    """Hand persistence. Each call borrows a pooled connection and returns it when done."""
+
+    def __init__(self, pool: ConnectionPool, stats: Optional[StatsBuffer] = None):
+        self.pool = pool
+        # Without a buffer, counts go into the summary tables in the insert's transaction
+        self.stats = stats
 
     def create_table(self):
-        with self.conn.cursor() as cur:
-            cur.execute("""
-            CREATE EXTENSION IF NOT EXISTS pgcrypto;
-            CREATE TABLE IF NOT EXISTS hands (
-                hand_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                players TEXT[] NOT NULL,
-                actions JSONB NOT NULL,
-                board_cards TEXT[] DEFAULT '{}',
-                stacks NUMERIC[] DEFAULT '{}',
-                winner_index INT,
-                created_at TIMESTAMPTZ DEFAULT now()
-            );
-            """)
-        self.conn.commit()
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(HANDS_TABLE)
+            if is_partitioned(cur):
+                cur.execute(HANDS_PARTITIONING)
+            else:
+                logger.warning("'hands' is not partitioned, convert it with: "
+                               "python -m poker_backend.services.hand_partitions migrate")
+            cur.execute(HANDS_INDEXES)
+            # Aggregates for GET /stats, kept up to date by every insert below (see _count_in_transaction)
+            cur.execute(STATS_SCHEMA)
 
-    def save_hand(self, hand: Hand) -> Hand:
+    @staticmethod
+    def _normalize(hand: Hand):
         # ✅ Normalize types
         players = hand.players
         if not players:
@@ -56,71 +129,180 @@ class HandRepository:
         elif not isinstance(players, list):
             players = [str(players)]
         else:
-            players = [str(p) for p in players]
+            # ["Ah", "Kh"] is stored as "AhKh" like every other holding, so search can match it
+            players = ["".join(map(str, p)) if isinstance(p, (list, tuple)) else str(p) for p in players]
 
         actions = hand.actions or []
         board_cards = hand.board_cards or []
         stacks = [float(s) for s in (hand.stacks or [])]
-        winner_index = hand.winner_index
+        return players, actions, board_cards, stacks, hand.winner_index
+
+    def _count_in_transaction(self, cur, hands: Iterable[Hand]):
+        if self.stats is None:
+            apply_delta(cur, StatsDelta.from_hands(hands))
 
-        print("🧾 Saving hand to DB:", {
-            "players": players,
-            "actions": actions,
-            "board_cards": board_cards,
-            "stacks": stacks,
-            "winner_index": winner_index
-        })
+    def _count_committed(self, hands: Iterable[Hand]):
+        """Hands the buffer adds to the summary tables on its next flush."""
+        if self.stats is not None:
+            self.stats.add(hands)
 
-        with self.conn.cursor() as cur:
+    @timed_query
+    def save_hand(self, hand: Hand) -> Hand:
+        players, actions, board_cards, stacks, winner_index = self._normalize(hand)
+
+        logger.debug("Saving hand: %d players, %d actions, board %s, winner %s",
+                     len(players), len(actions), board_cards, winner_index)
+
+        with self.pool.connection() as conn, conn.cursor() as cur:
             cur.execute("""
-                INSERT INTO hands (players, actions, board_cards, stacks, winner_index)
-                VALUES (%s::text[], %s::jsonb, %s::text[], %s::numeric[], %s)
+                INSERT INTO hands (players, actions, board_cards, winner_index, packed)
+                VALUES (%s::text[], %s::jsonb, %s::text[], %s, %s)
                 RETURNING hand_id, created_at;
             """, (
                 players,
-                json.dumps(actions),
+                json.dumps(search_actions(actions)),
                 board_cards,
-                stacks,
-                winner_index
+                winner_index,
+                encode(players, actions, board_cards, stacks, winner_index),
             ))
             row = cur.fetchone()
             hand.hand_id, hand.created_at = row
-
-        self.conn.commit()
+            self._count_in_transaction(cur, [hand])
+        self._count_committed([hand])
         return hand
 
+    def _copy_hands(self, cur, table: str, hands: List[Hand]):
+        with cur.copy(f"COPY {table} ({HAND_COLUMNS}) FROM STDIN") as copy:
+            for hand in hands:
+                players, actions, board_cards, stacks, winner_index = self._normalize(hand)
+                copy.write_row((
+                    hand.hand_id, players, Jsonb(search_actions(actions)), board_cards, winner_index,
+                    hand.created_at, encode(players, actions, board_cards, stacks, winner_index),
+                ))
+
+    @timed_query
+    def save_hands(self, hands: List[Hand]):
+        """
+        Bulk insert in one transaction through COPY. Every hand must already
+        carry its hand_id and created_at (generated by the caller).
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            self._copy_hands(cur, "hands", hands)
+            self._count_in_transaction(cur, hands)
+        self._count_committed(hands)
 
+    @timed_query
+    def import_hands(self, hands: List[Hand]) -> int:
+        """
+        Like ``save_hands`` but idempotent: rows are COPYed into a temp staging
+        table and hands whose hand_id already exists are skipped (archived
+        hands are no longer checked). Returns the number of rows actually inserted.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS hands_import
+                    (LIKE hands INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+            """)
+            self._copy_hands(cur, "hands_import", hands)
+            # The key includes created_at, which a re-import may not reproduce; match on hand_id
+            cur.execute(f"""
+                INSERT INTO hands ({HAND_COLUMNS})
+                SELECT {HAND_COLUMNS} FROM hands_import i
+                WHERE NOT EXISTS (SELECT 1 FROM hands h WHERE h.hand_id = i.hand_id)
+                ON CONFLICT DO NOTHING
+                RETURNING hand_id;
+            """)
+            inserted = {str(r[0]) for r in cur.fetchall()}
+            new = [h for h in hands if str(h.hand_id) in inserted]
+            self._count_in_transaction(cur, new)
+        self._count_committed(new)
+        return len(inserted)
+
+    @timed_query
     def get_all_hands(self) -> List[Hand]:
-        with self.conn.cursor() as cur:
-            cur.execute("SELECT hand_id, players, actions, board_cards, stacks, winner_index, created_at FROM hands ORDER BY created_at DESC;")
+        return list(self.iter_hands())
+
+    @timed_query
+    def get_hand(self, hand_id: str) -> Optional[Hand]:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT {HAND_SELECT} FROM hands WHERE hand_id = %s::uuid;", (hand_id,))
+            row = cur.fetchone()
+        return _row_to_hand(row) if row else None
+
+    @timed_query
+    def get_hands_page(self, limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Hand]:
+        """
+        Newest-first page of at most ``limit`` hands. ``after`` is the
+        (created_at, hand_id) of the last hand of the previous page.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            if after is None:
+                cur.execute(f"""
+                    SELECT {HAND_SELECT} FROM hands
+                    ORDER BY created_at DESC, hand_id DESC
+                    LIMIT %s;
+                """, (limit,))
+            else:
+                cur.execute(f"""
+                    SELECT {HAND_SELECT} FROM hands
+                    WHERE created_at <= %s AND (created_at, hand_id) < (%s, %s::uuid)
+                    ORDER BY created_at DESC, hand_id DESC
+                    LIMIT %s;
+                """, (after[0], after[0], after[1], limit))
             rows = cur.fetchall()
-        return [
-            Hand(
-                hand_id=r[0],
-                players=r[1],
-                actions=r[2],
-                board_cards=r[3],
-                stacks=[float(s) for s in r[4]],
-                winner_index=r[5],
-                created_at=r[6],
-            )
-            for r in rows
-        ]
+        return [_row_to_hand(r) for r in rows]
 
+    @timed_query
+    def search_hands(self, search: HandSearch, limit: int,
+                     after: Optional[Tuple[datetime, str]] = None) -> List[Hand]:
+        """Newest-first page of hands matching ``search``; same cursor as ``get_hands_page``."""
+        sql, params = search.query(HAND_SELECT, limit, after)
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        return [_row_to_hand(r) for r in rows]
 
-    def get_all_hands(self) -> List[Hand]:
-        with self.conn.cursor() as cur:
-            cur.execute("SELECT hand_id, players, actions, board_cards, stacks, winner_index, created_at FROM hands ORDER BY created_at DESC;")
+    def iter_hands(self, batch_size: int = 1000) -> Iterator[Hand]:
+        """
+        Streams every hand newest-first through a server-side cursor, so only
+        ``batch_size`` rows are in memory at a time. The pooled connection is
+        held until the iterator is exhausted or closed.
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor(name="hands_stream") as cur:
+                cur.itersize = batch_size
+                cur.execute(f"SELECT {HAND_SELECT} FROM hands ORDER BY created_at DESC, hand_id DESC;")
+                for r in cur:
+                    yield _row_to_hand(r)
+
+    def backfill_packed(self, batch_size: int = 5000) -> int:
+        """
+        Encodes the ``packed`` column for one batch of rows that lack it or
+        still carry the full legacy columns, trimming those to what new rows
+        store (no stacks, actions reduced to ``search_actions``), and returns
+        how many were updated (0 when done). Rows locked by another backfill are skipped,
+        so several runs can share the work.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT hand_id, players, actions, board_cards, stacks, winner_index
+                FROM hands WHERE packed IS NULL OR stacks IS NOT NULL
+                LIMIT %s FOR UPDATE SKIP LOCKED;
+            """, (batch_size,))
             rows = cur.fetchall()
-        return [
-            Hand(
-                hand_id=r[0],
-                players=r[1],
-                actions=r[2],
-                board_cards=r[3],
-                stacks=[float(s) for s in r[4]],
-                winner_index=r[5],
-                created_at=r[6],
-            )
-            for r in rows
-        ]
+            if not rows:
+                return 0
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS hands_backfill
+                    (hand_id UUID PRIMARY KEY, packed BYTEA NOT NULL, actions JSONB NOT NULL) ON COMMIT DELETE ROWS;
+            """)
+            with cur.copy("COPY hands_backfill (hand_id, packed, actions) FROM STDIN") as copy:
+                for hand_id, players, actions, board_cards, stacks, winner_index in rows:
+                    hand = Hand(hand_id, players, actions, board_cards, stacks or [], winner_index)
+                    normalized = self._normalize(hand)
+                    copy.write_row((hand_id, encode(*normalized), Jsonb(search_actions(normalized[1]))))
+            cur.execute("""
+                UPDATE hands SET packed = b.packed, actions = b.actions, stacks = NULL
+                FROM hands_backfill b WHERE hands.hand_id = b.hand_id;
+            """)
+            return cur.rowcount
@@ -0,0 +1,161 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg.types.json import Jsonb
+
+from poker_backend.evaluator.cards import int_to_card, parse_cards
+from poker_backend.services.preflop_table import canonical_class, class_combos
+
+STREETS = ("preflop", "flop", "turn", "river", "showdown")
+ACTION_TYPES = ("fold", "check", "call", "bet", "raise", "allin", "show")
+
+
+# The action keys search filters on, and all that ``hands.actions`` keeps of each action
+SEARCH_ACTION_KEYS = ("street", "type", "all_in")
+
+
+def search_actions(actions: List[Any]) -> List[Dict[str, Any]]:
+    """
+    What ``hands.actions`` stores for search: each distinct street / type /
+    all_in of the hand's player actions. Containment only asks whether some
+    action matches, so duplicates add nothing; the hand itself is in
+    ``packed`` and dealt cards are searched through ``board_cards``.
+    """
+    out, seen = [], set()
+    for a in actions:
+        if not isinstance(a, dict) or "deal_board" in a:
+            continue
+        projected = {k: a[k] for k in SEARCH_ACTION_KEYS if k in a}
+        key = json.dumps(projected)
+        if projected and key not in seen:
+            seen.add(key)
+            out.append(projected)
+    return out
+
+
+def holding_strings(hole: str) -> List[str]:
+    """
+    Stored player strings for a holding: "AhKh" -> ["AhKh", "KhAh"] (hands keep
+    whatever order they were dealt in); a class ("AKs", "TT") expands to all
+    its combos in both orders.
+    """
+    try:
+        cards = parse_cards(hole)
+    except ValueError:
+        cards = []
+    if len(cards) == 2:
+        return [cards[0] + cards[1], cards[1] + cards[0]]
+    out = []
+    for a, b in class_combos(canonical_class(hole)):
+        out.append(int_to_card(a) + int_to_card(b))
+        out.append(int_to_card(b) + int_to_card(a))
+    return out
+
+
+@dataclass
+class HandSearch:
+    """
+    Filters for ``search_hands``; every filter that is set must match.
+
+    ``board``: the board contains all of these cards (GIN on board_cards).
+    ``holdings``: some seat holds one of these player strings (GIN on players).
+    ``action_groups``: for each group, some player action contains one of
+    its objects (GIN jsonb_path_ops on the ``search_actions`` projection),
+    e.g. [[{"street": "river", "all_in": true}, {"street": "river", "type": "allin"}]]
+    for "a river all-in".
+    """
+
+    board: List[str] = field(default_factory=list)
+    holdings: List[str] = field(default_factory=list)
+    winner: Optional[int] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    action_groups: List[List[Dict[str, Any]]] = field(default_factory=list)
+
+    @classmethod
+    def from_params(cls, board: Optional[str] = None, hole: Optional[str] = None, winner: Optional[int] = None,
+                    since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    street: Optional[str] = None, action_type: Optional[str] = None,
+                    all_in: Optional[bool] = None, action: Optional[str] = None) -> "HandSearch":
+        """Builds the filters from query parameters; raises ValueError on bad input."""
+        search = cls(winner=winner, since=since, until=until)
+        if board:
+            search.board = parse_cards(board)
+        if hole:
+            search.holdings = holding_strings(hole)
+
+        if street is not None or action_type is not None or all_in:
+            if street is not None and street not in STREETS:
+                raise ValueError(f"Unknown street {street!r} (one of {', '.join(STREETS)})")
+            if action_type is not None and action_type not in ACTION_TYPES:
+                raise ValueError(f"Unknown action type {action_type!r} (one of {', '.join(ACTION_TYPES)})")
+            base: Dict[str, Any] = {}
+            if street is not None:
+                base["street"] = street
+            if action_type is not None:
+                base["type"] = action_type
+            if all_in and action_type != "allin":
+                # Imported histories flag all-in bets; API hands use the "allin" action type
+                group = [{**base, "all_in": True}]
+                if action_type is None:
+                    group.append({**base, "type": "allin"})
+            else:
+                group = [base]
+            search.action_groups.append(group)
+
+        if action:
+            try:
+                obj = json.loads(action)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"'action' must be a JSON object: {e}")
+            if not isinstance(obj, dict) or not obj:
+                raise ValueError("'action' must be a non-empty JSON object")
+            unknown = set(obj) - set(SEARCH_ACTION_KEYS)
+            if unknown:
+                raise ValueError(f"'action' filters on {', '.join(SEARCH_ACTION_KEYS)}, "
+                                 f"not {', '.join(sorted(unknown))}")
+            search.action_groups.append([obj])
+        return search
+
+    def where(self) -> Tuple[List[str], List[Any]]:
+        """SQL conditions (to be ANDed) and their parameters."""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if self.board:
+            conditions.append("board_cards @> %s::text[]")
+            params.append(self.board)
+        if self.holdings:
+            conditions.append("players && %s::text[]")
+            params.append(self.holdings)
+        if self.winner is not None:
+            conditions.append("winner_index = %s")
+            params.append(self.winner)
+        if self.since is not None:
+            conditions.append("created_at >= %s")
+            params.append(self.since)
+        if self.until is not None:
+            conditions.append("created_at < %s")
+            params.append(self.until)
+        for group in self.action_groups:
+            # One containment per alternative so each can use the GIN index (BitmapOr)
+            conditions.append("(" + " OR ".join("actions @> %s" for _ in group) + ")")
+            params.extend(Jsonb([obj]) for obj in group)
+        return conditions, params
+
+    def query(self, select: str, limit: int, after: Optional[Tuple[datetime, str]] = None) -> Tuple[str, List[Any]]:
+        """Newest-first keyset page of matching hands, same order and cursor as ``get_hands_page``."""
+        conditions, params = self.where()
+        if after is not None:
+            # The plain bound prunes partitions newer than the cursor; the row comparison does not
+            conditions.append("created_at <= %s AND (created_at, hand_id) < (%s, %s::uuid)")
+            params.extend((after[0], *after))
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        params.append(limit)
+        return f"""
+            SELECT {select} FROM hands
+            {where}
+            ORDER BY created_at DESC, hand_id DESC
+            LIMIT %s;
+        """, params
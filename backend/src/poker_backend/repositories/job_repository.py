@@ -0,0 +1,340 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from poker_backend.services.metrics import timed_query
+
+NOTIFY_CHANNEL = "sim_jobs"
+TERMINAL = ("succeeded", "failed", "cancelled")
+
+JOBS_SCHEMA = """
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE TABLE IF NOT EXISTS sim_jobs (
+    job_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    kind TEXT NOT NULL,
+    params JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    tasks_total INT NOT NULL,
+    tasks_done INT NOT NULL DEFAULT 0,
+    tasks_failed INT NOT NULL DEFAULT 0,
+    items_total INT NOT NULL,
+    items_done INT NOT NULL DEFAULT 0,
+    items_failed INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS sim_jobs_created_at_idx ON sim_jobs (created_at);
+CREATE TABLE IF NOT EXISTS sim_job_tasks (
+    job_id UUID NOT NULL REFERENCES sim_jobs ON DELETE CASCADE,
+    task_no INT NOT NULL,
+    payload JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    worker TEXT,
+    last_error TEXT,
+    PRIMARY KEY (job_id, task_no)
+);
+-- Claimable tasks: queued ones, and running ones whose lease (available_at) ran out
+CREATE INDEX IF NOT EXISTS sim_job_tasks_claim_idx
+    ON sim_job_tasks (available_at) WHERE status IN ('queued', 'running');
+CREATE TABLE IF NOT EXISTS sim_job_results (
+    job_id UUID NOT NULL REFERENCES sim_jobs ON DELETE CASCADE,
+    item_index INT NOT NULL,
+    ok BOOLEAN NOT NULL,
+    result JSONB,
+    error TEXT,
+    PRIMARY KEY (job_id, item_index)
+);
+"""
+
+JOB_COLUMNS = """
+    job_id, kind, status, params, tasks_total, tasks_done, tasks_failed,
+    items_total, items_done, items_failed, max_attempts, error, created_at, started_at, finished_at
+"""
+
+# Leases: a claimed task is "running" with available_at = now() + visibility
+# timeout. Its worker pushes available_at forward while it works; once it
+# stops (crash, lost machine) the task becomes claimable again.
+CLAIM = """
+    WITH next AS (
+        SELECT t.job_id, t.task_no
+        FROM sim_job_tasks t JOIN sim_jobs j ON j.job_id = t.job_id
+        WHERE t.status IN ('queued', 'running') AND t.available_at <= now()
+          AND t.attempts < j.max_attempts AND j.status IN ('queued', 'running')
+        ORDER BY t.available_at
+        LIMIT %(limit)s
+        FOR UPDATE OF t SKIP LOCKED
+    )
+    UPDATE sim_job_tasks t
+    SET status = 'running', attempts = t.attempts + 1, worker = %(worker)s,
+        available_at = now() + make_interval(secs => %(visibility)s)
+    FROM next, sim_jobs j
+    WHERE t.job_id = next.job_id AND t.task_no = next.task_no AND j.job_id = t.job_id
+    RETURNING t.job_id, t.task_no, t.attempts, j.kind, j.max_attempts, t.payload;
+"""
+
+# Counters and the final status move together; "cancelled" is never overwritten
+FINISH_TASKS = """
+    UPDATE sim_jobs SET
+        tasks_done = tasks_done + %(done)s,
+        tasks_failed = tasks_failed + %(failed)s,
+        items_done = items_done + %(items)s,
+        items_failed = items_failed + %(items_failed)s,
+        error = coalesce(error, %(error)s),
+        status = CASE
+            WHEN status = 'cancelled' THEN status
+            WHEN tasks_done + tasks_failed + %(done)s + %(failed)s < tasks_total THEN 'running'
+            WHEN tasks_failed + %(failed)s > 0 THEN 'failed'
+            ELSE 'succeeded' END,
+        finished_at = CASE
+            WHEN status <> 'cancelled' AND tasks_done + tasks_failed + %(done)s + %(failed)s >= tasks_total
+            THEN now() ELSE finished_at END
+    WHERE job_id = %(job_id)s;
+"""
+
+UPSERT_RESULT = """
+    INSERT INTO sim_job_results (job_id, item_index, ok, result, error) VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (job_id, item_index) DO UPDATE SET ok = EXCLUDED.ok, result = EXCLUDED.result, error = EXCLUDED.error;
+"""
+
+
+@dataclass
+class ClaimedTask:
+    job_id: Any
+    task_no: int
+    attempt: int
+    kind: str
+    max_attempts: int
+    payload: Dict[str, Any]
+
+
+def _finish_params(job_id, done=0, failed=0, items=0, items_failed=0, error=None) -> Dict[str, Any]:
+    return {"job_id": job_id, "done": done, "failed": failed, "items": items,
+            "items_failed": items_failed, "error": error}
+
+
+def _row_to_job(r) -> Dict[str, Any]:
+    (job_id, kind, status, params, tasks_total, tasks_done, tasks_failed, items_total, items_done,
+     items_failed, max_attempts, error, created_at, started_at, finished_at) = r
+    return {
+        "job_id": str(job_id),
+        "kind": kind,
+        "status": status,
+        "params": params,
+        "tasks": {"total": tasks_total, "done": tasks_done, "failed": tasks_failed},
+        "items": {"total": items_total, "done": items_done, "failed": items_failed},
+        "progress": round((tasks_done + tasks_failed) / tasks_total, 4) if tasks_total else 1.0,
+        "max_attempts": max_attempts,
+        "error": error,
+        "created_at": created_at,
+        "started_at": started_at,
+        "finished_at": finished_at,
+    }
+
+
+class JobRepository:
+    """The worker side of the job queue: claim, heartbeat, complete, fail, reap."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def create_tables(self):
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            # CREATE INDEX IF NOT EXISTS still takes a SHARE lock, which would
+            # deadlock with running workers; only run the DDL on a fresh database
+            cur.execute("SELECT to_regclass('sim_job_results') IS NOT NULL;")
+            if cur.fetchone()[0]:
+                return
+            cur.execute(JOBS_SCHEMA)
+
+    @timed_query
+    def claim(self, worker: str, limit: int, visibility: float) -> List[ClaimedTask]:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(CLAIM, {"limit": limit, "worker": worker, "visibility": visibility})
+            tasks = [ClaimedTask(*r) for r in cur.fetchall()]
+            if tasks:
+                cur.execute("""
+                    UPDATE sim_jobs SET status = 'running', started_at = now()
+                    WHERE job_id = ANY(%s) AND status = 'queued';
+                """, (list({t.job_id for t in tasks}),))
+        return tasks
+
+    def extend(self, worker: str, tasks: List[ClaimedTask], visibility: float) -> int:
+        """Heartbeat: pushes the leases of ``tasks`` still held by ``worker`` forward."""
+        if not tasks:
+            return 0
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.executemany("""
+                UPDATE sim_job_tasks SET available_at = now() + make_interval(secs => %s)
+                WHERE job_id = %s AND task_no = %s AND worker = %s AND attempts = %s AND status = 'running';
+            """, [(visibility, t.job_id, t.task_no, worker, t.attempt) for t in tasks])
+            return len(tasks)
+
+    @timed_query
+    def complete(self, worker: str, task: ClaimedTask, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Writes the task's results and marks it done in one transaction.
+        Returns False (and writes nothing) when the lease was lost, i.e.
+        another worker has claimed the task since.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE sim_job_tasks SET status = 'done', last_error = NULL
+                WHERE job_id = %s AND task_no = %s AND worker = %s AND attempts = %s AND status = 'running';
+            """, (task.job_id, task.task_no, worker, task.attempt))
+            if cur.rowcount == 0:
+                return False
+            cur.executemany(UPSERT_RESULT, [
+                (task.job_id, e["index"], e["ok"], Jsonb(e["result"]) if e.get("result") is not None else None,
+                 e.get("error"))
+                for e in entries
+            ])
+            failed = sum(1 for e in entries if not e["ok"])
+            cur.execute(FINISH_TASKS, _finish_params(task.job_id, done=1, items=len(entries), items_failed=failed))
+        return True
+
+    @timed_query
+    def fail(self, worker: str, task: ClaimedTask, error: str, retry_after: float) -> Optional[str]:
+        """
+        Records a failed attempt: the task is queued again after ``retry_after``
+        seconds, or failed for good once it has used ``max_attempts``.
+        Returns the task's new status (None when the lease was lost).
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE sim_job_tasks t SET
+                    status = CASE WHEN t.attempts >= j.max_attempts THEN 'failed' ELSE 'queued' END,
+                    available_at = now() + make_interval(secs => %s),
+                    worker = NULL, last_error = %s
+                FROM sim_jobs j
+                WHERE j.job_id = t.job_id AND t.job_id = %s AND t.task_no = %s
+                  AND t.worker = %s AND t.attempts = %s AND t.status = 'running'
+                RETURNING t.status;
+            """, (retry_after, error, task.job_id, task.task_no, worker, task.attempt))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            if row[0] == "failed":
+                cur.execute(FINISH_TASKS, _finish_params(
+                    task.job_id, failed=1,
+                    error=f"task {task.task_no} failed after {task.attempt} attempt(s): {error}",
+                ))
+            return row[0]
+
+    def next_available(self) -> Optional[float]:
+        """
+        Seconds until the earliest unfinished task of a live job can be
+        claimed: a retry waiting out its backoff or a lease still held (<= 0
+        when one is claimable or due for reaping now). None when no job has
+        work left.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT extract(epoch FROM min(t.available_at) - now())::float8
+                FROM sim_job_tasks t JOIN sim_jobs j ON j.job_id = t.job_id
+                WHERE t.status IN ('queued', 'running') AND j.status IN ('queued', 'running');
+            """)
+            return cur.fetchone()[0]
+
+    @timed_query
+    def reap(self) -> int:
+        """
+        Fails tasks whose lease ran out on their last allowed attempt (their
+        workers died); they are never claimed again otherwise. Returns how many.
+        """
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE sim_job_tasks t SET status = 'failed', worker = NULL,
+                    last_error = 'visibility timeout expired on attempt ' || t.attempts
+                FROM sim_jobs j
+                WHERE j.job_id = t.job_id AND t.status = 'running'
+                  AND t.available_at <= now() AND t.attempts >= j.max_attempts
+                RETURNING t.job_id, t.task_no;
+            """)
+            expired = cur.fetchall()
+            counts: Dict[Any, List[int]] = {}
+            for job_id, task_no in expired:
+                counts.setdefault(job_id, []).append(task_no)
+            for job_id, task_nos in sorted(counts.items(), key=lambda kv: str(kv[0])):
+                cur.execute(FINISH_TASKS, _finish_params(
+                    job_id, failed=len(task_nos),
+                    error=f"task {min(task_nos)} failed: visibility timeout expired on its last attempt",
+                ))
+        return len(expired)
+
+
+class AsyncJobRepository:
+    """The API side: submit, inspect, cancel, read results."""
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    @timed_query
+    async def submit(self, kind: str, params: Dict[str, Any], tasks: List[Dict[str, Any]],
+                     items_total: int, max_attempts: int) -> Dict[str, Any]:
+        """Inserts the job and its tasks in one transaction and wakes listening workers."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(f"""
+                INSERT INTO sim_jobs (kind, params, tasks_total, items_total, max_attempts)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING {JOB_COLUMNS};
+            """, (kind, Jsonb(params), len(tasks), items_total, max_attempts))
+            job = _row_to_job(await cur.fetchone())
+            async with cur.copy("COPY sim_job_tasks (job_id, task_no, payload) FROM STDIN") as copy:
+                for task_no, payload in enumerate(tasks):
+                    await copy.write_row((job["job_id"], task_no, Jsonb(payload)))
+            # Delivered on commit
+            await cur.execute(f"NOTIFY {NOTIFY_CHANNEL};")
+        return job
+
+    @timed_query
+    async def get(self, job_id) -> Optional[Dict[str, Any]]:
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(f"SELECT {JOB_COLUMNS} FROM sim_jobs WHERE job_id = %s;", (job_id,))
+            row = await cur.fetchone()
+        return _row_to_job(row) if row else None
+
+    @timed_query
+    async def list_jobs(self, status: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            if status is None:
+                await cur.execute(f"SELECT {JOB_COLUMNS} FROM sim_jobs ORDER BY created_at DESC LIMIT %s;",
+                                  (limit,))
+            else:
+                await cur.execute(f"""
+                    SELECT {JOB_COLUMNS} FROM sim_jobs WHERE status = %s
+                    ORDER BY created_at DESC LIMIT %s;
+                """, (status, limit))
+            rows = await cur.fetchall()
+        return [_row_to_job(r) for r in rows]
+
+    @timed_query
+    async def cancel(self, job_id) -> Optional[Dict[str, Any]]:
+        """Stops workers from claiming further tasks; tasks already running still store their results."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute("""
+                UPDATE sim_jobs SET status = 'cancelled', finished_at = now()
+                WHERE job_id = %s AND status IN ('queued', 'running');
+            """, (job_id,))
+            await cur.execute(f"SELECT {JOB_COLUMNS} FROM sim_jobs WHERE job_id = %s;", (job_id,))
+            row = await cur.fetchone()
+        return _row_to_job(row) if row else None
+
+    @timed_query
+    async def results(self, job_id, after: int, limit: int) -> List[Dict[str, Any]]:
+        """Per-item results in item order, starting after item ``after``."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute("""
+                SELECT item_index, ok, result, error FROM sim_job_results
+                WHERE job_id = %s AND item_index > %s
+                ORDER BY item_index LIMIT %s;
+            """, (job_id, after, limit))
+            rows = await cur.fetchall()
+        return [
+            {"index": i, "ok": ok, "result": result} if ok else {"index": i, "ok": ok, "error": error}
+            for i, ok, result, error in rows
+        ]
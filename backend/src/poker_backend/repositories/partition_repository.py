@@ -0,0 +1,324 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from psycopg import sql
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from poker_backend.models.hand import Hand
+from poker_backend.repositories.hand_repository import (
+    ALL_COLUMNS, HAND_SELECT, HANDS_INDEXES, HANDS_PARTITIONING, HANDS_TABLE, _row_to_hand, is_partitioned,
+)
+from poker_backend.services.metrics import timed_query
+
+INTERVALS = ("day", "week", "month")
+# Serializes partition DDL between app instances and CLI runs
+MAINTENANCE_LOCK = 0x68616E64  # "hand"
+
+_BOUNDS_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+# --- Periods (UTC) ---
+
+def period_start(ts: datetime, interval: str) -> datetime:
+    """Start of the partition period containing ``ts`` (weeks start on Monday, like date_trunc)."""
+    ts = ts.astimezone(timezone.utc)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "day":
+        return day
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown partition interval {interval!r} (one of {', '.join(INTERVALS)})")
+
+
+def period_end(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(days=7)
+    if interval == "month":
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    raise ValueError(f"Unknown partition interval {interval!r} (one of {', '.join(INTERVALS)})")
+
+
+def partition_name(start: datetime) -> str:
+    return f"hands_p{start:%Y%m%d}"
+
+
+@dataclass
+class Partition:
+    name: str
+    start: Optional[datetime]  # None for the default partition
+    end: Optional[datetime]
+    est_rows: int
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        return not self.is_default and self.start < end and start < self.end
+
+
+@dataclass
+class ArchiveEntry:
+    partition: str
+    range_start: datetime
+    range_end: datetime
+    path: str
+    rows: int
+    bytes: int
+    archived_at: Optional[datetime] = None
+
+    def to_dict(self):
+        return {
+            "partition": self.partition,
+            "range_start": self.range_start,
+            "range_end": self.range_end,
+            "path": self.path,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "archived_at": self.archived_at,
+        }
+
+
+ARCHIVE_COLUMNS = "partition, range_start, range_end, path, rows, bytes, archived_at"
+
+
+class PartitionRepository:
+    """
+    Partition DDL for ``hands``: listing, creating ahead, moving stray rows
+    out of the default partition, archiving (detaching) old partitions and
+    converting a table from before partitioning.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def partitioned(self) -> bool:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            return is_partitioned(cur)
+
+    @staticmethod
+    def _partitions(cur) -> List[Partition]:
+        # Bounds are printed in the session time zone
+        cur.execute("SET LOCAL TimeZone = 'UTC';")
+        cur.execute("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+                   greatest(c.reltuples::bigint, coalesce(s.n_live_tup, 0))
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE i.inhparent = to_regclass('hands')
+            ORDER BY c.relname;
+        """)
+        out = []
+        for name, bound, est_rows in cur.fetchall():
+            m = _BOUNDS_RE.search(bound or "")
+            start, end = (datetime.fromisoformat(m.group(1)), datetime.fromisoformat(m.group(2))) if m else (None, None)
+            out.append(Partition(name, start, end, max(int(est_rows), 0)))
+        return out
+
+    def list_partitions(self) -> List[Partition]:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            return self._partitions(cur)
+
+    @staticmethod
+    def _create_partition(cur, start: datetime, end: datetime):
+        name = sql.Identifier(partition_name(start))
+        bounds = sql.SQL("FROM ({}) TO ({})").format(sql.Literal(start), sql.Literal(end))
+        cur.execute("SELECT 1 FROM hands_default WHERE created_at >= %s AND created_at < %s LIMIT 1;", (start, end))
+        if cur.fetchone() is None:
+            cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF hands FOR VALUES {};").format(name, bounds))
+            return
+        # Rows for this range already sit in the default partition: move them into a
+        # standalone table first, then attach it (Postgres refuses the plain CREATE)
+        cur.execute(sql.SQL("CREATE TABLE {} (LIKE hands INCLUDING DEFAULTS INCLUDING CONSTRAINTS);").format(name))
+        cur.execute(sql.SQL("""
+            WITH moved AS (
+                DELETE FROM hands_default WHERE created_at >= %s AND created_at < %s
+                RETURNING {columns}
+            )
+            INSERT INTO {name} ({columns}) SELECT {columns} FROM moved;
+        """).format(name=name, columns=sql.SQL(ALL_COLUMNS)), (start, end))
+        cur.execute(sql.SQL("ALTER TABLE hands ATTACH PARTITION {} FOR VALUES {};").format(name, bounds))
+
+    def ensure_partitions(self, interval: str, ahead: int, now: Optional[datetime] = None) -> List[str]:
+        """
+        Creates the partitions for the current period and ``ahead`` more,
+        plus one for every period that has rows in the default partition.
+        Periods overlapping an existing partition (e.g. after changing the
+        interval) are left alone. Returns the names created; does nothing
+        while another instance holds the maintenance lock.
+        """
+        now = now or datetime.now(timezone.utc)
+        created = []
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            if not is_partitioned(cur):
+                return created
+            cur.execute("SELECT pg_try_advisory_xact_lock(%s);", (MAINTENANCE_LOCK,))
+            if not cur.fetchone()[0]:
+                return created
+            existing = self._partitions(cur)
+            archived = {r[0] for r in cur.execute("SELECT partition FROM hands_archive;").fetchall()}
+
+            starts = set()
+            start = period_start(now, interval)
+            for _ in range(ahead + 1):
+                starts.add(start)
+                start = period_end(start, interval)
+            cur.execute(f"SELECT DISTINCT date_trunc('{interval}', created_at, 'UTC') FROM hands_default;")
+            starts.update(r[0].astimezone(timezone.utc) for r in cur.fetchall())
+
+            for start in sorted(starts):
+                end = period_end(start, interval)
+                if any(p.overlaps(start, end) for p in existing) or partition_name(start) in archived:
+                    continue
+                self._create_partition(cur, start, end)
+                existing.append(Partition(partition_name(start), start, end, 0))
+                created.append(partition_name(start))
+        return created
+
+    def archivable(self, before: datetime) -> List[Partition]:
+        """Partitions whose whole range lies before ``before``, oldest first."""
+        return sorted((p for p in self.list_partitions() if not p.is_default and p.end <= before),
+                      key=lambda p: p.start)
+
+    def archive_partition(self, partition: Partition,
+                          export: Callable[[Iterator[Hand]], Tuple[str, int, int]],
+                          drop: bool = False, batch_size: int = 5000) -> ArchiveEntry:
+        """
+        In one transaction: blocks writes to the partition, streams its hands
+        (oldest first) to ``export`` -> (path, rows, bytes), checks the row
+        count, detaches the partition and records it in ``hands_archive``.
+        The detached table is dropped with ``drop``, otherwise renamed to
+        hands_archived_<period> so it can be re-attached by hand.
+        """
+        name = sql.Identifier(partition.name)
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(%s);", (MAINTENANCE_LOCK,))
+                cur.execute(sql.SQL("LOCK TABLE {} IN SHARE MODE;").format(name))
+                cur.execute(sql.SQL("SELECT count(*) FROM {};").format(name))
+                expected = cur.fetchone()[0]
+
+            def hands() -> Iterator[Hand]:
+                with conn.cursor(name="hands_archive_export") as stream:
+                    stream.itersize = batch_size
+                    stream.execute(sql.SQL("SELECT {} FROM {} ORDER BY created_at, hand_id;")
+                                   .format(sql.SQL(HAND_SELECT), name))
+                    for r in stream:
+                        yield _row_to_hand(r)
+
+            path, rows, size = export(hands())
+            if rows != expected:
+                raise RuntimeError(f"{partition.name}: exported {rows} rows, expected {expected}")
+
+            with conn.cursor() as cur:
+                cur.execute(sql.SQL("ALTER TABLE hands DETACH PARTITION {};").format(name))
+                if drop:
+                    cur.execute(sql.SQL("DROP TABLE {};").format(name))
+                else:
+                    archived = sql.Identifier(partition.name.replace("hands_p", "hands_archived_p", 1))
+                    cur.execute(sql.SQL("ALTER TABLE {} RENAME TO {};").format(name, archived))
+                cur.execute(f"""
+                    INSERT INTO hands_archive (partition, range_start, range_end, path, rows, bytes)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (partition) DO UPDATE SET
+                        path = EXCLUDED.path, rows = EXCLUDED.rows, bytes = EXCLUDED.bytes, archived_at = now()
+                    RETURNING {ARCHIVE_COLUMNS};
+                """, (partition.name, partition.start, partition.end, path, rows, size))
+                return ArchiveEntry(*cur.fetchone())
+
+    def archived(self) -> List[ArchiveEntry]:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT {ARCHIVE_COLUMNS} FROM hands_archive ORDER BY range_start;")
+            return [ArchiveEntry(*r) for r in cur.fetchall()]
+
+    # --- Conversion of an unpartitioned table ---
+
+    def convert(self, interval: str) -> Optional[int]:
+        """
+        Renames a plain ``hands`` table to ``hands_unpartitioned`` and creates
+        the partitioned table (with partitions covering the old rows) in its
+        place. New writes go to the new table from here on; ``move_batch``
+        copies the old rows over. Returns the number of partitions created for
+        the old rows, or None if there was nothing to convert.
+        """
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown partition interval {interval!r} (one of {', '.join(INTERVALS)})")
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            if to_regclass(cur, "hands") is None or is_partitioned(cur):
+                return None
+            cur.execute("LOCK TABLE hands IN ACCESS EXCLUSIVE MODE;")
+            cur.execute("ALTER TABLE hands RENAME TO hands_unpartitioned;")
+            cur.execute("ALTER TABLE hands_unpartitioned RENAME CONSTRAINT hands_pkey TO hands_unpartitioned_pkey;")
+            for index in ("hands_created_at_hand_id_idx", "hands_board_cards_gin", "hands_players_gin",
+                          "hands_actions_gin"):
+                cur.execute(sql.SQL("ALTER INDEX IF EXISTS {} RENAME TO {};")
+                            .format(sql.Identifier(index), sql.Identifier(f"{index}_unpartitioned")))
+            cur.execute(HANDS_TABLE)
+            cur.execute(HANDS_PARTITIONING)
+            cur.execute(HANDS_INDEXES)
+            # One partition per period that has rows; rows without a timestamp
+            # (the column was nullable) are kept at the epoch
+            cur.execute(f"""
+                SELECT DISTINCT date_trunc('{interval}', coalesce(created_at, 'epoch'), 'UTC')
+                FROM hands_unpartitioned;
+            """)
+            starts = sorted(r[0].astimezone(timezone.utc) for r in cur.fetchall())
+            for start in starts:
+                self._create_partition(cur, start, period_end(start, interval))
+            return len(starts)
+
+    def move_batch(self, batch_size: int) -> int:
+        """Moves up to ``batch_size`` rows from ``hands_unpartitioned`` into ``hands``; 0 when done."""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            if to_regclass(cur, "hands_unpartitioned") is None:
+                return 0
+            cur.execute(f"""
+                WITH moved AS (
+                    DELETE FROM hands_unpartitioned WHERE ctid = ANY(ARRAY(
+                        SELECT ctid FROM hands_unpartitioned LIMIT %s FOR UPDATE SKIP LOCKED
+                    ))
+                    RETURNING {ALL_COLUMNS}
+                )
+                INSERT INTO hands ({ALL_COLUMNS})
+                SELECT hand_id, players, actions, board_cards, stacks, winner_index,
+                       coalesce(created_at, 'epoch'), packed
+                FROM moved
+                ON CONFLICT DO NOTHING;
+            """, (batch_size,))
+            moved = cur.rowcount
+            if moved == 0:
+                cur.execute("SELECT NOT EXISTS (SELECT 1 FROM hands_unpartitioned);")
+                if cur.fetchone()[0]:
+                    cur.execute("DROP TABLE hands_unpartitioned;")
+            return moved
+
+
+def to_regclass(cur, name: str):
+    cur.execute("SELECT to_regclass(%s);", (name,))
+    return cur.fetchone()[0]
+
+
+class AsyncPartitionRepository:
+    """Archive manifest reads for ``async def`` routes."""
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    @timed_query
+    async def archived(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[ArchiveEntry]:
+        """Archived partitions overlapping [since, until), newest first."""
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            await cur.execute(f"""
+                SELECT {ARCHIVE_COLUMNS} FROM hands_archive
+                WHERE (%(since)s::timestamptz IS NULL OR range_end > %(since)s)
+                  AND (%(until)s::timestamptz IS NULL OR range_start < %(until)s)
+                ORDER BY range_start DESC;
+            """, {"since": since, "until": until})
+            return [ArchiveEntry(*r) for r in await cur.fetchall()]
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Optional
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+
+class SimulationCacheRepository:
+    """Shared tier of the simulation result cache (one row per canonical input hash)."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def create_table(self):
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS simulation_cache (
+                cache_key TEXT PRIMARY KEY,
+                result JSONB NOT NULL,
+                created_at TIMESTAMPTZ DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS simulation_cache_created_at_idx
+                ON simulation_cache (created_at);
+            """)
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT result FROM simulation_cache WHERE cache_key = %s;", (cache_key,))
+            row = cur.fetchone()
+            return row[0] if row else None
+
+    def put(self, cache_key: str, result: Dict[str, Any]):
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO simulation_cache (cache_key, result) VALUES (%s, %s)
+                ON CONFLICT (cache_key) DO NOTHING;
+                """,
+                (cache_key, Jsonb(result)),
+            )
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Deletes entries older than ``max_age_seconds``; returns how many."""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM simulation_cache WHERE created_at < now() - make_interval(secs => %s);",
+                (max_age_seconds,),
+            )
+            return cur.rowcount
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from poker_backend.services.hand_stats import StatsDelta
+from poker_backend.services.metrics import timed_query
+
+BUCKETS = ("hour", "day", "week", "month")
+
+# Hourly summary rows; rollups to coarser buckets are sums over these, so a
+# read touches (hours in range) rows no matter how many hands were saved.
+STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hand_stats_hourly (
+    bucket_start TIMESTAMPTZ PRIMARY KEY,
+    hands BIGINT NOT NULL DEFAULT 0,
+    showdowns BIGINT NOT NULL DEFAULT 0,
+    pot_total DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS hand_stats_seats (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    seat INT NOT NULL,
+    dealt BIGINT NOT NULL DEFAULT 0,
+    wins BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_start, seat)
+);
+CREATE TABLE IF NOT EXISTS hand_stats_actions (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    street TEXT NOT NULL,
+    action TEXT NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket_start, street, action)
+);
+"""
+
+UPSERT_BUCKET = """
+    INSERT INTO hand_stats_hourly AS s (bucket_start, hands, showdowns, pot_total) VALUES (%s, %s, %s, %s)
+    ON CONFLICT (bucket_start) DO UPDATE SET
+        hands = s.hands + EXCLUDED.hands,
+        showdowns = s.showdowns + EXCLUDED.showdowns,
+        pot_total = s.pot_total + EXCLUDED.pot_total;
+"""
+UPSERT_SEAT = """
+    INSERT INTO hand_stats_seats AS s (bucket_start, seat, dealt, wins) VALUES (%s, %s, %s, %s)
+    ON CONFLICT (bucket_start, seat) DO UPDATE SET
+        dealt = s.dealt + EXCLUDED.dealt,
+        wins = s.wins + EXCLUDED.wins;
+"""
+UPSERT_ACTION = """
+    INSERT INTO hand_stats_actions AS s (bucket_start, street, action, count) VALUES (%s, %s, %s, %s)
+    ON CONFLICT (bucket_start, street, action) DO UPDATE SET count = s.count + EXCLUDED.count;
+"""
+
+
+def apply_delta(cur, delta: StatsDelta):
+    """Adds ``delta`` to the summary tables inside the caller's transaction (a few rows per hour touched)."""
+    if not delta:
+        return
+    cur.executemany(UPSERT_BUCKET, delta.bucket_rows())
+    cur.executemany(UPSERT_SEAT, delta.seat_rows())
+    cur.executemany(UPSERT_ACTION, delta.action_rows())
+
+
+async def apply_delta_async(cur, delta: StatsDelta):
+    if not delta:
+        return
+    await cur.executemany(UPSERT_BUCKET, delta.bucket_rows())
+    await cur.executemany(UPSERT_SEAT, delta.seat_rows())
+    await cur.executemany(UPSERT_ACTION, delta.action_rows())
+
+
+def _range(since: Optional[datetime], until: Optional[datetime]) -> Tuple[str, List[Any]]:
+    conditions, params = [], []
+    if since is not None:
+        conditions.append("bucket_start >= date_trunc('hour', %s::timestamptz, 'UTC')")
+        params.append(since)
+    if until is not None:
+        conditions.append("bucket_start < %s")
+        params.append(until)
+    return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+
+def _rollup_queries(bucket: str, since: Optional[datetime], until: Optional[datetime]):
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r} (one of {', '.join(BUCKETS)})")
+    where, params = _range(since, until)
+    b = "date_trunc(%s, bucket_start, 'UTC')"
+    return [
+        (f"SELECT {b} AS b, sum(hands), sum(showdowns), sum(pot_total) "
+         f"FROM hand_stats_hourly {where} GROUP BY b ORDER BY b;", [bucket, *params]),
+        (f"SELECT {b} AS b, seat, sum(dealt), sum(wins) "
+         f"FROM hand_stats_seats {where} GROUP BY b, seat;", [bucket, *params]),
+        (f"SELECT {b} AS b, street, action, sum(count) "
+         f"FROM hand_stats_actions {where} GROUP BY b, street, action;", [bucket, *params]),
+    ]
+
+
+def _summary(hands: int, showdowns: int, pot: float, seats: Dict[int, List[int]],
+             streets: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    return {
+        "hands": hands,
+        "showdown_rate": round(showdowns / hands, 4) if hands else 0.0,
+        "avg_pot": round(pot / hands, 2) if hands else 0.0,
+        "seats": [
+            {"seat": seat, "dealt": dealt, "wins": wins, "win_rate": round(wins / dealt, 4) if dealt else 0.0}
+            for seat, (dealt, wins) in sorted(seats.items())
+        ],
+        "streets": {street: dict(sorted(actions.items())) for street, actions in streets.items()},
+    }
+
+
+def _assemble(bucket: str, bucket_rows, seat_rows, action_rows) -> Dict[str, Any]:
+    seats: Dict[Any, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    streets: Dict[Any, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+    total_seats: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    total_streets: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for b, seat, dealt, wins in seat_rows:
+        seats[b][seat] = [int(dealt), int(wins)]
+        total_seats[seat][0] += int(dealt)
+        total_seats[seat][1] += int(wins)
+    for b, street, action, count in action_rows:
+        streets[b][street][action] = int(count)
+        total_streets[street][action] += int(count)
+
+    buckets = []
+    hands = showdowns = 0
+    pot = 0.0
+    for b, n, sd, p in bucket_rows:
+        n, sd, p = int(n), int(sd), float(p)
+        hands, showdowns, pot = hands + n, showdowns + sd, pot + p
+        buckets.append({"start": b.isoformat(), **_summary(n, sd, p, seats[b], streets[b])})
+    return {
+        "bucket": bucket,
+        "totals": _summary(hands, showdowns, pot, total_seats, total_streets),
+        "buckets": buckets,
+    }
+
+
+class StatsRepository:
+    """Writes to the summary tables: buffered counts (``StatsBuffer``) and rebuilds."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    @timed_query
+    def apply(self, delta: StatsDelta):
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            apply_delta(cur, delta)
+
+    def rebuild(self, progress: Optional[Callable[[int], None]] = None, batch_size: int = 5000) -> int:
+        """
+        Recomputes the summary tables from ``hands`` in one transaction;
+        returns the number of hands counted. Writers to ``hands`` wait for it.
+        """
+        from poker_backend.repositories.hand_repository import HAND_SELECT, _row_to_hand
+
+        delta = StatsDelta()
+        count = 0
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("LOCK TABLE hands IN SHARE MODE;")
+                cur.execute("TRUNCATE hand_stats_hourly, hand_stats_seats, hand_stats_actions;")
+            with conn.cursor(name="hands_stats_rebuild") as cur:
+                cur.itersize = batch_size
+                cur.execute(f"SELECT {HAND_SELECT} FROM hands;")
+                for r in cur:
+                    delta.add(_row_to_hand(r))
+                    count += 1
+                    if progress is not None and count % batch_size == 0:
+                        progress(count)
+            with conn.cursor() as cur:
+                apply_delta(cur, delta)
+        if progress is not None:
+            progress(count)
+        return count
+
+
+class AsyncStatsRepository:
+    """Reads for GET /stats."""
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    @timed_query
+    async def rollup(self, bucket: str = "day", since: Optional[datetime] = None,
+                     until: Optional[datetime] = None) -> Dict[str, Any]:
+        """Totals plus one entry per ``bucket`` between ``since`` and ``until`` (hour granularity)."""
+        results = []
+        async with self.pool.connection() as conn, conn.cursor() as cur:
+            for sql, params in _rollup_queries(bucket, since, until):
+                await cur.execute(sql, params)
+                results.append(await cur.fetchall())
+        return _assemble(bucket, *results)
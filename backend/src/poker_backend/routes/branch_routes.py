@@ -0,0 +1,71 @@
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from typing import Dict, Any, List, Optional
+from poker_backend.repositories.async_hand_repository import AsyncHandRepository
+from poker_backend.routes.hand_routes import get_repository
+from poker_backend.services.branching import BranchNotFound, BranchService
+from poker_backend.services.work_classes import WorkClass
+
+
+router = APIRouter(prefix="/hand", tags=["Branches"])
+
+
+def get_branches(request: Request) -> BranchService:
+    return request.app.state.branches
+
+
+def simulate_work(request: Request) -> WorkClass:
+    # Replays and branches are pokerkit work like /hand/simulate and share its class
+    return request.app.state.work["simulate"]
+
+
+@router.post("/{hand_id}/branches")
+async def branch_hand(
+    hand_id: UUID,
+    at: int = Body(..., ge=0),
+    actions: List[Dict[str, Any]] = Body(default_factory=list),
+    setup: Optional[Dict[str, Any]] = Body(None),
+    repo: AsyncHandRepository = Depends(get_repository),
+    branches: BranchService = Depends(get_branches),
+    work: WorkClass = Depends(simulate_work),
+):
+    """
+    Replays stored hand ``hand_id`` up to its first ``at`` actions and plays
+    ``actions`` from there instead. ``setup`` sets blinds / stacks / antes /
+    min_bet (the stored hand only keeps final stacks; defaults are
+    /hand/simulate's) and the seed that deals unknown holdings. The response
+    carries a ``branch_id`` to branch again.
+    """
+    hand = await repo.get_hand(str(hand_id))
+    if hand is None:
+        raise HTTPException(status_code=404, detail="Hand not found")
+    try:
+        return await work.run(branches.branch_from_hand, hand, at, actions, setup)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/branches/{branch_id}")
+async def branch_branch(
+    branch_id: str,
+    at: int = Body(..., ge=0),
+    actions: List[Dict[str, Any]] = Body(default_factory=list),
+    branches: BranchService = Depends(get_branches),
+    work: WorkClass = Depends(simulate_work),
+):
+    """Branches off an earlier branch: its first ``at`` actions, then ``actions``."""
+    try:
+        return await work.run(branches.branch, branch_id, at, actions)
+    except BranchNotFound:
+        raise HTTPException(status_code=404, detail="Branch not found or expired")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/branches/{branch_id}")
+async def get_branch(branch_id: str, branches: BranchService = Depends(get_branches)):
+    """The branch's action log, parent and snapshot positions."""
+    try:
+        return branches.describe(branch_id)
+    except BranchNotFound:
+        raise HTTPException(status_code=404, detail="Branch not found or expired")
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, Optional
+from poker_backend.services.equity_service import EquityService
+from poker_backend.services.preflop_table import MAX_SEATS, MIN_SEATS
+
+
+router = APIRouter(prefix="/equity", tags=["Equity"])
+
+
+@router.post("/")
+async def calculate_equity(data: Dict[str, Any], request: Request):
+    """
+    Body: {"players": ["AhKh", "QsQd", "????"], "board": ["Jh", "7c", "2h"],
+           "dead": [], "iterations": 20000, "time_budget_ms": 500, "seed": 7}
+    Sampled results report their "seed"; the same seed (and pool size) samples the same runouts.
+    """
+    try:
+        return await request.app.state.work["heavy"].run(EquityService.calculate, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/ranges", response_class=ORJSONResponse)
+async def range_equity(data: Dict[str, Any], request: Request):
+    """
+    Body: {"hero": "15%", "villain": "QQ+, AKs, AKo, A5s-A4s", "board": "Kh7c2d",
+           "dead": [], "iterations": 2000, "time_budget_ms": 5000, "seed": 7, "matrix": false}
+    Ranges use the usual notation (AKs, TT+, A2s+, 98s-65s, AhKh, 15%, KQo:0.5). Flops, turns and
+    rivers are enumerated, preflop boards sampled ("iterations"). Matrices are cached per spot,
+    including its suit-isomorphic and swapped forms (X-Cache: hit | miss); a run cut short by
+    "time_budget_ms" reports "complete": false and is not cached.
+    """
+    try:
+        result, status = await request.app.state.work["heavy"].run(request.app.state.range_equity.calculate, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse(result, headers={"X-Cache": status})
+
+
+@router.get("/preflop")
+async def preflop_equity(
+    request: Request,
+    hand: str,
+    vs: Optional[str] = None,
+    seats: int = Query(MIN_SEATS, ge=MIN_SEATS, le=MAX_SEATS),
+):
+    """
+    Precomputed preflop equity: ?hand=AKs&vs=QQ (heads-up, classes or concrete
+    cards such as AhKh) or ?hand=AhKh&seats=6 (against 5 random hands).
+    """
+    table = request.app.state.preflop_table
+    if table is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Preflop table not built (python -m poker_backend.services.preflop_table)",
+        )
+    try:
+        return table.lookup(hand, vs, seats)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,58 +1,221 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any
+import json
+import logging
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import orjson
 from poker_backend.models.hand import Hand
-from poker_backend.repositories.hand_repository import HandRepository
+from poker_backend.models.schemas import HandOut, SaveHandRequest, SimulateRequest, SimulateResponse
+from poker_backend.repositories.async_hand_repository import AsyncHandRepository
+from poker_backend.repositories.hand_search import HandSearch
+from poker_backend.repositories.partition_repository import AsyncPartitionRepository
+from poker_backend.services.hand_archive import ArchiveUnavailable, as_utc
 from poker_backend.services.poker_service import PokerSimulationService
-from poker_backend.db.connection import get_connection
-import ast
+from poker_backend.services.batch_service import BatchSimulationService
+from poker_backend.services.self_play import SelfPlayService
+from poker_backend.services.work_classes import WorkClass, WorkQueueFull
+from poker_backend.db.connection import get_async_pool
+from poker_backend.routes.pagination import decode_cursor, encode_cursor
 
 
 router = APIRouter(prefix="/hand", tags=["Hands"])
+logger = logging.getLogger(__name__)
 
-@router.post("/simulate")
-def simulate_hand(data: Dict[str, Any]):
+MAX_BATCH_SIZE = int(os.getenv("SIM_BATCH_MAX", "10000"))
+MAX_SELF_PLAY_HANDS = int(os.getenv("SELF_PLAY_MAX_HANDS", "200000"))
+
+
+def get_repository(request: Request, pool=Depends(get_async_pool)) -> AsyncHandRepository:
+    return AsyncHandRepository(pool, request.app.state.hand_stats)
+
+
+def work_class(request: Request, name: str) -> WorkClass:
+    return request.app.state.work[name]
+
+
+@router.post("/simulate", response_model=SimulateResponse, response_model_exclude_unset=True)
+async def simulate_hand(data: SimulateRequest, request: Request, response: Response):
+    # Fully specified payloads are answered from the result cache (X-Cache: hit)
+    cache = request.app.state.simulation_cache
     try:
-        result = PokerSimulationService.simulate_hand(data)
-        return result
+        result, status = await work_class(request, "simulate").run(
+            cache.get_or_simulate, data, PokerSimulationService.simulate_hand
+        )
+    except WorkQueueFull:
+        raise
     except Exception as e:
-        import traceback
-        print("❌ Error during hand simulation:")
-        traceback.print_exc()
+        logger.exception("Error during hand simulation")
         raise HTTPException(status_code=500, detail=str(e))
+    response.headers["X-Cache"] = status
+    return result
+
+
+@router.post("/simulate/batch")
+async def simulate_batch(payload: Dict[str, Any], request: Request):
+    """
+    Simulates a list of hands on the process pool.
+
+    Body: {"hands": [<simulate payload>, ...], "stream": false}
+    With "stream": true the entries are sent as NDJSON in completion order.
+    """
+    hands = payload.get("hands")
+    if not isinstance(hands, list):
+        raise HTTPException(status_code=400, detail="'hands' must be a list of hand specs")
+    if len(hands) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE} hands)")
+
+    heavy = work_class(request, "heavy")
+    if payload.get("stream"):
+        # Reject before the 200 goes out; the slot is held while entries stream
+        heavy.check_capacity()
+
+        async def lines():
+            async with heavy.slot():
+                async for entry in BatchSimulationService.aiter_batch(hands):
+                    yield json.dumps(jsonable_encoder(entry)) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
 
+    return {"results": await heavy.run(BatchSimulationService.simulate_batch, hands)}
 
 
-@router.post("/")
-def save_hand(hand_data: Dict[str, Any], conn=Depends(get_connection)):
-    repo = HandRepository(conn)
+@router.post("/self-play")
+async def self_play(config: Dict[str, Any], request: Request):
+    """
+    Bots play consecutive hands at one or more tables.
 
-    players = hand_data.get("players", [])
-    normalized_players = []
+    Body: {"seats": ["random", "equity:call=0.45", {"type": "fixed", "raise": 0.4}],
+           "tables": 4, "hands_per_table": 5000, "seed": 42, "sample_every": 1000}
+    Returns per-table and per-policy aggregates and hands/second. Bigger
+    runs belong on the command line (python -m poker_backend.services.self_play).
+    """
+    try:
+        hands = int(config.get("tables", 1)) * int(config.get("hands_per_table", 1000))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="'tables' and 'hands_per_table' must be integers")
+    if hands > MAX_SELF_PLAY_HANDS:
+        raise HTTPException(status_code=413, detail=f"Run too large (max {MAX_SELF_PLAY_HANDS} hands)")
+    try:
+        return await work_class(request, "heavy").run(SelfPlayService.run, config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # Normalize in case frontend sent stringified lists
-    for p in players:
-        if isinstance(p, str):
-            try:
-                parsed = ast.literal_eval(p)
-                normalized_players.append(parsed)
-            except Exception:
-                normalized_players.append([p])
-        else:
-            normalized_players.append(p)
 
+@router.post("/", response_model=HandOut, response_class=ORJSONResponse)
+async def save_hand(hand_data: SaveHandRequest, request: Request, repo: AsyncHandRepository = Depends(get_repository)):
+    # Holdings arrive as "AhKh", ["Ah", "Kh"] or stringified lists; the model stores them all as "AhKh"
     hand = Hand(
         hand_id=None,
-        players=normalized_players,
-        actions=hand_data["actions"],
-        board_cards=hand_data.get("board_cards", []),
-        stacks=hand_data["stacks"],
-        winner_index=hand_data.get("winner_index"),
+        players=hand_data.players,
+        actions=hand_data.actions,
+        board_cards=hand_data.board_cards,
+        stacks=hand_data.stacks,
+        winner_index=hand_data.winner_index,
     )
-    saved = repo.save_hand(hand)
-    return saved.__dict__
+    # Write-behind mode: ids are assigned now, the row lands with the next flush
+    writer = request.app.state.hand_writer
+    if writer is None:
+        saved = await repo.save_hand(hand)
+    else:
+        # Only a full queue needs the blocking enqueue (and its timeout) on a thread
+        saved = writer.try_submit(hand) or await run_in_threadpool(writer.submit, hand)
+    # Rendered like the listings (created_at as "+00:00", not pydantic's "Z")
+    return ORJSONResponse(saved.to_dict())
+
+
+@router.get("/", response_model=List[HandOut], response_class=ORJSONResponse)
+async def get_hands(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    repo: AsyncHandRepository = Depends(get_repository),
+):
+    """
+    Newest-first page of hands. When more hands may follow, the X-Next-Cursor
+    response header holds the cursor for the next page.
+    """
+    hands = await repo.get_hands_page(limit, decode_cursor(cursor))
+    headers = {}
+    if len(hands) == limit:
+        last = hands[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.hand_id)
+    # Rows come from our own decoder; serialize them directly instead of validating them again
+    return ORJSONResponse([h.to_dict() for h in hands], headers=headers)
+
+
+@router.get("/search", response_model=List[HandOut], response_class=ORJSONResponse)
+async def search_hands(
+    board: Optional[str] = Query(None, description="Board contains these cards, e.g. AhKd"),
+    hole: Optional[str] = Query(None, description="Some seat holds this: AhKh, or a class such as AKs / TT"),
+    winner: Optional[int] = Query(None, ge=0),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    street: Optional[str] = None,
+    action_type: Optional[str] = None,
+    all_in: Optional[bool] = None,
+    action: Optional[str] = Query(None, description='Raw containment, e.g. {"street": "river", "type": "raise"}'),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    repo: AsyncHandRepository = Depends(get_repository),
+):
+    """
+    Newest-first page of matching hands; all given filters must hold.
+    street / action_type / all_in describe one action, e.g.
+    ?street=river&all_in=true is "hands with a river all-in".
+    Paginate with X-Next-Cursor like GET /hand/.
+    """
+    try:
+        search = HandSearch.from_params(board, hole, winner, since, until, street, action_type, all_in, action)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    hands = await repo.search_hands(search, limit, decode_cursor(cursor))
+    headers = {}
+    if len(hands) == limit:
+        last = hands[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.hand_id)
+    return ORJSONResponse([h.to_dict() for h in hands], headers=headers)
+
+
+@router.get("/archive", response_model=List[HandOut], response_class=ORJSONResponse)
+async def get_archived_hands(
+    request: Request,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    pool=Depends(get_async_pool),
+):
+    """
+    Newest-first page of archived hands (partitions exported by the retention
+    job), read from their Parquet files. Paginate with X-Next-Cursor like
+    GET /hand/; hands still in Postgres are not included. Bounds without an
+    offset are UTC.
+    """
+    since, until = as_utc(since), as_utc(until)
+    after = decode_cursor(cursor)
+    entries = await AsyncPartitionRepository(pool).archived(since, until)
+    try:
+        hands = await work_class(request, "heavy").run(
+            request.app.state.hand_archive.read, entries, since, until, limit, after
+        )
+    except ArchiveUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    headers = {}
+    if len(hands) == limit:
+        last = hands[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.hand_id)
+    return ORJSONResponse([h.to_dict() for h in hands], headers=headers)
+
+
+@router.get("/stream")
+async def stream_hands(repo: AsyncHandRepository = Depends(get_repository)):
+    """Every hand, newest first, as NDJSON read from a server-side cursor."""
 
+    async def lines():
+        async for h in repo.iter_hands():
+            yield orjson.dumps(h.to_dict()) + b"\n"
 
-@router.get("/")
-def get_all_hands(conn=Depends(get_connection)):
-    repo = HandRepository(conn)
-    return [h.__dict__ for h in repo.get_all_hands()]
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
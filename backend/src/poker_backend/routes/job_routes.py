@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from poker_backend.db.connection import get_async_pool
+from poker_backend.repositories.job_repository import TERMINAL, AsyncJobRepository
+from poker_backend.services.jobs import plan_job
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+STREAM_POLL_SECONDS = float(os.getenv("JOB_STREAM_POLL_MS", "500")) / 1000
+STATUSES = ("queued", "running") + TERMINAL
+
+
+def get_job_repository(pool=Depends(get_async_pool)) -> AsyncJobRepository:
+    return AsyncJobRepository(pool)
+
+
+async def _job_or_404(repo: AsyncJobRepository, job_id: UUID) -> Dict[str, Any]:
+    job = await repo.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", status_code=202)
+async def submit_job(body: Dict[str, Any], response: Response, repo: AsyncJobRepository = Depends(get_job_repository)):
+    """
+    Queues a job for the workers (python -m poker_backend.services.jobs worker).
+
+    Body: {"kind": "simulate", "params": {"hands": [...], "task_size": 200}, "max_attempts": 3}
+    or {"kind": "self_play", "params": <POST /hand/self-play config>}.
+    Poll GET /jobs/{job_id} or follow GET /jobs/{job_id}/stream.
+    """
+    try:
+        max_attempts = int(body.get("max_attempts", 3))
+        if max_attempts < 1:
+            raise ValueError("'max_attempts' must be positive")
+        # Splitting a large batch is CPU work; keep it off the event loop
+        params, tasks, items = await run_in_threadpool(plan_job, body.get("kind"), body.get("params") or {})
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = await repo.submit(body["kind"], params, tasks, items, max_attempts)
+    response.headers["Location"] = f"/jobs/{job['job_id']}"
+    return job
+
+
+@router.get("")
+async def list_jobs(
+    status: Optional[str] = Query(None, description=f"One of {', '.join(STATUSES)}"),
+    limit: int = Query(50, ge=1, le=500),
+    repo: AsyncJobRepository = Depends(get_job_repository),
+):
+    """Most recent jobs first."""
+    if status is not None and status not in STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status {status!r} (one of {', '.join(STATUSES)})")
+    return await repo.list_jobs(status, limit)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: UUID, repo: AsyncJobRepository = Depends(get_job_repository)):
+    return await _job_or_404(repo, job_id)
+
+
+@router.get("/{job_id}/results")
+async def job_results(
+    job_id: UUID,
+    response: Response,
+    after: int = Query(-1, ge=-1, description="Index of the last item already read"),
+    limit: int = Query(500, ge=1, le=5000),
+    repo: AsyncJobRepository = Depends(get_job_repository),
+):
+    """
+    Results stored so far, in item order. Tasks finish out of order, so a
+    running job may have gaps; X-Next-After holds the cursor for the next page.
+    """
+    await _job_or_404(repo, job_id)
+    results = await repo.results(job_id, after, limit)
+    if len(results) == limit:
+        response.headers["X-Next-After"] = str(results[-1]["index"])
+    return results
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: UUID, repo: AsyncJobRepository = Depends(get_job_repository)):
+    """The job's status as NDJSON: one line per change, ending with the final status."""
+    job = await _job_or_404(repo, job_id)
+
+    async def lines():
+        current, last = job, None
+        while True:
+            if current is None:
+                return
+            seen = (current["status"], current["tasks"], current["items"])
+            if seen != last:
+                last = seen
+                yield json.dumps(jsonable_encoder(current)) + "\n"
+            if current["status"] in TERMINAL:
+                return
+            await asyncio.sleep(STREAM_POLL_SECONDS)
+            current = await repo.get(job_id)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: UUID, repo: AsyncJobRepository = Depends(get_job_repository)):
+    """Queued tasks are dropped; tasks already running finish and keep their results."""
+    job = await repo.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+import orjson
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from poker_backend.services.live_tables import LiveError, LiveTableHub, Subscriber
+from poker_backend.services.work_classes import WorkQueueFull
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Live tables"])
+
+
+@router.websocket("/ws/tables")
+async def live_tables(websocket: WebSocket):
+    """
+    One connection, any number of tables. Client messages (JSON text):
+
+        {"op": "open", "ref": 1, "config": {<simulate payload>}}
+        {"op": "join", "ref": 2, "table": "<id>"}
+        {"op": "act", "ref": 3, "table": "<id>", "action": {"type": "raise", "amount": 120}}
+        {"op": "leave" | "close", "ref": 4, "table": "<id>"}
+
+    open and join answer {"op": "table", ...full view}; every applied action
+    is pushed to all followers of the table as {"op": "diff", "table", "changes"},
+    the acting client's copy with its "ref". Refused requests get
+    {"op": "error", "ref", "detail"}.
+    """
+    hub: LiveTableHub = websocket.app.state.live_tables
+    await websocket.accept()
+    sub = hub.connect()
+    sender = sub.sender = asyncio.create_task(_send(websocket, sub))
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            if sub.dropped:
+                break
+            message = None
+            try:
+                message = orjson.loads(raw)
+                if not isinstance(message, dict):
+                    raise LiveError("Messages are JSON objects")
+                await _handle(hub, sub, message)
+            except (orjson.JSONDecodeError, LiveError, WorkQueueFull, ValueError, TypeError) as e:
+                ref = message.get("ref") if isinstance(message, dict) else None
+                hub.send(sub, {"op": "error", "ref": ref, "detail": _detail(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.disconnect(sub)
+        sender.cancel()
+
+
+async def _handle(hub: LiveTableHub, sub: Subscriber, message: Dict[str, Any]):
+    op = message.get("op")
+    ref = message.get("ref")
+    if op == "act":
+        action = message.get("action")
+        if not isinstance(action, dict):
+            raise LiveError('act needs an "action" object')
+        await hub.act(sub, _table(message), action, ref)
+    elif op == "open":
+        config = message.get("config", {})
+        if not isinstance(config, dict):
+            raise LiveError('"config" is a simulate payload object')
+        view = await hub.open(sub, config)
+        hub.send(sub, {"op": "table", "ref": ref, **view})
+    elif op == "join":
+        view = await hub.join(sub, _table(message))
+        hub.send(sub, {"op": "table", "ref": ref, **view})
+    elif op == "leave":
+        hub.leave(sub, _table(message))
+        hub.send(sub, {"op": "left", "ref": ref, "table": message["table"]})
+    elif op == "close":
+        await hub.close(sub, _table(message))
+        hub.send(sub, {"op": "closed", "ref": ref, "table": message["table"]})
+    elif op == "ping":
+        hub.send(sub, {"op": "pong", "ref": ref})
+    else:
+        raise LiveError(f"Unknown op {op!r}")
+
+
+async def _send(websocket: WebSocket, sub: Subscriber):
+    """Writes queued messages in order; closes the socket as soon as the client is dropped."""
+    try:
+        while True:
+            text = await sub.queue.get()
+            await websocket.send_text(text)
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # the receive loop sees the disconnect too
+    except asyncio.CancelledError:
+        if not sub.dropped:
+            raise
+        # Cancelled by Subscriber.drop: close now rather than after the backlog
+        try:
+            await websocket.close(code=1013, reason="Too far behind")
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+    except Exception:
+        logger.exception("Live table sender failed")
+
+
+def _table(message: Dict[str, Any]) -> str:
+    table = message.get("table")
+    if not isinstance(table, str):
+        raise LiveError('"table" (a table id) is required')
+    return table
+
+
+def _detail(e: Exception) -> str:
+    if isinstance(e, WorkQueueFull):
+        return f"Too many queued {e.name} requests, try again"
+    if isinstance(e, orjson.JSONDecodeError):
+        return "Messages are JSON objects"
+    return str(e)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from poker_backend.services.metrics import CONTENT_TYPE, registry
+
+
+router = APIRouter(tags=["Ops"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text format: request, simulation and DB latency, engine errors, pool and queue gauges."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
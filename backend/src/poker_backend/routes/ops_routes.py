@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from poker_backend.db.connection import get_async_pool, get_pool, pool_stats
+from poker_backend.repositories.partition_repository import PartitionRepository
+from poker_backend.services.tracing import trace_buffer
+
+
+router = APIRouter(prefix="/ops", tags=["Ops"])
+
+
+@router.get("/db-pool")
+async def db_pool_stats(pool=Depends(get_pool), async_pool=Depends(get_async_pool)):
+    return {"async": pool_stats(async_pool), "sync": pool_stats(pool)}
+
+
+@router.get("/sessions")
+async def session_stats(request: Request):
+    return request.app.state.table_sessions.store.stats()
+
+
+@router.get("/live-tables")
+async def live_table_stats(request: Request):
+    """WebSocket connections, followed tables, messages pushed and per-action latency."""
+    return request.app.state.live_tables.stats()
+
+
+@router.get("/branches")
+async def branch_stats(request: Request):
+    return request.app.state.branches.stats()
+
+
+@router.get("/partitions")
+async def partition_stats(request: Request):
+    """Partitions of hands (estimated rows), archived partitions and the maintenance thread."""
+    repo = PartitionRepository(request.app.state.db_pool)
+    partitions, archived = await run_in_threadpool(lambda: (repo.list_partitions(), repo.archived()))
+    return {
+        "partitions": [{"name": p.name, "start": p.start, "end": p.end, "est_rows": p.est_rows} for p in partitions],
+        "archived": [e.to_dict() for e in archived],
+        "maintenance": request.app.state.partitions.stats(),
+    }
+
+
+@router.get("/write-behind")
+async def write_behind_stats(request: Request):
+    writer = request.app.state.hand_writer
+    return writer.stats() if writer is not None else {"enabled": False}
+
+
+@router.get("/hand-stats")
+async def hand_stats_buffer(request: Request):
+    """Counts waiting for the next summary-table flush."""
+    return request.app.state.hand_stats.stats()
+
+
+@router.get("/simulation-cache")
+async def simulation_cache_stats(request: Request):
+    return request.app.state.simulation_cache.stats()
+
+
+@router.get("/range-cache")
+async def range_cache_stats(request: Request):
+    return request.app.state.range_equity.cache.stats()
+
+
+@router.get("/work")
+async def work_stats(request: Request):
+    """Per work class: slots in use, waiting callers, queue and run latency."""
+    return {name: work.stats() for name, work in request.app.state.work.items()}
+
+
+@router.get("/traces")
+async def recent_traces(
+    limit: int = Query(50, ge=1, le=1000),
+    min_ms: float = Query(0.0, ge=0),
+    errors_only: bool = False,
+):
+    """Traced simulations of this API process, newest first."""
+    return {"stats": trace_buffer.stats(), "traces": trace_buffer.recent(limit, min_ms, errors_only)}
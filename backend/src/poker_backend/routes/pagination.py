@@ -0,0 +1,25 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+# Keyset cursors are opaque to clients: the (created_at, hand_id) of the last
+# row on the previous page, urlsafe-base64 encoded.
+
+def encode_cursor(created_at: datetime, hand_id) -> str:
+    raw = f"{created_at.isoformat()}|{hand_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, hand_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        # Validated here, so a tampered cursor is a 400 rather than a failed ::uuid cast
+        return datetime.fromisoformat(created_at), str(uuid.UUID(hand_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
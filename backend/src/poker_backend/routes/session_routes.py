@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import Dict, Any
+from poker_backend.services.table_session_service import SessionNotFound, TableSessionService
+from poker_backend.services.work_classes import WorkClass
+
+
+router = APIRouter(prefix="/hand/sessions", tags=["Sessions"])
+
+
+def get_sessions(request: Request) -> TableSessionService:
+    return request.app.state.table_sessions
+
+
+def simulate_work(request: Request) -> WorkClass:
+    # Session steps are pokerkit work like /hand/simulate and share its class
+    return request.app.state.work["simulate"]
+
+
+@router.post("/")
+async def create_session(data: Dict[str, Any], sessions: TableSessionService = Depends(get_sessions),
+                         work: WorkClass = Depends(simulate_work)):
+    """Starts a hand from a simulate payload (blinds, stacks, players, optional actions and seed)."""
+    try:
+        return await work.run(sessions.create, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{session_id}")
+async def get_session(session_id: str, sessions: TableSessionService = Depends(get_sessions),
+                      work: WorkClass = Depends(simulate_work)):
+    try:
+        return await work.run(sessions.get, session_id)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+
+@router.post("/{session_id}/actions")
+async def post_action(session_id: str, action: Dict[str, Any], request: Request, sessions: TableSessionService = Depends(get_sessions),
+                      work: WorkClass = Depends(simulate_work)):
+    """Applies one action, e.g. {"type": "raise", "amount": 120} or {"deal_board": "Jh7c2h"}."""
+    try:
+        result = await work.run(sessions.act, session_id, action)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    live = request.app.state.live_tables
+    if live.following(session_id):
+        await live.refresh(session_id)  # push the diff to WebSocket followers of this table
+    return result
+
+
+@router.delete("/{session_id}")
+async def close_session(session_id: str, sessions: TableSessionService = Depends(get_sessions),
+                        work: WorkClass = Depends(simulate_work)):
+    try:
+        await work.run(sessions.close, session_id)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"closed": session_id}
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from poker_backend.db.connection import get_async_pool
+from poker_backend.repositories.stats_repository import BUCKETS, AsyncStatsRepository
+
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+def get_stats_repository(pool=Depends(get_async_pool)) -> AsyncStatsRepository:
+    return AsyncStatsRepository(pool)
+
+
+@router.get("")
+async def get_stats(
+    bucket: str = Query("day", description=f"One of {', '.join(BUCKETS)}"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    repo: AsyncStatsRepository = Depends(get_stats_repository),
+):
+    """
+    Hands played, showdown rate, average pot, per-seat win rates and the
+    action mix per street: totals and one entry per bucket (UTC). Read from
+    the hourly summary tables, so ``since`` / ``until`` apply per hour.
+    """
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="'since' must be before 'until'")
+    try:
+        return await repo.rollup(bucket, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
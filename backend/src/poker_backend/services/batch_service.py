@@ -0,0 +1,125 @@
+import asyncio
+import math
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from poker_backend.services.poker_service import PokerSimulationService
+from poker_backend.services.worker_pool import pool_size, reset_process_pool, submit
+
+
+def _simulate_chunk(start: int, hands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Runs inside a worker process: simulates a contiguous slice of the batch."""
+    entries = []
+    for offset, spec in enumerate(hands):
+        index = start + offset
+        try:
+            result = PokerSimulationService.simulate_hand(spec)
+            entries.append({"index": index, "ok": True, "result": result})
+        except Exception as e:
+            entries.append({"index": index, "ok": False, "error": f"{type(e).__name__}: {e}"})
+    return entries
+
+
+class BatchSimulationService:
+    """
+    Runs many independent hand simulations across the shared process pool.
+
+    Hands are shipped to workers in chunks so the pickling/IPC cost is paid
+    per chunk rather than per hand. Every hand produces exactly one entry:
+    ``{"index", "ok": True, "result"}`` or ``{"index", "ok": False, "error"}``.
+    """
+
+    @staticmethod
+    def _chunks(hands: List[Dict[str, Any]], chunk_size: Optional[int]):
+        if not chunk_size:
+            # ~4 chunks per worker keeps cores busy without flooding the queue
+            chunk_size = max(1, min(64, math.ceil(len(hands) / (pool_size() * 4))))
+        for start in range(0, len(hands), chunk_size):
+            yield start, hands[start:start + chunk_size]
+
+    @staticmethod
+    def _failed_chunk(start: int, hands: List[Dict[str, Any]], e: Exception):
+        # A worker crash loses the whole chunk; report it per hand
+        return [
+            {"index": start + i, "ok": False, "error": f"{type(e).__name__}: {e}"}
+            for i in range(len(hands))
+        ]
+
+    @staticmethod
+    def _entries(future, start, chunk, pool, retried):
+        """The chunk's entries, or None when a dead worker lost it and it gets one more try on a new pool."""
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            if retried:
+                return BatchSimulationService._failed_chunk(start, chunk, e)
+            reset_process_pool(pool)
+            return None
+        except Exception as e:
+            return BatchSimulationService._failed_chunk(start, chunk, e)
+
+    @staticmethod
+    def iter_batch(hands: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yields result entries as their chunks finish (not in input order)."""
+        futures = {}
+
+        def add(start, chunk, retried=False):
+            pool, future = submit(_simulate_chunk, start, chunk)
+            futures[future] = (start, chunk, pool, retried)
+            return future
+
+        for start, chunk in BatchSimulationService._chunks(hands, chunk_size):
+            add(start, chunk)
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, chunk, pool, retried = futures.pop(future)
+                    entries = BatchSimulationService._entries(future, start, chunk, pool, retried)
+                    if entries is None:
+                        pending.add(add(start, chunk, retried=True))
+                        continue
+                    yield from entries
+        finally:
+            # Client went away mid-stream: don't keep simulating for nobody
+            for future in futures:
+                future.cancel()
+
+    @staticmethod
+    async def aiter_batch(hands: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """``iter_batch`` for the event loop: awaits the worker futures instead of blocking a thread."""
+        futures = {}
+
+        def add(start, chunk, retried=False):
+            pool, future = submit(_simulate_chunk, start, chunk)
+            future = asyncio.wrap_future(future)
+            futures[future] = (start, chunk, pool, retried)
+            return future
+
+        for start, chunk in BatchSimulationService._chunks(hands, chunk_size):
+            add(start, chunk)
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    start, chunk, pool, retried = futures.pop(future)
+                    entries = BatchSimulationService._entries(future, start, chunk, pool, retried)
+                    if entries is None:
+                        pending.add(add(start, chunk, retried=True))
+                        continue
+                    for entry in entries:
+                        yield entry
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def simulate_batch(hands: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Simulates every hand and returns the entries in input order."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(hands)
+        for entry in BatchSimulationService.iter_batch(hands, chunk_size):
+            results[entry["index"]] = entry
+        return results
@@ -0,0 +1,156 @@
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT
+from poker_backend.services.equity_service import _monte_carlo
+
+FOLD = "fold"
+CHECK_CALL = "check_call"
+RAISE = "raise"
+
+
+class Decision(NamedTuple):
+    """What a bot sees when it is its turn. Cards are ints (see evaluator.cards)."""
+    hole: Tuple[int, int]
+    board: Tuple[int, ...]
+    street: int            # 0 preflop .. 3 river
+    opponents: int         # players still in the hand besides this one
+    to_call: int
+    pot: int               # all chips in the middle, including current bets
+    stack: int             # behind, before calling
+    min_raise_to: int      # 0 when raising is not possible
+    max_raise_to: int
+
+
+class BotPolicy:
+    name = "policy"
+
+    def decide(self, d: Decision, rng: np.random.Generator) -> Tuple[str, int]:
+        """Returns (FOLD | CHECK_CALL | RAISE, raise-to amount)."""
+        raise NotImplementedError
+
+    def describe(self) -> Dict[str, Any]:
+        return {"type": self.name}
+
+    @staticmethod
+    def _raise_to(d: Decision, pot_fraction: float) -> int:
+        # A bet of pot_fraction * (pot after calling), on top of the call
+        target = d.max_raise_to - d.stack + d.to_call + int(pot_fraction * (d.pot + d.to_call))
+        return max(d.min_raise_to, min(d.max_raise_to, target))
+
+
+class RandomPolicy(BotPolicy):
+    """Uniform over the legal actions, with a uniform raise size."""
+    name = "random"
+
+    def decide(self, d, rng):
+        options = [CHECK_CALL]
+        if d.to_call:
+            options.append(FOLD)
+        if d.min_raise_to:
+            options.append(RAISE)
+        action = options[rng.integers(len(options))]
+        if action == RAISE:
+            return RAISE, int(rng.integers(d.min_raise_to, d.max_raise_to + 1))
+        return action, 0
+
+
+class FixedFrequencyPolicy(BotPolicy):
+    """Folds / calls / raises with fixed probabilities; never folds when it can check."""
+    name = "fixed"
+
+    def __init__(self, fold: float = 0.2, call: float = 0.5, raise_: float = 0.3, size: float = 0.75):
+        total = fold + call + raise_
+        if total <= 0 or min(fold, call, raise_) < 0:
+            raise ValueError("fixed policy frequencies must be non-negative and not all zero")
+        self.fold, self.call, self.raise_ = fold / total, call / total, raise_ / total
+        self.size = size
+
+    def decide(self, d, rng):
+        r = rng.random()
+        if r < self.raise_ and d.min_raise_to:
+            return RAISE, self._raise_to(d, self.size)
+        if r < self.raise_ + self.fold and d.to_call:
+            return FOLD, 0
+        return CHECK_CALL, 0
+
+    def describe(self):
+        return {"type": self.name, "fold": self.fold, "call": self.call, "raise": self.raise_, "size": self.size}
+
+
+class EquityThresholdPolicy(BotPolicy):
+    """
+    Estimates its equity against random hands for the remaining opponents
+    (a small Monte Carlo with the lookup-table evaluator), then raises above
+    ``raise_at``, calls when the equity beats both ``call_at`` and the pot
+    odds, and otherwise checks or folds.
+    """
+    name = "equity"
+
+    def __init__(self, call: float = 0.4, raise_: float = 0.65, size: float = 0.75, iterations: int = 300):
+        self.call_at = call
+        self.raise_at = raise_
+        self.size = size
+        self.iterations = iterations
+
+    def equity(self, d: Decision, rng: np.random.Generator) -> float:
+        used = set(d.hole) | set(d.board)
+        deck = [c for c in range(CARD_COUNT) if c not in used]
+        seats = [list(d.hole)] + [None] * d.opponents
+        tally = _monte_carlo(seats, list(d.board), deck, self.iterations, None, int(rng.integers(2 ** 32)))
+        return float(tally.eq_sum[0] / tally.n)
+
+    def decide(self, d, rng):
+        equity = self.equity(d, rng)
+        if equity >= self.raise_at and d.min_raise_to:
+            return RAISE, self._raise_to(d, self.size)
+        pot_odds = d.to_call / (d.pot + d.to_call) if d.to_call else 0.0
+        if not d.to_call or equity >= max(self.call_at, pot_odds):
+            return CHECK_CALL, 0
+        return FOLD, 0
+
+    def describe(self):
+        return {"type": self.name, "call": self.call_at, "raise": self.raise_at,
+                "size": self.size, "iterations": self.iterations}
+
+
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    FixedFrequencyPolicy.name: FixedFrequencyPolicy,
+    EquityThresholdPolicy.name: EquityThresholdPolicy,
+}
+
+
+def parse_policy_spec(spec: str) -> Dict[str, Any]:
+    """CLI form: "random", "fixed:fold=0.1,call=0.6,raise=0.3", "equity:call=0.45"."""
+    name, _, params = spec.partition(":")
+    parsed: Dict[str, Any] = {"type": name.strip()}
+    for item in filter(None, params.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid policy parameter {item!r} in {spec!r}")
+        parsed[key.strip()] = float(value)
+    return parsed
+
+
+def make_policy(spec: Union[str, Dict[str, Any]]) -> BotPolicy:
+    """Builds a policy from a name, a CLI spec string or {"type": ..., **params}."""
+    if isinstance(spec, str):
+        spec = parse_policy_spec(spec)
+    params = dict(spec)
+    kind = params.pop("type", None)
+    if kind not in POLICIES:
+        raise ValueError(f"Unknown bot policy {kind!r} (expected one of {sorted(POLICIES)})")
+    if "raise" in params:
+        params["raise_"] = params.pop("raise")
+    if "iterations" in params:
+        params["iterations"] = int(params["iterations"])
+    try:
+        return POLICIES[kind](**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for {kind!r} policy: {e}")
+
+
+def make_policies(specs: List[Union[str, Dict[str, Any]]]) -> List[BotPolicy]:
+    return [make_policy(s) for s in specs]
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import uuid
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from poker_backend.models.hand import Hand
+from poker_backend.services.poker_service import PokerSimulationService
+
+# Table setup a stored hand does not record; defaults are /hand/simulate's.
+# "seed" deals its unknown holdings ("????") reproducibly.
+SETUP_KEYS = ("blinds", "stacks", "antes", "min_bet", "seed")
+ACTION_BYTES = 512
+
+
+class BranchNotFound(KeyError):
+    pass
+
+
+@dataclass
+class Line:
+    """One line of play: a stored hand, or a what-if branched off another line."""
+
+    line_id: str
+    config: Dict[str, Any]                 # simulate payload without actions
+    hole_cards: List[List[str]]
+    players: List[Any]
+    actions: List[Dict[str, Any]]
+    hand_id: Optional[str] = None
+    parent: Optional[str] = None
+    at: Optional[int] = None               # actions of the parent kept before the new ones
+    # (actions applied, pickled pokerkit state), ascending; prefixes are shared with the parent
+    snapshots: List[Tuple[int, bytes]] = field(default_factory=list)
+    cache_key: Optional[str] = None        # hand + setup key of a stored hand's replay
+
+    def nearest_snapshot(self, at: int) -> Tuple[int, bytes]:
+        i = bisect_right(self.snapshots, at, key=lambda s: s[0]) - 1
+        return self.snapshots[i]
+
+    def action_bytes(self) -> int:
+        return ACTION_BYTES * len(self.actions)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "branch_id": self.line_id,
+            "hand_id": self.hand_id,
+            "parent": self.parent,
+            "at": self.at,
+            "actions": self.actions,
+            "snapshots_at": [i for i, _ in self.snapshots],
+        }
+
+
+class BranchService:
+    """
+    What-if lines from stored hands.
+
+    A stored hand is replayed once; the pokerkit state is pickled after the
+    deal and at every street boundary. A branch ("keep the first ``at``
+    actions, then play these instead") restores the nearest snapshot at or
+    before ``at``, replays only the actions between it and ``at`` and then
+    applies the new ones, so a tree of alternatives costs about the work of
+    its new actions. The branch point itself is snapshotted too, which makes
+    sibling branches start exactly there. Branches can be branched again.
+
+    Lines are held in an LRU bounded by ``max_lines`` and by bytes: each
+    snapshot blob is reference-counted over the cached lines holding it, so a
+    prefix shared by a branch and its parent counts once and is released with
+    the last line still holding it. An evicted stored hand is replayed again
+    on next use, an evicted branch is gone (404).
+    """
+
+    def __init__(self, max_lines: int, max_bytes: int):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._lines: "OrderedDict[str, Line]" = OrderedDict()
+        self._hand_lines: Dict[str, str] = {}  # hand + setup key -> line_id
+        self._bytes = 0
+        self._blob_refs: Dict[int, int] = {}  # id(snapshot blob) -> cached lines holding it
+        self._lock = threading.Lock()
+        self.replays = 0
+        self.branches = 0
+        self.actions_replayed = 0
+        self.actions_applied = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "BranchService":
+        return cls(
+            max_lines=int(os.getenv("BRANCH_CACHE_MAX_LINES", "2000")),
+            max_bytes=int(os.getenv("BRANCH_CACHE_MAX_BYTES", str(128 * 1024 * 1024))),
+        )
+
+    # --- API ---
+
+    def branch_from_hand(self, hand: Hand, at: int, actions: List[Dict[str, Any]],
+                         setup: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Branches off a stored hand; its replay is reused while cached."""
+        line = self._hand_line(hand, setup or {})
+        return self._branch(line, at, actions)
+
+    def branch(self, line_id: str, at: int, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Branches off an earlier branch."""
+        return self._branch(self._get(line_id), at, actions)
+
+    def describe(self, line_id: str) -> Dict[str, Any]:
+        return self._get(line_id).describe()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lines": len(self._lines),
+                "bytes": self._bytes,
+                "snapshots": len(self._blob_refs),
+                "max_lines": self.max_lines,
+                "max_bytes": self.max_bytes,
+                "hand_replays": self.replays,
+                "branches": self.branches,
+                "actions_replayed": self.actions_replayed,
+                "actions_applied": self.actions_applied,
+                "evictions": self.evictions,
+            }
+
+    # --- Lines ---
+
+    @staticmethod
+    def config_for(hand: Hand, setup: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulate payload (without actions) for a stored hand."""
+        unknown = set(setup) - set(SETUP_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown setup keys: {', '.join(sorted(unknown))} (allowed: {', '.join(SETUP_KEYS)})")
+        players = []
+        for p in hand.players or []:
+            p = "".join(map(str, p)) if isinstance(p, (list, tuple)) else str(p)
+            # "AhKh" -> ["Ah", "Kh"]; unknown holdings ("????") are dealt from the deck
+            players.append([p[:2], p[2:4]] if len(p) == 4 and "?" not in p else "????")
+        config = {"players": players, **{k: setup[k] for k in SETUP_KEYS if k in setup}}
+        return PokerSimulationService.with_seed(config)
+
+    def _hand_line(self, hand: Hand, setup: Dict[str, Any]) -> Line:
+        config = self.config_for(hand, setup)
+        key = hashlib.sha256(json.dumps([str(hand.hand_id), setup], sort_keys=True).encode()).hexdigest()
+        with self._lock:
+            line_id = self._hand_lines.get(key)
+            line = self._lines.get(line_id) if line_id else None
+            if line is not None:
+                self._lines.move_to_end(line_id)
+                return line
+
+        # Replay outside the lock; two racing replays of one hand are harmless
+        state, players, hole_cards = PokerSimulationService.create_state(config)
+        line = Line(str(uuid.uuid4()), config, hole_cards, players, [], hand_id=str(hand.hand_id), cache_key=key)
+        self._snapshot(line, 0, state)
+        self._play(line, state, list(hand.actions or []))
+        with self._lock:
+            self.replays += 1
+            self._hand_lines[key] = line.line_id
+            self._store(line)
+        return line
+
+    def _get(self, line_id: str) -> Line:
+        with self._lock:
+            line = self._lines.get(line_id)
+            if line is None:
+                raise BranchNotFound(line_id)
+            self._lines.move_to_end(line_id)
+            return line
+
+    @staticmethod
+    def _snapshot(line: Line, index: int, state) -> bytes:
+        blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        insort(line.snapshots, (index, blob), key=lambda s: s[0])
+        return blob
+
+    def _play(self, line: Line, state, actions: List[Dict[str, Any]]):
+        """Applies ``actions`` to ``state`` and the line's log, snapshotting each street start."""
+        for a in actions:
+            street = state.street_index
+            PokerSimulationService.apply_action(state, len(line.actions), a)
+            line.actions.append(a)
+            if state.street_index != street and state.street_index is not None:
+                self._snapshot(line, len(line.actions), state)
+
+    def _branch(self, parent: Line, at: int, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not isinstance(at, int) or isinstance(at, bool) or not 0 <= at <= len(parent.actions):
+            raise ValueError(f"'at' must be between 0 and {len(parent.actions)} (the line's action count)")
+        if not isinstance(actions, list) or not all(isinstance(a, dict) for a in actions):
+            raise ValueError("'actions' must be a list of action objects")
+
+        with self._lock:
+            start, blob = parent.nearest_snapshot(at)
+        state = pickle.loads(blob)
+        for idx in range(start, at):
+            PokerSimulationService.apply_action(state, idx, parent.actions[idx])
+        if at > start:
+            # Siblings branching at the same point start here without replaying
+            with self._lock:
+                if parent.nearest_snapshot(at)[0] != at:
+                    blob = self._snapshot(parent, at, state)
+                    if parent.line_id in self._lines:
+                        self._hold(blob)
+                        self._evict()
+
+        with self._lock:
+            inherited = [s for s in parent.snapshots if s[0] <= at]
+        line = Line(
+            str(uuid.uuid4()), parent.config, parent.hole_cards, list(parent.players),
+            list(parent.actions[:at]), hand_id=parent.hand_id, parent=parent.line_id, at=at,
+            snapshots=inherited,
+        )
+        self._play(line, state, actions)
+        PokerSimulationService.settle(state, line.players)
+        result = PokerSimulationService.snapshot(state, line.hole_cards, list(line.actions))
+        result.update({
+            "branch_id": line.line_id,
+            "parent": parent.line_id,
+            "hand_id": line.hand_id,
+            "at": at,
+            "actor_index": getattr(state, "actor_index", None),
+            "seed": line.config.get("seed"),
+            "replay": {"from_snapshot": start, "actions_replayed": at - start, "actions_applied": len(actions)},
+        })
+        with self._lock:
+            self.branches += 1
+            self.actions_replayed += at - start
+            self.actions_applied += len(actions)
+            self._store(line)
+        return result
+
+    # --- LRU (caller holds self._lock) ---
+
+    def _hold(self, blob: bytes):
+        # A held blob stays referenced by a cached line, so its id is not reused
+        refs = self._blob_refs.get(id(blob), 0)
+        if not refs:
+            self._bytes += len(blob)
+        self._blob_refs[id(blob)] = refs + 1
+
+    def _release(self, blob: bytes):
+        refs = self._blob_refs.pop(id(blob)) - 1
+        if refs:
+            self._blob_refs[id(blob)] = refs
+        else:
+            self._bytes -= len(blob)
+
+    def _store(self, line: Line):
+        self._lines[line.line_id] = line
+        self._bytes += line.action_bytes()
+        for _, blob in line.snapshots:
+            self._hold(blob)
+        self._evict()
+
+    def _evict(self):
+        while len(self._lines) > 1 and (len(self._lines) > self.max_lines or self._bytes > self.max_bytes):
+            _, evicted = self._lines.popitem(last=False)
+            self._bytes -= evicted.action_bytes()
+            if evicted.cache_key and self._hand_lines.get(evicted.cache_key) == evicted.line_id:
+                del self._hand_lines[evicted.cache_key]
+            for _, blob in evicted.snapshots:
+                self._release(blob)
+            self.evictions += 1
@@ -0,0 +1,102 @@
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT, decode_cards
+
+# Seeds are reported in responses; below 2**53 they survive a trip through
+# JavaScript numbers unchanged.
+MAX_SEED = 2 ** 53
+
+DECK = np.arange(CARD_COUNT, dtype=np.int8)
+_FULL = list(range(CARD_COUNT))
+
+
+def new_seed() -> int:
+    return int(np.random.SeedSequence().entropy % MAX_SEED)
+
+
+class Dealer:
+    """
+    Seeded dealing from the int deck (poker_backend.evaluator.cards).
+
+    Cards are drawn with a partial Fisher–Yates shuffle: only the first
+    ``count`` positions of the deck are shuffled, one bounded random int
+    each. ``deal_batch`` does the same for thousands of decks at once, one
+    vectorized swap per card. The same seed deals the same cards, so a
+    response that reports ``seed`` can be reproduced by sending it back.
+    """
+
+    def __init__(self, seed: Union[int, np.random.SeedSequence, None] = None):
+        if seed is None:
+            seed = new_seed()
+        elif not isinstance(seed, np.random.SeedSequence):
+            seed = int(seed)
+            if not 0 <= seed < MAX_SEED:
+                raise ValueError(f"seed must be between 0 and 2**53 - 1, got {seed}")
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_generator(cls, rng: np.random.Generator) -> "Dealer":
+        """A dealer drawing from an existing generator (e.g. one shared with bot policies)."""
+        dealer = cls.__new__(cls)
+        dealer.seed = None
+        dealer.rng = rng
+        return dealer
+
+    def spawn(self, n: int) -> List[np.random.SeedSequence]:
+        """Independent child seeds, e.g. one per worker task: ``Dealer(child)``."""
+        seq = self.seed if isinstance(self.seed, np.random.SeedSequence) else np.random.SeedSequence(self.seed)
+        return seq.spawn(n)
+
+    # --- Single hands ---
+
+    def deal(self, count: int, exclude: Iterable[int] = ()) -> List[int]:
+        """``count`` distinct cards from the deck without ``exclude``."""
+        excluded = set(exclude)
+        deck = [c for c in _FULL if c not in excluded] if excluded else _FULL.copy()
+        n = len(deck)
+        if count > n:
+            raise ValueError(f"Cannot deal {count} cards from {n}")
+        # Position i swaps with a uniform pick from i..n-1; one call for all
+        # the floats is several times cheaper than a bounded int per card
+        for i, u in enumerate(self.rng.random(count).tolist()):
+            j = i + int(u * (n - i))
+            deck[i], deck[j] = deck[j], deck[i]
+        return deck[:count]
+
+    def deal_cards(self, count: int, exclude: Iterable[int] = ()) -> List[str]:
+        """``deal`` as card strings ("Ah")."""
+        return decode_cards(self.deal(count, exclude))
+
+    # --- Batches ---
+
+    def deal_batch(self, hands: int, count: int, deck: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        (hands, count) array of cards, each row ``count`` distinct cards
+        from ``deck`` (default: all 52, as int8). Rows are independent.
+        """
+        deck = DECK if deck is None else np.asarray(deck)
+        n = len(deck)
+        if count > n:
+            raise ValueError(f"Cannot deal {count} cards from {n}")
+        decks = np.tile(deck, (hands, 1))
+        rows = np.arange(hands)
+        for i in range(count):
+            j = self.rng.integers(i, n, size=hands)
+            picked = decks[rows, j]
+            decks[rows, j] = decks[:, i]
+            decks[:, i] = picked
+        return decks[:, :count]
+
+    def deal_hands(self, hands: int, seats: int, board: int = 5,
+                   exclude: Iterable[int] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hole cards (hands, seats, 2) and boards (hands, board) for ``hands``
+        independent deals, none using a card of ``exclude``.
+        """
+        excluded = set(exclude)
+        deck = DECK[[c not in excluded for c in range(CARD_COUNT)]]
+        cards = self.deal_batch(hands, 2 * seats + board, deck)
+        return cards[:, :2 * seats].reshape(hands, seats, 2), cards[:, 2 * seats:]
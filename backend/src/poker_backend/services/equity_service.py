@@ -0,0 +1,210 @@
+import math
+import time
+from itertools import chain, combinations, islice
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT, encode_cards, is_unknown, parse_cards
+from poker_backend.evaluator.hand_evaluator import evaluate_batch
+from poker_backend.services.dealer import Dealer
+from poker_backend.services.worker_pool import pool_size, run_tasks
+
+# Runouts are scored this many at a time with one vectorized evaluator call per seat
+CHUNK = 4096
+
+
+class _Tally:
+    def __init__(self, n_seats: int):
+        self.n = 0
+        self.wins = np.zeros(n_seats, dtype=np.int64)
+        self.ties = np.zeros(n_seats, dtype=np.int64)
+        self.eq_sum = np.zeros(n_seats)
+        self.eq_sq = np.zeros(n_seats)
+
+    def add(self, strengths: np.ndarray):
+        """``strengths`` is (seats, runouts)."""
+        best = strengths.max(axis=0)
+        winners = strengths == best
+        count = winners.sum(axis=0)
+        share = winners / count
+        self.n += strengths.shape[1]
+        self.wins += (winners & (count == 1)).sum(axis=1)
+        self.ties += (winners & (count > 1)).sum(axis=1)
+        self.eq_sum += share.sum(axis=1)
+        self.eq_sq += (share * share).sum(axis=1)
+
+    def merge(self, other: "_Tally"):
+        self.n += other.n
+        self.wins += other.wins
+        self.ties += other.ties
+        self.eq_sum += other.eq_sum
+        self.eq_sq += other.eq_sq
+
+
+def _score(seats, board: np.ndarray, tally: _Tally):
+    """``seats`` is a list of (runouts, 2) arrays, ``board`` is (runouts, 5)."""
+    strengths = np.stack([evaluate_batch(np.concatenate([hole, board], axis=1)) for hole in seats])
+    tally.add(strengths)
+
+
+def _monte_carlo(seats, board, deck, iterations, deadline, seed):
+    """Worker task: random runouts. ``None`` seats get random hole cards each runout."""
+    dealer = Dealer(seed)
+    deck = np.asarray(deck)
+    tally = _Tally(len(seats))
+    unknown = [i for i, s in enumerate(seats) if s is None]
+    missing = 5 - len(board)
+    draw = missing + 2 * len(unknown)
+    while tally.n < iterations:
+        if deadline is not None and time.time() >= deadline:
+            break
+        n = min(CHUNK, iterations - tally.n)
+        if draw:
+            drawn = dealer.deal_batch(n, draw, deck)
+        else:
+            drawn = np.empty((n, 0), dtype=deck.dtype)
+        hole = [np.broadcast_to(np.asarray(s), (n, 2)) if s is not None else None for s in seats]
+        for k, i in enumerate(unknown):
+            hole[i] = drawn[:, missing + 2 * k: missing + 2 * k + 2]
+        known_board = np.broadcast_to(np.asarray(board, dtype=deck.dtype), (n, len(board)))
+        full_board = np.concatenate([known_board, drawn[:, :missing]], axis=1)
+        _score(hole, full_board, tally)
+    return tally
+
+
+def _enumerate(seats, board, deck, start, stop, deadline):
+    """Worker task: exact enumeration of runouts ``start``..``stop`` (combination order)."""
+    deck = np.asarray(deck)
+    missing = 5 - len(board)
+    tally = _Tally(len(seats))
+    runouts = islice(combinations(range(len(deck)), missing), start, stop)
+    position = start
+    while position < stop:
+        if deadline is not None and time.time() >= deadline:
+            break
+        n = min(CHUNK, stop - position)
+        idx = np.fromiter(chain.from_iterable(islice(runouts, n)), dtype=np.int64, count=n * missing).reshape(n, missing)
+        hole = [np.broadcast_to(np.asarray(s), (n, 2)) for s in seats]
+        known_board = np.broadcast_to(np.asarray(board, dtype=deck.dtype), (n, len(board)))
+        full_board = np.concatenate([known_board, deck[idx]], axis=1)
+        _score(hole, full_board, tally)
+        position += n
+    return tally
+
+
+class EquityService:
+    """
+    All-in equity per seat for known hole cards, a partial board and dead cards.
+
+    Runouts are scored in vectorized chunks with the lookup-table evaluator
+    (never a pokerkit ``State``) and spread over the shared process pool.
+    Small spots are enumerated exactly; otherwise random runouts are sampled
+    until the iteration or time budget is spent.
+    """
+
+    DEFAULT_ITERATIONS = 100000
+    MAX_ITERATIONS = 20_000_000
+    EXACT_THRESHOLD = 200000  # enumerate when there are at most this many runouts
+    MIN_TASK = 20000  # runouts worth shipping to another process
+
+    @staticmethod
+    def calculate(data: Dict[str, Any]) -> Dict[str, Any]:
+        players = data.get("players", [])
+        board = parse_cards(data.get("board", []))
+        dead = parse_cards(data.get("dead", []))
+        iterations = min(int(data.get("iterations", EquityService.DEFAULT_ITERATIONS)), EquityService.MAX_ITERATIONS)
+        budget_ms = data.get("time_budget_ms")
+        exact_threshold = int(data.get("exact_threshold", EquityService.EXACT_THRESHOLD))
+
+        seats: List[Optional[List[str]]] = []
+        for p in players:
+            if is_unknown(p):
+                seats.append(None)
+                continue
+            cards = parse_cards(p)
+            if len(cards) != 2:
+                raise ValueError(f"Each seat needs exactly 2 hole cards, got {p!r}")
+            seats.append(cards)
+
+        if len(seats) < 2:
+            raise ValueError("At least 2 seats are required")
+        if len(board) > 5:
+            raise ValueError("The board has at most 5 cards")
+        if iterations < 1:
+            raise ValueError("iterations must be positive")
+        known = [c for s in seats if s for c in s] + board + dead
+        if len(set(known)) != len(known):
+            raise ValueError("Duplicate cards in hole cards, board or dead cards")
+
+        used = set(encode_cards(known))
+        deck = [c for c in range(CARD_COUNT) if c not in used]
+        if len(deck) < 5 - len(board) + 2 * seats.count(None):
+            raise ValueError("Not enough cards left in the deck")
+
+        seat_cards = [encode_cards(s) if s else None for s in seats]
+        board_cards = encode_cards(board)
+        deadline = time.time() + float(budget_ms) / 1000 if budget_ms else None
+        dealer = Dealer(data.get("seed"))
+
+        missing = 5 - len(board)
+        total_runouts = math.comb(len(deck), missing)
+        exact = None not in seats and total_runouts <= exact_threshold
+        work = total_runouts if exact else iterations
+        tasks = max(1, min(pool_size(), math.ceil(work / EquityService.MIN_TASK)))
+        per_task = math.ceil(work / tasks)
+
+        started = time.perf_counter()
+        if exact:
+            jobs = [
+                (_enumerate, seat_cards, board_cards, deck, start, min(start + per_task, total_runouts), deadline)
+                for start in range(0, total_runouts, per_task)
+            ]
+        else:
+            # One child seed per task: the same seed and pool size give the same runouts
+            jobs = [
+                (_monte_carlo, seat_cards, board_cards, deck, per_task, deadline, child)
+                for child in dealer.spawn(tasks)
+            ]
+        if len(jobs) == 1:
+            # Not worth the round trip to a worker process
+            fn, *args = jobs[0]
+            tallies = [fn(*args)]
+        else:
+            tallies = run_tasks(jobs)
+
+        tally = _Tally(len(seats))
+        for t in tallies:
+            tally.merge(t)
+        n = tally.n
+        elapsed = time.perf_counter() - started
+
+        # A time-limited enumeration is only a partial (biased) sample
+        exact = exact and n == total_runouts
+        results = []
+        for i in range(len(seats)):
+            mean = float(tally.eq_sum[i] / n) if n else 0.0
+            if exact or n < 2:
+                half = 0.0
+            else:
+                var = max(float(tally.eq_sq[i] / n) - mean * mean, 0.0)
+                half = 1.96 * math.sqrt(var / n)
+            results.append({
+                "seat": i,
+                "cards": " ".join(seats[i]) if seats[i] else "????",
+                "win": float(tally.wins[i] / n) if n else 0.0,
+                "tie": float(tally.ties[i] / n) if n else 0.0,
+                "equity": mean,
+                "ci95": [max(mean - half, 0.0), min(mean + half, 1.0)],
+            })
+
+        return {
+            "method": "exact" if exact else "monte_carlo",
+            "runouts": n,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "runouts_per_second": round(n / elapsed) if elapsed > 0 else None,
+            "seed": None if exact else dealer.seed,
+            "board": board,
+            "dead": dead,
+            "seats": results,
+        }
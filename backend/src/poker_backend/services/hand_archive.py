@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from poker_backend.models.hand import Hand
+from poker_backend.repositories.partition_repository import ArchiveEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveUnavailable(RuntimeError):
+    """pyarrow is missing, or an archive file is not on this host."""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ArchiveUnavailable("Hand archives need pyarrow (pip install 'poker_backend[archive]')")
+    return pyarrow, pyarrow.parquet
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps without an offset are taken as UTC, like the archive's created_at."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _schema(pa):
+    return pa.schema([
+        ("hand_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("players", pa.list_(pa.string())),
+        ("actions", pa.string()),  # JSON text; actions have no fixed shape
+        ("board_cards", pa.list_(pa.string())),
+        ("stacks", pa.list_(pa.float64())),
+        ("winner_index", pa.int32()),
+    ])
+
+
+class HandArchive:
+    """
+    Parquet files of archived ``hands`` partitions, one per partition, on
+    local disk. Rows are written oldest first, so each row group covers a
+    time slice and its min/max statistics let reads skip the rest: a
+    newest-first page walks row groups backwards and stops once it is full.
+    """
+
+    def __init__(self, directory: str, compression: str = "zstd", row_group_size: int = 50_000):
+        self.directory = directory
+        self.compression = compression
+        self.row_group_size = row_group_size
+
+    @classmethod
+    def from_env(cls) -> "HandArchive":
+        return cls(
+            directory=os.path.abspath(os.getenv("HANDS_ARCHIVE_DIR", "archive/hands")),
+            compression=os.getenv("HANDS_ARCHIVE_COMPRESSION", "zstd"),
+            row_group_size=int(os.getenv("HANDS_ARCHIVE_ROW_GROUP", "50000")),
+        )
+
+    # --- Export ---
+
+    def export(self, name: str, hands: Iterator[Hand]) -> Tuple[str, int, int]:
+        """
+        Writes ``hands`` (oldest first) to <directory>/<name>.parquet and
+        returns (path, rows, bytes). The file only appears once it is complete.
+        """
+        pa, pq = _pyarrow()
+        schema = _schema(pa)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.parquet")
+        tmp = path + ".tmp"
+        rows = 0
+        try:
+            with pq.ParquetWriter(tmp, schema, compression=self.compression) as writer:
+                columns = {field.name: [] for field in schema}
+                for hand in hands:
+                    columns["hand_id"].append(str(hand.hand_id))
+                    columns["created_at"].append(hand.created_at)
+                    columns["players"].append(list(hand.players or []))
+                    columns["actions"].append(json.dumps(hand.actions or [], separators=(",", ":")))
+                    columns["board_cards"].append(list(hand.board_cards or []))
+                    columns["stacks"].append([float(s) for s in hand.stacks or []])
+                    columns["winner_index"].append(hand.winner_index)
+                    rows += 1
+                    if rows % self.row_group_size == 0:
+                        writer.write_table(pa.table(columns, schema=schema))
+                        columns = {field.name: [] for field in schema}
+                if columns["hand_id"] or rows == 0:
+                    writer.write_table(pa.table(columns, schema=schema))
+            with open(tmp, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        if pq.ParquetFile(path).metadata.num_rows != rows:
+            raise RuntimeError(f"{path}: row count does not match the export")
+        return path, rows, os.path.getsize(path)
+
+    # --- Reads ---
+
+    def read(self, entries: List[ArchiveEntry], since: Optional[datetime], until: Optional[datetime],
+             limit: int, after: Optional[Tuple[datetime, str]] = None) -> List[Hand]:
+        """
+        Newest-first page of archived hands in [since, until) from the files
+        of ``entries`` (newest first, see AsyncPartitionRepository.archived),
+        after the (created_at, hand_id) cursor of the previous page.
+        """
+        _, pq = _pyarrow()
+        since, until = as_utc(since), as_utc(until)
+        if after is not None:
+            after = (as_utc(after[0]), after[1])
+        out: List[Hand] = []
+        for entry in entries:
+            if after is not None and entry.range_start > after[0]:
+                continue
+            if not os.path.exists(entry.path):
+                raise ArchiveUnavailable(f"Archive file for {entry.partition} not found on this host: {entry.path}")
+            f = pq.ParquetFile(entry.path)
+            ts_col = f.schema_arrow.get_field_index("created_at")
+            for i in reversed(range(f.num_row_groups)):
+                stats = f.metadata.row_group(i).column(ts_col).statistics
+                if stats is not None and stats.has_min_max:
+                    if since is not None and stats.max < since:
+                        break  # earlier row groups are older still
+                    if (until is not None and stats.min >= until) or (after is not None and stats.min > after[0]):
+                        continue
+                for r in reversed(f.read_row_group(i).to_pylist()):
+                    ts = r["created_at"]
+                    if (since is not None and ts < since) or (until is not None and ts >= until):
+                        continue
+                    if after is not None and (ts, r["hand_id"]) >= (after[0], after[1]):
+                        continue
+                    out.append(Hand(
+                        hand_id=r["hand_id"],
+                        players=r["players"],
+                        actions=json.loads(r["actions"]),
+                        board_cards=r["board_cards"],
+                        stacks=r["stacks"],
+                        winner_index=r["winner_index"],
+                        created_at=ts,
+                    ))
+                    if len(out) == limit:
+                        return out
+        return out
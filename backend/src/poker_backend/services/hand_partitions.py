@@ -0,0 +1,200 @@
+"""
+Time partitions of the hands table.
+
+    python -m poker_backend.services.hand_partitions status
+    python -m poker_backend.services.hand_partitions maintain [--ahead 3]
+    python -m poker_backend.services.hand_partitions archive [--older-than-days 365] [--drop] [--dry-run]
+    python -m poker_backend.services.hand_partitions migrate [--batch-size 10000]
+
+hands is range-partitioned on created_at (HANDS_PARTITION_INTERVAL: day,
+week or month). The API keeps HANDS_PARTITIONS_AHEAD future partitions in
+place and moves rows that landed in hands_default (e.g. imports of old
+hands) into partitions of their own; "maintain" does the same once.
+
+"archive" is the retention job (run it from cron): every partition that
+ended more than --older-than-days ago is exported to a zstd Parquet file in
+HANDS_ARCHIVE_DIR, recorded in hands_archive and detached. Detached tables
+are kept as hands_archived_<period> unless --drop is given. Archived hands
+stay readable through GET /hand/archive. Their stats stay in the /stats
+aggregates, but hand_stats --rebuild only sees the hands still in Postgres.
+
+"migrate" converts a hands table from before partitioning: the table is
+renamed, the partitioned table takes its place (new writes go there at once)
+and the old rows are moved over in batches. Listings miss the rows not yet
+moved, so run it in a quiet period; it can be interrupted and re-run.
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from poker_backend.repositories.partition_repository import INTERVALS, PartitionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionMaintainer:
+    """
+    Keeps future partitions in place from inside the app: once at startup,
+    then every ``check_interval`` seconds on a background thread. Instances
+    coordinate through an advisory lock, so running one per worker is fine.
+    """
+
+    def __init__(self, repo: PartitionRepository, interval: str, ahead: int, check_interval: float):
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown HANDS_PARTITION_INTERVAL {interval!r} (one of {', '.join(INTERVALS)})")
+        self.repo = repo
+        self.interval = interval
+        self.ahead = ahead
+        self.check_interval = check_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.failures = 0
+        self.created: List[str] = []
+        self.last_run: Optional[datetime] = None
+
+    @classmethod
+    def from_env(cls, repo: PartitionRepository) -> "PartitionMaintainer":
+        return cls(
+            repo,
+            interval=os.getenv("HANDS_PARTITION_INTERVAL", "month"),
+            ahead=int(os.getenv("HANDS_PARTITIONS_AHEAD", "3")),
+            check_interval=float(os.getenv("HANDS_PARTITION_CHECK_SECONDS", "3600")),
+        )
+
+    def run_once(self) -> List[str]:
+        try:
+            created = self.repo.ensure_partitions(self.interval, self.ahead)
+        except Exception:
+            self.failures += 1
+            logger.exception("Partition maintenance failed")
+            return []
+        self.runs += 1
+        self.last_run = datetime.now(timezone.utc)
+        self.created += created
+        if created:
+            logger.info("Created hand partitions: %s", ", ".join(created))
+        return created
+
+    def start(self):
+        self.run_once()
+        self._thread = threading.Thread(target=self._run, name="hand-partitions", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            self.run_once()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "ahead": self.ahead,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "created": self.created[-20:],
+        }
+
+
+# --- CLI ---
+
+def _status(repo: PartitionRepository) -> int:
+    if not repo.partitioned():
+        print("'hands' is not partitioned (run: migrate)")
+        return 1
+    print(f"{'partition':<24} {'from':<12} {'to':<12} {'~rows':>12}")
+    for p in repo.list_partitions():
+        start = f"{p.start:%Y-%m-%d}" if p.start else "default"
+        end = f"{p.end:%Y-%m-%d}" if p.end else ""
+        print(f"{p.name:<24} {start:<12} {end:<12} {p.est_rows:>12,}")
+    for e in repo.archived():
+        print(f"{e.partition:<24} {e.range_start:%Y-%m-%d}   {e.range_end:%Y-%m-%d}   {e.rows:>12,}  "
+              f"archived {e.archived_at:%Y-%m-%d} -> {e.path} ({e.bytes / 1e6:.1f} MB)")
+    return 0
+
+
+def _archive(repo: PartitionRepository, older_than_days: int, drop: bool, dry_run: bool) -> int:
+    from poker_backend.services.hand_archive import HandArchive
+
+    archive = HandArchive.from_env()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    partitions = repo.archivable(cutoff)
+    if not partitions:
+        print(f"✅ No partitions ended before {cutoff:%Y-%m-%d}")
+        return 0
+    for p in partitions:
+        if dry_run:
+            print(f"would archive {p.name} ({p.start:%Y-%m-%d} .. {p.end:%Y-%m-%d}, ~{p.est_rows:,} rows)")
+            continue
+        started = time.perf_counter()
+        entry = repo.archive_partition(p, lambda hands: archive.export(p.name, hands), drop=drop)
+        print(f"✅ {p.name}: {entry.rows:,} hands -> {entry.path} ({entry.bytes / 1e6:.1f} MB) "
+              f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def _migrate(repo: PartitionRepository, interval: str, batch_size: int) -> int:
+    converted = repo.convert(interval)
+    if converted is not None:
+        print(f"✅ hands is now partitioned by {interval} ({converted} partitions for the existing rows)")
+    started = time.perf_counter()
+    total = 0
+    while True:
+        moved = repo.move_batch(batch_size)
+        if not moved:
+            break
+        total += moved
+        elapsed = time.perf_counter() - started
+        print(f"\r{total:,} hands moved ({total / elapsed:,.0f}/s)", end="", file=sys.stderr, flush=True)
+    if total:
+        print(file=sys.stderr)
+    print(f"✅ Moved {total:,} hands in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="list partitions and archived partitions")
+    p_maintain = sub.add_parser("maintain", help="create future partitions, empty the default partition")
+    p_maintain.add_argument("--ahead", type=int, default=int(os.getenv("HANDS_PARTITIONS_AHEAD", "3")))
+    p_archive = sub.add_parser("archive", help="export old partitions to Parquet and detach them")
+    p_archive.add_argument("--older-than-days", type=int, default=int(os.getenv("HANDS_RETENTION_DAYS", "365")))
+    p_archive.add_argument("--drop", action="store_true", help="drop detached partitions instead of keeping them")
+    p_archive.add_argument("--dry-run", action="store_true")
+    p_migrate = sub.add_parser("migrate", help="convert an unpartitioned hands table")
+    p_migrate.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    from psycopg_pool import ConnectionPool
+    from poker_backend.db.connection import conninfo
+    from poker_backend.repositories.hand_repository import HandRepository
+
+    interval = os.getenv("HANDS_PARTITION_INTERVAL", "month")
+    with ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        repo = PartitionRepository(pool)
+        if args.command == "migrate":
+            return _migrate(repo, interval, args.batch_size)
+        HandRepository(pool).create_table()
+        if args.command == "status":
+            return _status(repo)
+        if args.command == "maintain":
+            created = repo.ensure_partitions(interval, args.ahead)
+            print(f"✅ Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+            return 0
+        return _archive(repo, args.older_than_days, args.drop, args.dry_run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
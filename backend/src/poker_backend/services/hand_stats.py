@@ -0,0 +1,288 @@
+"""
+Aggregate statistics over saved hands, kept in hourly summary tables.
+
+In the API, HandRepository / AsyncHandRepository hand the counts of
+committed hands to a ``StatsBuffer``, which adds everything gathered in the
+last STATS_FLUSH_SECONDS to the summary rows in one transaction. Inserts
+never touch the summary rows, so concurrent writers do not queue on the
+current hour's row; GET /stats lags by at most one interval. Repositories
+created without a buffer (the CLI tools) add their batch's counts in the
+insert transaction. GET /stats only reads the summary rows. After bulk
+loads that bypassed the repository, after a crash that lost buffered
+counts, or to change what is counted, rebuild:
+
+    python -m poker_backend.services.hand_stats --rebuild
+
+The rebuild recomputes everything from ``hands`` in one transaction and
+holds a SHARE lock on ``hands`` meanwhile (reads go on, writes wait).
+Counts an API process still buffers for hands the rebuild saw are added
+again, so rebuild while the API is stopped.
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from poker_backend.models.hand import Hand
+
+logger = logging.getLogger(__name__)
+
+STREETS = ("preflop", "flop", "turn", "river")
+ACTION_TYPES = ("fold", "check", "call", "bet", "raise", "allin", "show")
+
+
+@dataclass
+class HandSummary:
+    seats: int
+    winner: Optional[int]
+    showdown: bool
+    pot: float
+    actions: Counter  # (street, action type) -> count
+
+
+def _number(v) -> Optional[float]:
+    return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None
+
+
+def summarize(hand: Hand) -> HandSummary:
+    """
+    What one hand adds to the aggregates.
+
+    ``pot`` is the chips committed through the logged actions (bet/raise
+    amounts are "raise to", call amounts are increments, a call without an
+    amount matches the street's largest bet); blinds and antes are not
+    stored with hands and are not included. Actions without a "seat" are
+    attributed in table order, the way pokerkit asks for them. A hand went
+    to showdown when at least two players never folded.
+    """
+    seats = len(hand.players or [])
+    counts: Counter = Counter()
+    folded, all_in = set(), set()
+    street = 0
+    committed: Dict[int, float] = {}
+    street_max = 0.0
+    pot = 0.0
+    # Implicit actor for unseated actions: first to act preflop is the seat after the big blind
+    actor = 2 % seats if seats else 0
+
+    def next_actor(seat: int) -> int:
+        for step in range(1, seats + 1):
+            candidate = (seat + step) % seats
+            if candidate not in folded and candidate not in all_in:
+                return candidate
+        return seat
+
+    for a in hand.actions or []:
+        if not isinstance(a, dict):
+            continue
+        if "deal_board" in a:
+            named = a.get("street")
+            street = STREETS.index(named) if named in STREETS else min(street + 1, len(STREETS) - 1)
+            committed, street_max = {}, 0.0
+            actor = next_actor(seats - 1) if seats else 0
+            continue
+
+        t = a.get("type")
+        named = a.get("street")
+        street_name = named if named in STREETS or named == "showdown" else STREETS[street]
+        counts[(street_name, t if t in ACTION_TYPES else "other")] += 1
+        if t not in ACTION_TYPES or t == "show" or not seats:
+            continue
+
+        seat = a.get("seat")
+        if not (isinstance(seat, int) and 0 <= seat < seats):
+            seat = actor
+        amount = _number(a.get("amount"))
+        before = committed.get(seat, 0.0)
+        after = before
+        if t in ("bet", "raise") and amount is not None:
+            after = amount
+        elif t == "call":
+            after = before + amount if amount is not None else street_max
+        elif t == "allin":
+            after = amount if amount is not None else street_max
+            all_in.add(seat)
+        elif t == "fold":
+            folded.add(seat)
+        if a.get("all_in") is True:
+            all_in.add(seat)
+        if after > before:
+            pot += after - before
+            committed[seat] = after
+            street_max = max(street_max, after)
+        actor = next_actor(seat)
+
+    winner = hand.winner_index if isinstance(hand.winner_index, int) and 0 <= hand.winner_index < seats else None
+    return HandSummary(seats, winner, seats - len(folded) >= 2, pot, counts)
+
+
+def bucket_of(created_at: Optional[datetime]) -> datetime:
+    """The hourly bucket (UTC) a hand is counted in."""
+    ts = created_at or datetime.now(timezone.utc)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class StatsDelta:
+    """Counts to add to the summary tables, grouped by hourly bucket."""
+
+    hands: Counter = field(default_factory=Counter)       # bucket -> hands
+    showdowns: Counter = field(default_factory=Counter)   # bucket -> hands that reached showdown
+    pot: Counter = field(default_factory=Counter)         # bucket -> chips committed
+    dealt: Counter = field(default_factory=Counter)       # (bucket, seat) -> hands dealt
+    wins: Counter = field(default_factory=Counter)        # (bucket, seat) -> hands won
+    actions: Counter = field(default_factory=Counter)     # (bucket, street, action) -> count
+
+    @classmethod
+    def from_hands(cls, hands: Iterable[Hand]) -> "StatsDelta":
+        delta = cls()
+        for hand in hands:
+            delta.add(hand)
+        return delta
+
+    def add(self, hand: Hand):
+        s = summarize(hand)
+        b = bucket_of(hand.created_at)
+        self.hands[b] += 1
+        self.showdowns[b] += s.showdown
+        self.pot[b] += s.pot
+        for seat in range(s.seats):
+            self.dealt[(b, seat)] += 1
+        if s.winner is not None:
+            self.wins[(b, s.winner)] += 1
+        for (street, action), n in s.actions.items():
+            self.actions[(b, street, action)] += n
+
+    def merge(self, other: "StatsDelta"):
+        for f in fields(self):
+            getattr(self, f.name).update(getattr(other, f.name))
+
+    def bucket_rows(self):
+        # Sorted, so concurrent transactions lock summary rows in the same order
+        return [(b, self.hands[b], self.showdowns[b], self.pot[b]) for b in sorted(self.hands)]
+
+    def seat_rows(self):
+        keys = sorted(set(self.dealt) | set(self.wins))
+        return [(b, seat, self.dealt[(b, seat)], self.wins[(b, seat)]) for b, seat in keys]
+
+    def action_rows(self):
+        return [(b, street, action, n) for (b, street, action), n in sorted(self.actions.items())]
+
+    def __bool__(self) -> bool:
+        return bool(self.hands)
+
+
+class StatsBuffer:
+    """
+    Counts of saved hands, added to the summary tables every ``interval``
+    seconds in one transaction on a background thread. A failed flush keeps
+    its counts for the next one; ``stop`` flushes what is left.
+    """
+
+    def __init__(self, repo, interval: float):
+        self.repo = repo  # StatsRepository
+        self.interval = interval
+        self._pending = StatsDelta()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.flushes = 0
+        self.failures = 0
+        self.hands = 0
+
+    @classmethod
+    def from_env(cls, repo) -> "StatsBuffer":
+        return cls(repo, interval=float(os.getenv("STATS_FLUSH_SECONDS", "1")))
+
+    def add(self, hands: Iterable[Hand]):
+        """Call after the hands' insert has committed."""
+        delta = StatsDelta.from_hands(hands)
+        if not delta:
+            return
+        with self._lock:
+            self._pending.merge(delta)
+
+    def flush(self) -> int:
+        """Applies the buffered counts; returns the number of hands they cover."""
+        with self._lock:
+            delta, self._pending = self._pending, StatsDelta()
+        if not delta:
+            return 0
+        try:
+            self.repo.apply(delta)
+        except Exception:
+            self.failures += 1
+            logger.exception("Applying buffered hand stats failed, keeping them for the next flush")
+            with self._lock:
+                delta.merge(self._pending)
+                self._pending = delta
+            return 0
+        count = sum(delta.hands.values())
+        self.flushes += 1
+        self.hands += count
+        return count
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="hand-stats", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = sum(self._pending.hands.values())
+        return {
+            "interval": self.interval,
+            "pending_hands": pending,
+            "flushes": self.flushes,
+            "flushed_hands": self.hands,
+            "failures": self.failures,
+        }
+
+
+def main(argv=None) -> int:
+    from psycopg_pool import ConnectionPool
+    from poker_backend.db.connection import conninfo
+    from poker_backend.repositories.hand_repository import HandRepository
+    from poker_backend.repositories.stats_repository import StatsRepository
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute all summary tables from hands")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    with ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        HandRepository(pool).create_table()
+        started = time.perf_counter()
+
+        def progress(count: int):
+            rate = count / max(time.perf_counter() - started, 1e-9)
+            print(f"\r{count:,} hands ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+
+        total = StatsRepository(pool).rebuild(progress)
+        print(file=sys.stderr)
+    print(f"✅ Rebuilt stats from {total:,} hands in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
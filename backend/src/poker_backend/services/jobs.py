@@ -0,0 +1,278 @@
+"""
+Durable simulation jobs: a Postgres-backed queue and the workers that drain it.
+
+POST /jobs splits a job into tasks (sim_job_tasks). Workers on any machine
+that can reach the database claim tasks with FOR UPDATE SKIP LOCKED, run them
+and write each task's results back in one transaction. A claimed task carries
+a lease (JOB_VISIBILITY_SECONDS) that its worker keeps extending; when the
+worker dies the lease runs out and another worker retries the task, up to
+the job's max_attempts. Failed attempts are retried with exponential backoff.
+
+    python -m poker_backend.services.jobs worker --processes 4
+    python -m poker_backend.services.jobs worker --once      # drain the queue (retries too), then exit
+
+Job kinds:
+
+    simulate   {"hands": [<simulate payload>, ...], "task_size": 200}
+               one result per hand, like POST /hand/simulate/batch
+    self_play  the POST /hand/self-play config; one task and one result per table,
+               identical to the synchronous run for the same seed
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from poker_backend.repositories.job_repository import NOTIFY_CHANNEL, ClaimedTask, JobRepository
+from poker_backend.services.batch_service import _simulate_chunk
+from poker_backend.services.self_play import _normalize, _play_table
+
+logger = logging.getLogger(__name__)
+
+TASK_SIZE = int(os.getenv("JOB_TASK_SIZE", "200"))
+MAX_ITEMS = int(os.getenv("JOB_MAX_ITEMS", "1000000"))
+
+
+# --- Job kinds ---
+
+@dataclass
+class JobKind:
+    # params -> (params to store, task payloads, result items in total); raises ValueError
+    plan: Callable[[Dict[str, Any]], Tuple[Dict[str, Any], List[Dict[str, Any]], int]]
+    # task payload -> result entries {"index", "ok", "result" | "error"}
+    run: Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def _plan_simulate(params: Dict[str, Any]):
+    hands = params.get("hands")
+    if not isinstance(hands, list) or not hands:
+        raise ValueError("'hands' must be a non-empty list of hand specs")
+    size = int(params.get("task_size") or TASK_SIZE)
+    if size < 1:
+        raise ValueError("'task_size' must be positive")
+    tasks = [{"start": start, "hands": hands[start:start + size]} for start in range(0, len(hands), size)]
+    # The hands live in the tasks; the job keeps the shape of the request
+    return {"hands": len(hands), "task_size": size}, tasks, len(hands)
+
+
+def _run_simulate(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _simulate_chunk(payload["start"], payload["hands"])
+
+
+def _plan_self_play(params: Dict[str, Any]):
+    config = _normalize(params)
+    return config, [{"table": t, "config": config} for t in range(config["tables"])], config["tables"]
+
+
+def _run_self_play(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    config, table = payload["config"], payload["table"]
+    # Same per-table seeds as SelfPlayService.run
+    seed = np.random.SeedSequence(config["seed"]).spawn(config["tables"])[table]
+    return [{"index": table, "ok": True, "result": _play_table(table, config, seed)}]
+
+
+JOB_KINDS: Dict[str, JobKind] = {
+    "simulate": JobKind(_plan_simulate, _run_simulate),
+    "self_play": JobKind(_plan_self_play, _run_self_play),
+}
+
+
+def plan_job(kind: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
+    """Validates a submission and splits it into tasks; raises ValueError on bad input."""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind {kind!r} (one of {', '.join(JOB_KINDS)})")
+    if not isinstance(params, dict):
+        raise ValueError("'params' must be an object")
+    stored, tasks, items = JOB_KINDS[kind].plan(params)
+    if items > MAX_ITEMS:
+        raise ValueError(f"Job too large ({items} items, max {MAX_ITEMS})")
+    return stored, tasks, items
+
+
+# --- Worker ---
+
+class JobWorker:
+    """
+    Claims tasks, runs them in this process and reports back. One worker runs
+    one task at a time; scale with more processes or machines.
+    """
+
+    def __init__(self, repo: JobRepository, name: Optional[str] = None, visibility: float = 60.0,
+                 claim_batch: int = 1, poll_interval: float = 2.0, retry_backoff: float = 5.0):
+        self.repo = repo
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.visibility = visibility
+        self.claim_batch = claim_batch
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self._held: List[ClaimedTask] = []
+        self._held_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.lost = 0
+        self._next_reap = 0.0
+
+    @classmethod
+    def from_env(cls, repo: JobRepository, name: Optional[str] = None) -> "JobWorker":
+        return cls(
+            repo, name,
+            visibility=float(os.getenv("JOB_VISIBILITY_SECONDS", "60")),
+            claim_batch=int(os.getenv("JOB_CLAIM_BATCH", "1")),
+            poll_interval=float(os.getenv("JOB_POLL_SECONDS", "2")),
+            retry_backoff=float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5")),
+        )
+
+    def _heartbeat(self, stop: threading.Event):
+        # Extends every held lease well before it runs out
+        while not stop.wait(self.visibility / 3):
+            with self._held_lock:
+                held = list(self._held)
+            try:
+                self.repo.extend(self.name, held, self.visibility)
+            except Exception:
+                logger.exception("Lease heartbeat failed")
+
+    def run_task(self, task: ClaimedTask):
+        try:
+            entries = JOB_KINDS[task.kind].run(task.payload)
+        except Exception as e:
+            # 5s, 10s, 20s, ... between attempts
+            status = self.repo.fail(self.name, task, f"{type(e).__name__}: {e}",
+                                    self.retry_backoff * 2 ** (task.attempt - 1))
+            logger.warning("Job %s task %d attempt %d failed (%s): %s",
+                           task.job_id, task.task_no, task.attempt, status, e)
+            self.failed += 1
+            return
+        if self.repo.complete(self.name, task, entries):
+            self.completed += 1
+        else:
+            logger.warning("Job %s task %d: lease lost, results discarded", task.job_id, task.task_no)
+            self.lost += 1
+
+    def run_once(self) -> int:
+        """Reaps expired leases, claims up to ``claim_batch`` tasks and runs them; returns how many."""
+        now = time.monotonic()
+        if now >= self._next_reap:
+            # Leases only expire once per visibility window; no need to look more often
+            self.repo.reap()
+            self._next_reap = now + self.visibility / 2
+        tasks = self.repo.claim(self.name, self.claim_batch, self.visibility)
+        with self._held_lock:
+            self._held = list(tasks)
+        for task in tasks:
+            self.run_task(task)
+            with self._held_lock:
+                self._held.remove(task)
+        return len(tasks)
+
+    def _idle_timeout(self, drain: bool) -> Optional[float]:
+        """How long an idle worker sleeps; None when draining and nothing is left to wait for."""
+        if not drain:
+            return self.poll_interval
+        wait = self.repo.next_available()
+        if wait is None:
+            return None
+        if wait <= 0:
+            # Claimable now, or an expired last-attempt lease that only goes away when reaped
+            self._next_reap = 0.0
+        return min(max(wait, 0.1), self.poll_interval)
+
+    def run_forever(self, stop: threading.Event, conninfo: str, drain: bool = False):
+        """
+        Works until ``stop`` is set (the current task is finished first).
+        Idle workers sleep on LISTEN sim_jobs, so new jobs start without
+        waiting for the poll interval. With ``drain`` it returns once no
+        live job has unfinished tasks; retries in backoff and leases held by
+        other workers are waited for.
+        """
+        import psycopg
+
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(heartbeat_stop,),
+                                     name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            with psycopg.connect(conninfo, autocommit=True) as listener:
+                listener.execute(f"LISTEN {NOTIFY_CHANNEL};")
+                while not stop.is_set():
+                    if self.run_once():
+                        continue
+                    timeout = self._idle_timeout(drain)
+                    if timeout is None:
+                        break
+                    for _ in listener.notifies(timeout=timeout, stop_after=1):
+                        pass
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+
+
+def _worker_process(index: int, drain: bool):
+    """Entry point of one worker process."""
+    from psycopg_pool import ConnectionPool
+    from poker_backend.db.connection import conninfo
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    # One connection for the work, one for the heartbeat thread
+    with ConnectionPool(conninfo(), min_size=1, max_size=2) as pool:
+        repo = JobRepository(pool)
+        repo.create_tables()
+        worker = JobWorker.from_env(repo, f"{socket.gethostname()}:{os.getpid()}")
+        started = time.perf_counter()
+        worker.run_forever(stop, conninfo(), drain=drain)
+    print(f"✅ worker {index} ({worker.name}): {worker.completed} tasks done, {worker.failed} failed, "
+          f"{worker.lost} lost leases in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_worker = sub.add_parser("worker", help="claim and run job tasks")
+    p_worker.add_argument("--processes", type=int, default=1, help="worker processes on this machine")
+    p_worker.add_argument("--once", action="store_true", help="exit once no job has tasks left, retries included")
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _worker_process(0, args.once)
+        return 0
+
+    # Create the tables once, before several processes race to do it
+    from psycopg_pool import ConnectionPool
+    from poker_backend.db.connection import conninfo
+    with ConnectionPool(conninfo(), min_size=1, max_size=1) as pool:
+        JobRepository(pool).create_tables()
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_worker_process, args=(i, args.once), name=f"job-worker-{i}")
+                 for i in range(args.processes)]
+    for p in processes:
+        p.start()
+
+    def forward(signum, frame):
+        # Each worker finishes its current task, then exits
+        for p in processes:
+            if p.is_alive():
+                os.kill(p.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for p in processes:
+        p.join()
+    return 0 if all(p.exitcode == 0 for p in processes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
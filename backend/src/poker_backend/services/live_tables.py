@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from math import inf
+from typing import Any, Dict, Optional, Set
+
+import orjson
+
+from poker_backend.services.session_store import TableSession
+from poker_backend.services.table_session_service import SessionNotFound, TableSessionService
+from poker_backend.services.work_classes import WorkClass, _Timings
+
+logger = logging.getLogger(__name__)
+
+
+# --- Compact table view ---
+
+def _chips(x) -> Any:
+    return "inf" if x == inf else x
+
+
+def table_view(session: TableSession, state) -> Dict[str, Any]:
+    """
+    What a live table shows after each action, small enough to diff per
+    click: per-seat stacks, bets and folds, the pot, the actor and the board.
+    ``seq`` is the number of actions applied so far.
+    """
+    done = not state.status
+    return {
+        "seq": len(session.actions),
+        "stacks": [_chips(s) for s in state.stacks],
+        "bets": [_chips(b) for b in state.bets],
+        "folded": [not s for s in state.statuses],
+        "pot": state.total_pot_amount,
+        "actor": state.actor_index,
+        "street": state.street_index,
+        "board": [f"{c.rank}{c.suit}" for cards in state.board_cards for c in cards],
+        "min_raise": state.min_completion_betting_or_raising_to_amount,
+        "done": done,
+        "payoffs": list(state.payoffs) if done else None,
+    }
+
+
+def full_view(session: TableSession, state) -> Dict[str, Any]:
+    """``table_view`` plus what only changes once: the table id, the hole cards and the deal's seed."""
+    view = table_view(session, state)
+    view["table"] = session.session_id
+    view["players"] = [" ".join(cards) for cards in session.hole_cards]
+    view["seed"] = session.config.get("seed")
+    return view
+
+
+def table_view_of(view: Dict[str, Any]) -> Dict[str, Any]:
+    """The ``table_view`` part of a ``full_view``, the baseline later diffs are taken against."""
+    return {k: v for k, v in view.items() if k not in ("table", "players", "seed")}
+
+
+def diff_view(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The keys of ``after`` that changed. Per-seat lists become {"seat": value}
+    for the seats that changed, and new board cards come as "board+" (the
+    board only grows within a hand).
+    """
+    changes: Dict[str, Any] = {}
+    for key, value in after.items():
+        old = before.get(key)
+        if value == old:
+            continue
+        if key == "board" and old is not None and value[:len(old)] == old:
+            changes["board+"] = value[len(old):]
+        elif isinstance(value, list) and isinstance(old, list) and len(value) == len(old) and key != "payoffs":
+            changes[key] = {str(i): v for i, (v, o) in enumerate(zip(value, old)) if v != o}
+        else:
+            changes[key] = value
+    return changes
+
+
+# --- Hub ---
+
+class Subscriber:
+    """
+    One WebSocket connection: the tables it follows and its outgoing
+    messages. Messages are queued as encoded text and written by the
+    connection's own sender task, so a broadcast never waits on a socket.
+    A client that falls ``max_queue`` messages behind is dropped: its
+    sender is cancelled and the backlog discarded, not written first.
+    """
+
+    def __init__(self, max_queue: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(max_queue)
+        self.tables: Set[str] = set()
+        self.dropped = False
+        self.sender: Optional[asyncio.Task] = None  # set by the connection
+
+    def push(self, text: str) -> bool:
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self.drop()
+            return False
+        return True
+
+    def drop(self):
+        self.dropped = True
+        if self.sender is not None:
+            self.sender.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+@dataclass
+class LiveTable:
+    table_id: str
+    view: Dict[str, Any]
+    subscribers: Set[Subscriber] = field(default_factory=set)
+    # Actions of one table are applied and broadcast in arrival order
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class LiveError(Exception):
+    """A client request the hub refuses; sent back as {"op": "error"}."""
+
+
+class LiveTableHub:
+    """
+    Live tables of one API worker, multiplexed over WebSocket connections.
+
+    The hands themselves are table sessions (``TableSessionService``): a
+    table is a session id, its pokerkit state stays cached between actions
+    and the session store's limits decide how many states are kept live.
+    The hub only adds, per followed table, the last compact view and its
+    subscribers; each action is applied once on the ``simulate`` work class
+    and its diff encoded once and queued to every subscriber.
+    """
+
+    def __init__(self, sessions: TableSessionService, work: WorkClass, max_tables_per_socket: int,
+                 send_queue: int):
+        self.sessions = sessions
+        self.work = work
+        self.max_tables_per_socket = max_tables_per_socket
+        self.send_queue = send_queue
+        self._tables: Dict[str, LiveTable] = {}
+        self._subscribers: Set[Subscriber] = set()
+        self.opened = 0
+        self.actions = 0
+        self.messages_out = 0
+        self.bytes_out = 0
+        self.dropped = 0
+        self.act_ms = _Timings()
+
+    @classmethod
+    def from_env(cls, sessions: TableSessionService, work: WorkClass) -> "LiveTableHub":
+        return cls(
+            sessions,
+            work,
+            max_tables_per_socket=int(os.getenv("LIVE_MAX_TABLES_PER_SOCKET", "1000")),
+            send_queue=int(os.getenv("LIVE_SEND_QUEUE", "1024")),
+        )
+
+    def connect(self) -> Subscriber:
+        sub = Subscriber(self.send_queue)
+        self._subscribers.add(sub)
+        return sub
+
+    def disconnect(self, sub: Subscriber):
+        self._subscribers.discard(sub)
+        for table_id in list(sub.tables):
+            self.leave(sub, table_id)
+
+    # --- Requests ---
+
+    async def open(self, sub: Subscriber, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Starts a hand (simulate payload) and follows it; returns the full view."""
+        self._check_room(sub)
+        view = await self.work.run(self.sessions.create, config, full_view)
+        self.opened += 1
+        self._follow(sub, view)
+        return view
+
+    async def join(self, sub: Subscriber, table_id: str) -> Dict[str, Any]:
+        """Follows an existing table (e.g. one created over HTTP); returns the full view."""
+        if table_id not in sub.tables:
+            self._check_room(sub)
+        table = self._tables.get(table_id)
+        if table is None:
+            return await self._join(sub, table_id)
+        async with table.lock:  # no diff of this table is in flight while the view is read
+            return await self._join(sub, table_id)
+
+    async def _join(self, sub: Subscriber, table_id: str) -> Dict[str, Any]:
+        try:
+            view = await self.work.run(self.sessions.get, table_id, full_view)
+        except SessionNotFound:
+            raise LiveError("Table not found or expired")
+        self._follow(sub, view)
+        return view
+
+    async def act(self, sub: Subscriber, table_id: str, action: Dict[str, Any], ref: Any = None):
+        """
+        Applies one action and pushes {"op": "diff"} to every subscriber of
+        the table; the sender's copy carries its ``ref``.
+        """
+        table = self._tables.get(table_id)
+        if table is None or sub not in table.subscribers:
+            raise LiveError("Not following this table (send open or join first)")
+        async with table.lock:
+            started = time.perf_counter()
+            try:
+                view = await self.work.run(self.sessions.act, table_id, action, table_view)
+            except SessionNotFound:
+                self._forget(table)
+                raise LiveError("Table not found or expired")
+            message = {"op": "diff", "table": table_id, "changes": diff_view(table.view, view)}
+            table.view = view
+            self.actions += 1
+            self._broadcast(table, message, skip=sub)
+            if ref is not None:
+                message["ref"] = ref
+            self.send(sub, message)
+            self.act_ms.add((time.perf_counter() - started) * 1000)
+
+    async def refresh(self, table_id: str):
+        """
+        Pushes what changed since the last diff, for tables that also take
+        actions over HTTP (POST /hand/sessions/{id}/actions).
+        """
+        table = self._tables.get(table_id)
+        if table is None:
+            return
+        async with table.lock:
+            try:
+                view = await self.work.run(self.sessions.get, table_id, table_view)
+            except SessionNotFound:
+                self._forget(table)
+                return
+            changes = diff_view(table.view, view)
+            if changes:
+                table.view = view
+                self._broadcast(table, {"op": "diff", "table": table_id, "changes": changes})
+
+    def following(self, table_id: str) -> bool:
+        return table_id in self._tables
+
+    def leave(self, sub: Subscriber, table_id: str):
+        sub.tables.discard(table_id)
+        table = self._tables.get(table_id)
+        if table is not None:
+            table.subscribers.discard(sub)
+            if not table.subscribers:
+                del self._tables[table_id]
+
+    async def close(self, sub: Subscriber, table_id: str):
+        """Ends the session; the other subscribers get {"op": "closed"}."""
+        try:
+            await self.work.run(self.sessions.close, table_id)
+        except SessionNotFound:
+            raise LiveError("Table not found or expired")
+        table = self._tables.get(table_id)
+        if table is not None:
+            self._broadcast(table, {"op": "closed", "table": table_id}, skip=sub)
+            self._forget(table)
+
+    # --- Fan-out ---
+
+    def send(self, sub: Subscriber, message: Dict[str, Any]):
+        text = orjson.dumps(message).decode()
+        if self._push(sub, text):
+            self.bytes_out += len(text)
+
+    def _broadcast(self, table: LiveTable, message: Dict[str, Any], skip: Optional[Subscriber] = None):
+        text = orjson.dumps(message).decode()  # once, whatever the number of subscribers
+        for sub in list(table.subscribers):
+            if sub is not skip and self._push(sub, text):
+                self.bytes_out += len(text)
+
+    def _push(self, sub: Subscriber, text: str) -> bool:
+        if sub.push(text):
+            self.messages_out += 1
+            return True
+        if sub in self._subscribers:
+            self.dropped += 1
+            logger.warning("Dropping a live table client %s messages behind", self.send_queue)
+            self.disconnect(sub)
+        return False
+
+    def _follow(self, sub: Subscriber, view: Dict[str, Any]):
+        table_id = view["table"]
+        table = self._tables.get(table_id)
+        if table is None:
+            table = self._tables[table_id] = LiveTable(table_id, table_view_of(view))
+        table.subscribers.add(sub)
+        sub.tables.add(table_id)
+
+    def _forget(self, table: LiveTable):
+        self._tables.pop(table.table_id, None)
+        for sub in table.subscribers:
+            sub.tables.discard(table.table_id)
+        table.subscribers.clear()
+
+    def _check_room(self, sub: Subscriber):
+        if len(sub.tables) >= self.max_tables_per_socket:
+            raise LiveError(f"At most {self.max_tables_per_socket} tables per connection")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._subscribers),
+            "tables": len(self._tables),
+            "opened": self.opened,
+            "actions": self.actions,
+            "messages_out": self.messages_out,
+            "bytes_out": self.bytes_out,
+            "dropped_clients": self.dropped,
+            "act_ms": self.act_ms.summary(),
+            "sessions": self.sessions.store.stats(),
+        }
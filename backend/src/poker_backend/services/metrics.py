@@ -0,0 +1,352 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Prometheus text exposition (format 0.0.4) without a client library. Hot
+# paths touch one pre-resolved child: a bisect and a short lock per observe.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 2, 4, 8, 12, 16, 24, 32, 48, 64, 128)
+
+
+def _format_value(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return repr(v)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: str):
+        """The child for one label combination; resolve once and keep it on hot paths."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}_total{_label_text(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}"
+            labels = _label_text(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric:
+    """
+    Values read at scrape time from ``fn() -> [(label values, value), ...]``,
+    for state that other components already track (pool sizes, queue depths),
+    so the hot path pays nothing for it.
+    """
+
+    def __init__(self, name: str, documentation: str, type: str, labelnames: Sequence[str],
+                 fn: Callable[[], Iterable[Tuple[Sequence[str], float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def samples(self) -> Iterable[str]:
+        suffix = "_total" if self.type == "counter" else ""
+        for values, value in self.fn():
+            yield f"{self.name}{suffix}{_label_text(self.labelnames, values)} {_format_value(float(value))}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Adds ``metric``; a metric registered again under the same name replaces the old one."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, type: str, labelnames: Sequence[str],
+                 fn: Callable[[], Iterable[Tuple[Sequence[str], float]]]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, type, labelnames, fn))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception:
+                # A broken callback must not take the whole scrape down
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- Metrics ---
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template (whole response, including streamed bodies).",
+    ("method", "route", "status"),
+)
+SIMULATION_SECONDS = registry.histogram(
+    "simulation_duration_seconds", "simulate_hand wall time in this process (process-pool batch workers are not included).",
+)
+SIMULATION_ACTIONS = registry.histogram(
+    "simulation_actions", "Actions per simulated hand.", buckets=COUNT_BUCKETS,
+)
+ENGINE_ERRORS = registry.counter(
+    "engine_errors", "Actions pokerkit rejected during simulations, by action type.", ("action",),
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "db_query_duration_seconds", "Repository method latency, including the wait for a pooled connection.",
+    ("repository", "method"),
+)
+
+ACTION_TYPES = frozenset(("fold", "check", "call", "bet", "raise", "allin", "show"))
+
+
+def action_label(action: Dict[str, Any]) -> str:
+    """Bounded label value for an action dict (unknown types collapse to "other")."""
+    if "deal_board" in action:
+        return "deal_board"
+    t = action.get("type")
+    return t if t in ACTION_TYPES else "other"
+
+
+def timed_query(fn: Callable) -> Callable:
+    """
+    Observes a repository method in ``DB_QUERY_SECONDS``, labelled from its
+    qualified name (``HandRepository.save_hand``). Works on plain and async
+    methods; generators are left alone since their duration is the consumer's.
+    """
+    repository, _, method = fn.__qualname__.rpartition(".")
+    child = DB_QUERY_SECONDS.labels(repository, method)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            child.observe(time.perf_counter() - started)
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request into ``HTTP_REQUEST_SECONDS``.
+    The route label is the matched path template (``/hand/sessions/{session_id}``),
+    so ids never become label values; unmatched paths share one series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], _HistogramChild] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            key = (scope["method"], path, status)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = HTTP_REQUEST_SECONDS.labels(*key)
+            child.observe(time.perf_counter() - started)
+
+
+def register_app_gauges(app):
+    """Scrape-time gauges for resources owned by the app's lifespan."""
+    state = app.state
+
+    def db_pools():
+        for label, attr in (("async", "db_async_pool"), ("sync", "db_pool")):
+            pool = getattr(state, attr, None)
+            if pool is None:
+                continue
+            stats = pool.get_stats()
+            yield (label, "size"), stats.get("pool_size", 0)
+            yield (label, "available"), stats.get("pool_available", 0)
+            yield (label, "waiting"), stats.get("requests_waiting", 0)
+
+    def work_classes():
+        for name, work in getattr(state, "work", {}).items():
+            yield (name, "running"), work.running
+            yield (name, "waiting"), work.waiting
+
+    def work_rejected():
+        for name, work in getattr(state, "work", {}).items():
+            yield (name,), work.rejected
+
+    def write_behind():
+        writer = getattr(state, "hand_writer", None)
+        if writer is not None:
+            yield (), writer.stats()["queue_depth"]
+
+    def sessions():
+        stats = state.table_sessions.store.stats()
+        yield ("sessions",), stats["sessions"]
+        yield ("live_states",), stats["live_states"]
+
+    def simulation_cache():
+        stats = state.simulation_cache.stats()
+        yield ("entries",), stats["entries"]
+        yield ("bytes",), stats["bytes"]
+
+    def simulation_cache_lookups():
+        stats = state.simulation_cache.stats()
+        yield ("memory_hit",), stats["memory_hits"]
+        yield ("shared_hit",), stats["shared_hits"]
+        yield ("miss",), stats["misses"]
+        yield ("bypass",), stats["bypassed"]
+
+    registry.callback("db_pool_connections", "Database pool connections by state.", "gauge",
+                      ("pool", "state"), db_pools)
+    registry.callback("work_class_requests", "Requests holding or waiting for a work class slot.", "gauge",
+                      ("work_class", "state"), work_classes)
+    registry.callback("work_class_rejected", "Requests rejected with 503 because a work class queue was full.",
+                      "counter", ("work_class",), work_rejected)
+    registry.callback("write_behind_queue_depth", "Hands queued for the write-behind flusher.", "gauge",
+                      (), write_behind)
+    registry.callback("table_sessions", "Open table sessions and the states held live for them.", "gauge",
+                      ("kind",), sessions)
+    registry.callback("simulation_cache_size", "Simulation result LRU size.", "gauge", ("unit",), simulation_cache)
+    registry.callback("simulation_cache_lookups", "Simulation cache lookups by outcome.", "counter",
+                      ("outcome",), simulation_cache_lookups)
@@ -1,5 +1,30 @@
+import logging
+import time
+import warnings
 from math import inf
+from typing import Optional
 from pokerkit import Automation, NoLimitTexasHoldem
+from poker_backend.evaluator.cards import decode_cards, encode_cards
+from poker_backend.services.dealer import Dealer, new_seed
+from poker_backend.services.metrics import ENGINE_ERRORS, SIMULATION_ACTIONS, SIMULATION_SECONDS, action_label
+from poker_backend.services.tracing import HandTrace, trace_buffer
+
+logger = logging.getLogger(__name__)
+
+# Hands routinely name their cards (hole cards, boards), which pokerkit
+# flags with a UserWarning per card; keep that off stderr on the hot path.
+warnings.filterwarnings("ignore", message="A card being dealt", category=UserWarning, module=r"pokerkit\.")
+
+
+def _explicit(player) -> bool:
+    """A seat whose two hole cards are given (["Ah", "Kh"]); every other seat is dealt."""
+    return isinstance(player, list) and len(player) == 2
+
+
+def _deals(data: dict) -> bool:
+    """True when ``create_state`` deals cards for at least one of the 6 seats."""
+    players = list(data.get("players", []))[:6]
+    return len(players) < 6 or not all(_explicit(p) for p in players)
 
 
 class PokerSimulationService:
@@ -7,15 +32,51 @@ class PokerSimulationService:
     def simulate_hand(data: dict):
         """
         Executes a full sequence of poker actions using PokerKit (6-player Texas Hold'em).
+
+        Nothing is printed or logged per action. With "trace": true in the
+        payload (or when sampled, see tracing.TraceBuffer) the response gets a
+        "trace" with per-action timings, street changes and engine errors.
+        """
+        started = time.perf_counter()
+        data = PokerSimulationService.with_seed(data)
+        requested = bool(data.get("trace"))
+        trace = HandTrace() if requested or trace_buffer.should_sample() else None
+        state, players, hole_cards = PokerSimulationService.create_state(data, trace=trace)
+        actions = data.get("actions", [])
+
+        # --- Play through all actions ---
+        for idx, a in enumerate(actions):
+            PokerSimulationService.apply_action(state, idx, a, trace)
+
+        PokerSimulationService.settle(state, players, trace)
+        result = PokerSimulationService.snapshot(state, hole_cards, actions)
+        if _deals(data):
+            result["seed"] = data["seed"]
+        if trace is not None:
+            traced = trace.to_dict()
+            trace_buffer.record(traced, len(actions))
+            if requested:
+                result["trace"] = traced
+        SIMULATION_SECONDS.observe(time.perf_counter() - started)
+        SIMULATION_ACTIONS.observe(len(actions))
+        return result
+
+    @staticmethod
+    def create_state(data: dict, hole_cards=None, trace: Optional[HandTrace] = None):
+        """
+        Builds the 6-player PokerKit state for a hand spec and deals hole cards.
+        Returns (state, players, hole_cards); ``players`` is padded to 6 seats.
+
+        Seats without two explicit hole cards are dealt by a ``Dealer`` seeded
+        with ``data["seed"]`` (see ``with_seed``). Pass the ``hole_cards``
+        returned by an earlier call to rebuild the same deal.
         """
         # --- Extract input data ---
         antes = data.get("antes", 0)
         blinds = tuple(data.get("blinds", (20, 40)))  # (SB, BB)
         min_bet = data.get("min_bet", 40)
-        stacks = data.get("stacks", [])
-        players = data.get("players", [])
-        actions = data.get("actions", [])
-        min_raise = None
+        stacks = list(data.get("stacks", []))
+        players = list(data.get("players", []))
 
         # --- Ensure exactly 6 players ---
         while len(players) < 6:
@@ -25,6 +86,8 @@ class PokerSimulationService:
 
         stacks_tuple = tuple(inf if s == "inf" else s for s in stacks)
 
+        started = time.perf_counter() if trace is not None else 0.0
+
         # --- Create a 6-player PokerKit state ---
         state = NoLimitTexasHoldem.create_state(
             (
@@ -46,118 +109,147 @@ class PokerSimulationService:
         )
 
         # --- Deal hole cards to all 6 players ---
-        hole_cards = []
-        for i in range(6):
-            if i < len(players) and isinstance(players[i], list) and len(players[i]) == 2:
-                # Player has specified hole cards
-                cards = players[i]
-            else:
-                # Auto-generate random cards from remaining deck
-                dealable = list(state.get_dealable_cards())
-                if len(dealable) >= 2:
-                    cards = [str(dealable[0]), str(dealable[1])]
-                else:
-                    cards = ["??", "??"]
-            hole_cards.append(cards)
+        if hole_cards is None:
+            hole_cards = PokerSimulationService._deal(data, players[:6])
+        for i, cards in enumerate(hole_cards):
             try:
                 state.deal_hole(cards)
             except Exception as e:
-                print(f"⚠️ Warning: could not deal {cards} to player {i}: {e}")
+                if trace is not None:
+                    trace.error("deal_hole", e, player=i, cards=cards)
 
+        if trace is not None:
+            trace.phase("deal", started)
+        return state, players, hole_cards
 
-        # --- Play through all actions ---
-        for idx, a in enumerate(actions):
-            print(f"\n🟩 ACTION {idx+1}: {a}")
+    @staticmethod
+    def with_seed(data: dict) -> dict:
+        """
+        ``data`` with a fresh "seed" when a seat will be dealt random cards and
+        none was given; responses report it, and sending it back reproduces the deal.
+        """
+        if data.get("seed") is not None or not _deals(data):
+            return data
+        return {**data, "seed": new_seed()}
+
+    @staticmethod
+    def _deal(data: dict, players) -> list:
+        """Explicit hole cards as given, the other seats dealt from what is left of the deck."""
+        missing = [i for i, p in enumerate(players) if not _explicit(p)]
+        if not missing:
+            return [list(p) for p in players]
+        # Cards named anywhere in the hand stay out of the deck
+        named = [c for p in players if _explicit(p) for c in p]
+        named += [a["deal_board"] for a in data.get("actions", []) if isinstance(a, dict) and "deal_board" in a]
+        exclude = set()
+        for cards in named:
             try:
-                # --- Board dealing (flop / turn / river) ---
-                if "deal_board" in a:
-                    # Skip if there's still an active player who needs to act
-                    if hasattr(state, 'actor_index') and state.actor_index is not None:
-                        print(f"⚠️ Cannot deal board - player {state.actor_index} still needs to act")
-                        continue
-                    
-                    # First, close the current betting round by collecting bets
-                    while state.can_collect_bets():
-                        state.collect_bets()
-                        print("✅ Collected bets before dealing board")
-
-                    # Burn and deal board
-                    if state.can_burn_card():
-                        state.burn_card()
-                        print("🔥 Burned a card")
-
-                    if state.can_deal_board():
-                        state.deal_board(a["deal_board"])
-                        print(f"✅ Dealt board: {a['deal_board']}")
-                    else:
-                        print("⚠️ Cannot deal board - not ready yet")
-                    continue
-
-                # --- Player actions ---
-                t = a.get("type")
-                
-                # Skip action if no player to act (betting round already closed)
-                if not hasattr(state, 'actor_index') or state.actor_index is None:
-                    print("⚠️ No active player - betting round closed, skipping action")
-                    continue
-
-                if t == "fold":
-                    state.fold()
-                    print("🧍 Player folded")
-
-                elif t in ("call", "check"):
-                    state.check_or_call()
-                    print("🧍 Player checked/called")
-                    
-                    # Auto-collect bets if betting round is complete
-                    if state.can_collect_bets():
-                        state.collect_bets()
-                        print("✅ Auto-collected bets (round complete)")
-
-                elif t in ("raise", "bet"):
-                    amt = a.get("amount")
-                    if amt is None:
-                        print("⚠️ No amount specified for bet/raise")
-                        continue
-                    
-                    state.complete_bet_or_raise_to(amt)
-                    print(f"🧍 Player bet/raised to {amt}")
-
-                elif t == "allin":
-                    # Get current player's remaining stack
-                    if hasattr(state, 'actor_index') and state.actor_index is not None:
-                        current_stack = state.stacks[state.actor_index]
-                        state.complete_bet_or_raise_to(current_stack)
-                        print(f"🧍 Player went all-in with {current_stack}")
-
-                elif t == "show":
-                    # Only try to show if we're in showdown phase
-                    if state.can_show_or_muck_hole_cards():
-                        state.show_or_muck_hole_cards(True)
-                        print("🧍 Player showed cards")
-                    else:
-                        print("⚠️ Not in showdown phase yet")
+                exclude.update(encode_cards(cards))
+            except (ValueError, TypeError):
+                pass  # the engine reports unparseable cards when they are dealt
+        cards = Dealer(data.get("seed")).deal(2 * len(missing), exclude)
+        dealt = [list(p) if _explicit(p) else None for p in players]
+        for k, i in enumerate(missing):
+            dealt[i] = decode_cards(cards[2 * k:2 * k + 2])
+        return dealt
 
-                else:
-                    print(f"⚠️ Unknown action type: {t}")
+    @staticmethod
+    def apply_action(state, idx: int, a: dict, trace: Optional[HandTrace] = None):
+        """Applies one action (player action or ``deal_board``); engine errors are traced, not raised."""
+        if trace is None:
+            try:
+                PokerSimulationService._apply(state, a)
+            except Exception:
+                ENGINE_ERRORS.labels(action_label(a)).inc()
+                # Off unless DEBUG logging is enabled for this module
+                logger.debug("Action %d %r failed", idx + 1, a, exc_info=True)
+            return
 
-                # --- Debug info ---
-                print(f"🏆 Stacks: {state.stacks}")
-                print(f"📍 Street: {state.street_index}")
-                if hasattr(state, 'actor_index') and state.actor_index is not None:
-                    print(f"👤 Current actor: {state.actor_index}")
+        started = time.perf_counter()
+        street = state.street_index
+        outcome, error = None, None
+        try:
+            outcome = PokerSimulationService._apply(state, a)
+        except Exception as e:
+            error = e
+            ENGINE_ERRORS.labels(action_label(a)).inc()
+        trace.action(idx, a, started, outcome, error, street, state.street_index)
 
-            except Exception as e:
-                print(f"❌ ERROR during action {idx+1} {a}: {e}")
-                import traceback
-                traceback.print_exc()
+    @staticmethod
+    def _apply(state, a: dict) -> str:
+        """Applies one action and returns what happened (for traces)."""
+        # --- Board dealing (flop / turn / river) ---
+        if "deal_board" in a:
+            # Skip if there's still an active player who needs to act
+            if hasattr(state, 'actor_index') and state.actor_index is not None:
+                return "skipped: a player still needs to act"
+
+            # First, close the current betting round by collecting bets
+            while state.can_collect_bets():
+                state.collect_bets()
+
+            # Burn and deal board
+            if state.can_burn_card():
+                state.burn_card()
+
+            if state.can_deal_board():
+                state.deal_board(a["deal_board"])
+                return "dealt board"
+            return "skipped: cannot deal board yet"
+
+        # --- Player actions ---
+        t = a.get("type")
+
+        # Skip action if no player to act (betting round already closed)
+        if not hasattr(state, 'actor_index') or state.actor_index is None:
+            return "skipped: no active player"
+
+        if t == "fold":
+            state.fold()
+            return "folded"
+
+        elif t in ("call", "check"):
+            state.check_or_call()
+
+            # Auto-collect bets if betting round is complete
+            if state.can_collect_bets():
+                state.collect_bets()
+            return "checked/called"
+
+        elif t in ("raise", "bet"):
+            amt = a.get("amount")
+            if amt is None:
+                return "skipped: no amount for bet/raise"
+
+            state.complete_bet_or_raise_to(amt)
+            return "bet/raised"
+
+        elif t == "allin":
+            # Get current player's remaining stack
+            current_stack = state.stacks[state.actor_index]
+            state.complete_bet_or_raise_to(current_stack)
+            return "all-in"
+
+        elif t == "show":
+            # Only try to show if we're in showdown phase
+            if state.can_show_or_muck_hole_cards():
+                state.show_or_muck_hole_cards(True)
+                return "showed"
+            return "skipped: not in showdown"
+
+        return f"skipped: unknown action type {t!r}"
+
+    @staticmethod
+    def settle(state, players, trace: Optional[HandTrace] = None):
+        """Collects outstanding bets and runs the showdown if the hand has reached it."""
+        started = time.perf_counter() if trace is not None else 0.0
+        shown = mucked = 0
 
         # --- Final settlement ---
         try:
             # Collect any remaining bets
             while state.can_collect_bets():
                 state.collect_bets()
-                print("✅ Final bet collection")
 
             # Manual showdown for remaining players with known cards
             max_attempts = 10
@@ -169,34 +261,37 @@ class PokerSimulationService:
                         player_cards = players[state.actor_index]
                         if player_cards != "????":
                             state.show_or_muck_hole_cards(True)
-                            print(f"🃏 Player {state.actor_index} showed cards at showdown")
+                            shown += 1
                         else:
                             # Muck unknown cards
                             state.show_or_muck_hole_cards(False)
-                            print(f"🃏 Player {state.actor_index} mucked cards")
+                            mucked += 1
                     else:
                         break
                     attempts += 1
                 except Exception as e:
-                    print(f"⚠️ Showdown error: {e}")
+                    if trace is not None:
+                        trace.error("showdown", e)
                     break
-            
-            print(f"✅ Hand complete! Final stacks: {state.stacks}")
-            print(f"✅ Payoffs: {state.payoffs if hasattr(state, 'payoffs') else 'N/A'}")
-            
+
         except Exception as e:
-            print(f"⚠️ Final settlement error: {e}")
-            import traceback
-            traceback.print_exc()
+            if trace is not None:
+                trace.error("settle", e)
+
+        if trace is not None:
+            trace.phase("settle", started, shown=shown, mucked=mucked)
+
+    @staticmethod
+    def snapshot(state, hole_cards, actions):
+        """Response payload describing the current state of the hand."""
+        min_raise = None
         try:
             if hasattr(state, "minimum_completion_bet_or_raise_to"):
                     min_raise = state.minimum_completion_bet_or_raise_to
-                    print(f"💰 Minimum next raise: {min_raise}")
-        except Exception as e:
-                print(f"⚠️ Could not determine min_raise: {e}")  
+        except Exception:
+                pass
 
-                # --- Determine current actor and winner (if hand is complete) ---
-        actor_index = getattr(state, "actor_index", None)
+        # --- Determine winner (if hand is complete) ---
         winner_index = None
         try:
             if hasattr(state, "payoffs") and state.payoffs:
@@ -206,8 +301,6 @@ class PokerSimulationService:
         except Exception:
             pass
 
-   
-
         # --- Return final state snapshot ---
         return {
             "status":"complete",
@@ -215,9 +308,10 @@ class PokerSimulationService:
             "winner_index": winner_index,
             "actions": actions,
             "min_raise": min_raise,
-            "board": list(state.board_cards) if hasattr(state, 'board_cards') else [],
+            # Card strings ("Jh"), so cached, stored and returned results have one JSON shape
+            "board": [f"{c.rank}{c.suit}" for cards in getattr(state, "board_cards", ()) for c in cards],
             "stacks": [float(s) if s != inf else "inf" for s in state.stacks],
             "engine_status": str(state.status) if hasattr(state, 'status') else "unknown",
             "payoffs": list(state.payoffs) if hasattr(state, 'payoffs') else [0] * 6,
             "final_pots": state.total_pot_amount if hasattr(state, 'total_pot_amount') else 0
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,278 @@
+"""
+Precomputed preflop equities for the 169 starting-hand classes.
+
+    python -m poker_backend.services.preflop_table [--samples 20000] [--multiway-samples 200000] [--seed 1]
+
+Two tables are built with the lookup-table evaluator and stored as .npy
+files next to the evaluator tables (PREFLOP_TABLE_DIR, default
+EVALUATOR_CACHE_DIR):
+
+* headsup  float32[169, 169]  equity of class a against class b
+* multiway float32[169, 5]    equity of a class against 1..5 random hands
+                              (2..6 seats, the size of a simulate_hand table)
+
+Every cell is a Monte Carlo estimate over random non-conflicting combos of
+the classes and random boards, so a concrete holding is looked up as its
+suit-isomorphic class (AhKh -> AKs) and gets the class average.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT, RANKS, encode_cards, is_unknown
+from poker_backend.evaluator.hand_evaluator import evaluate_batch
+from poker_backend.evaluator.tables import cache_dir
+from poker_backend.services.worker_pool import iter_tasks
+
+TABLE_VERSION = 1
+CLASS_COUNT = 169
+MIN_SEATS, MAX_SEATS = 2, 6
+CHUNK = 20000
+
+# --- Starting-hand classes ---
+# Class index on a 13x13 grid: pairs on the diagonal (r, r), suited hands
+# at (high, low) and offsuit hands at (low, high).
+
+
+def class_index(high: int, low: int, suited: bool) -> int:
+    if high < low:
+        high, low = low, high
+    if high == low:
+        return high * 13 + high
+    return high * 13 + low if suited else low * 13 + high
+
+
+def class_label(index: int) -> str:
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return f"{RANKS[row]}{RANKS[col]}s"
+    return f"{RANKS[col]}{RANKS[row]}o"
+
+
+def class_combos(index: int) -> np.ndarray:
+    """All concrete (card, card) holdings of a class: 6 pairs, 4 suited or 12 offsuit."""
+    row, col = divmod(index, 13)
+    high, low = max(row, col), min(row, col)
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if row == col and s2 <= s1:
+                continue
+            if row != col and (s1 == s2) != (row > col):
+                continue
+            combos.append((high * 4 + s1, low * 4 + s2))
+    return np.array(combos, dtype=np.int64)
+
+
+def canonical_class(value) -> int:
+    """
+    Class index for a class label ("AKs", "AKo", "TT") or any concrete
+    holding accepted by ``parse_cards`` ("AhKh", ["Ah", "Kh"]).
+    """
+    if isinstance(value, str):
+        label = "".join(value.split())
+        if len(label) in (2, 3) and label[0].upper() in RANKS and label[1].upper() in RANKS:
+            high, low = RANKS.index(label[0].upper()), RANKS.index(label[1].upper())
+            suffix = label[2:].lower()
+            if high == low and suffix == "":
+                return class_index(high, low, False)
+            if high != low and suffix in ("s", "o"):
+                return class_index(high, low, suffix == "s")
+            if len(label) == 2 or suffix not in ("s", "o"):
+                raise ValueError(f"Ambiguous or invalid hand class {value!r} (use e.g. 'AKs', 'AKo', 'TT')")
+    cards = encode_cards(value)
+    if len(cards) != 2 or cards[0] == cards[1]:
+        raise ValueError(f"A starting hand needs exactly 2 distinct cards, got {value!r}")
+    return class_index(cards[0] >> 2, cards[1] >> 2, (cards[0] & 3) == (cards[1] & 3))
+
+
+# --- Build ---
+
+
+def _draw(rng: np.random.Generator, used: np.ndarray, count: int) -> np.ndarray:
+    """``count`` random cards per row, avoiding the cards in each row of ``used``."""
+    keys = rng.random((used.shape[0], CARD_COUNT))
+    np.put_along_axis(keys, used, 2.0, axis=1)
+    return np.argpartition(keys, count - 1, axis=1)[:, :count]
+
+
+def _headsup_task(pairs: List[Tuple[int, int]], samples: int, seed) -> List[float]:
+    """Worker task: equity of a vs b for each (a, b) pair."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for a, b in pairs:
+        ca, cb = class_combos(a), class_combos(b)
+        matchups = np.array([
+            (*x, *y) for x in ca for y in cb if not set(x) & set(y)
+        ], dtype=np.int64)
+        share = 0.0
+        for start in range(0, samples, CHUNK):
+            n = min(CHUNK, samples - start)
+            holes = matchups[rng.integers(len(matchups), size=n)]
+            board = _draw(rng, holes, 5)
+            sa = evaluate_batch(np.concatenate([holes[:, :2], board], axis=1))
+            sb = evaluate_batch(np.concatenate([holes[:, 2:], board], axis=1))
+            share += float((sa > sb).sum() + 0.5 * (sa == sb).sum())
+        results.append(share / samples)
+    return results
+
+
+def _multiway_task(classes: List[int], samples: int, seed) -> List[List[float]]:
+    """Worker task: equity of each class against 1..5 random hands."""
+    rng = np.random.default_rng(seed)
+    results = []
+    for c in classes:
+        combos = class_combos(c)
+        row = []
+        for seats in range(MIN_SEATS, MAX_SEATS + 1):
+            share = 0.0
+            for start in range(0, samples, CHUNK):
+                n = min(CHUNK, samples - start)
+                hero = combos[rng.integers(len(combos), size=n)]
+                drawn = _draw(rng, hero, 5 + 2 * (seats - 1))
+                board = drawn[:, :5]
+                strengths = np.stack([evaluate_batch(np.concatenate([hero, board], axis=1))] + [
+                    evaluate_batch(np.concatenate([drawn[:, 5 + 2 * k:7 + 2 * k], board], axis=1))
+                    for k in range(seats - 1)
+                ])
+                best = strengths.max(axis=0)
+                winners = strengths == best
+                share += float((winners[0] / winners.sum(axis=0)).sum())
+            row.append(share / samples)
+        results.append(row)
+    return results
+
+
+def build_tables(samples: int, multiway_samples: int, seed: int, progress=None) -> Tuple[np.ndarray, np.ndarray]:
+    pairs = [(a, b) for a in range(CLASS_COUNT) for b in range(a + 1, CLASS_COUNT)]
+    pair_chunks = [pairs[i:i + 150] for i in range(0, len(pairs), 150)]
+    class_chunks = [list(range(i, min(i + 4, CLASS_COUNT))) for i in range(0, CLASS_COUNT, 4)]
+    seeds = np.random.SeedSequence(seed).spawn(len(pair_chunks) + len(class_chunks))
+
+    # Both kinds of task are queued up front; results come back in this order
+    results = iter_tasks(
+        [(_headsup_task, chunk, samples, seeds[i]) for i, chunk in enumerate(pair_chunks)]
+        + [(_multiway_task, chunk, multiway_samples, seeds[len(pair_chunks) + i])
+           for i, chunk in enumerate(class_chunks)]
+    )
+
+    headsup = np.full((CLASS_COUNT, CLASS_COUNT), 0.5, dtype=np.float32)
+    for done, (chunk, equities) in enumerate(zip(pair_chunks, results), 1):
+        for (a, b), equity in zip(chunk, equities):
+            headsup[a, b] = equity
+            headsup[b, a] = 1.0 - equity
+        if progress:
+            progress("headsup", done, len(pair_chunks))
+
+    multiway = np.zeros((CLASS_COUNT, MAX_SEATS - MIN_SEATS + 1), dtype=np.float32)
+    for done, (chunk, shares) in enumerate(zip(class_chunks, results), 1):
+        multiway[chunk] = shares
+        if progress:
+            progress("multiway", done, len(class_chunks))
+    return headsup, multiway
+
+
+# --- Storage ---
+
+
+def table_dir() -> str:
+    return os.getenv("PREFLOP_TABLE_DIR", cache_dir())
+
+
+def _path(name: str, ext: str = "npy") -> str:
+    return os.path.join(table_dir(), f"preflop_v{TABLE_VERSION}_{name}.{ext}")
+
+
+def save_tables(headsup: np.ndarray, multiway: np.ndarray, meta: Dict[str, Any]):
+    os.makedirs(table_dir(), exist_ok=True)
+    for name, array in (("headsup", headsup), ("multiway", multiway)):
+        # Write then rename so a loading server never sees a partial file
+        tmp = f"{_path(name)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, _path(name))
+    with open(_path("meta", "json"), "w") as f:
+        json.dump(meta, f)
+
+
+class PreflopTable:
+    """Memory-mapped preflop tables; every lookup is two array indexes."""
+
+    def __init__(self, headsup: np.ndarray, multiway: np.ndarray, meta: Dict[str, Any]):
+        self.headsup = headsup
+        self.multiway = multiway
+        self.meta = meta
+
+    @classmethod
+    def load(cls) -> Optional["PreflopTable"]:
+        """The tables from disk, or ``None`` if they have not been built."""
+        try:
+            headsup = np.load(_path("headsup"), mmap_mode="r")
+            multiway = np.load(_path("multiway"), mmap_mode="r")
+            with open(_path("meta", "json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if headsup.shape != (CLASS_COUNT, CLASS_COUNT) or multiway.shape != (CLASS_COUNT, MAX_SEATS - MIN_SEATS + 1):
+            return None
+        return cls(headsup, multiway, meta)
+
+    def ranking(self) -> List[int]:
+        """Classes from strongest to weakest by equity against one random hand (for "15%" ranges)."""
+        return [int(i) for i in np.argsort(-self.multiway[:, 0], kind="stable")]
+
+    def lookup(self, hand, vs=None, seats: int = MIN_SEATS) -> Dict[str, Any]:
+        """Equity of ``hand`` against one hand/class ``vs``, or against ``seats - 1`` random hands."""
+        a = canonical_class(hand)
+        if vs is not None and not is_unknown(vs):
+            b = canonical_class(vs)
+            equity, samples = float(self.headsup[a, b]), self.meta["samples"]
+            result = {"hand": class_label(a), "vs": class_label(b), "seats": 2}
+        else:
+            if not MIN_SEATS <= seats <= MAX_SEATS:
+                raise ValueError(f"seats must be between {MIN_SEATS} and {MAX_SEATS}")
+            equity, samples = float(self.multiway[a, seats - MIN_SEATS]), self.meta["multiway_samples"]
+            result = {"hand": class_label(a), "vs": "random", "seats": seats}
+        result.update(
+            equity=round(equity, 5),
+            # Binomial bound; ties make the real error a little smaller
+            stderr=round(math.sqrt(max(equity * (1 - equity), 0.0) / samples), 5),
+            method="preflop_table",
+        )
+        return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=20000, help="runouts per heads-up class pair")
+    parser.add_argument("--multiway-samples", type=int, default=200000, help="runouts per class and seat count")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    def progress(stage, done, total):
+        print(f"⏳ {stage}: {done}/{total} chunks ({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+
+    started = time.perf_counter()
+    headsup, multiway = build_tables(args.samples, args.multiway_samples, args.seed, progress)
+    save_tables(headsup, multiway, {
+        "version": TABLE_VERSION,
+        "samples": args.samples,
+        "multiway_samples": args.multiway_samples,
+        "seed": args.seed,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    })
+    print(f"✅ Preflop tables written to {table_dir()} in {time.perf_counter() - started:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations, permutations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT, encode_cards, parse_cards
+from poker_backend.evaluator.hand_evaluator import evaluate_batch
+from poker_backend.services.dealer import Dealer
+from poker_backend.services.preflop_table import CLASS_COUNT, class_label
+from poker_backend.services.ranges import combo_class, combo_label, parse_range, remove_cards, to_arrays
+from poker_backend.services.worker_pool import pool_size, run_tasks
+
+# Bump when the matrices computed for the same canonical spot change, so
+# stale cache entries are never served.
+CACHE_VERSION = 1
+# Runout x hero combo x villain combo comparisons per vectorized step
+CELLS = 4_000_000
+# Comparisons worth shipping to another process
+MIN_TASK_CELLS = 50_000_000
+# Stands in for combos that hold a runout card; their strengths are masked out
+_FILLER = np.arange(7, dtype=np.int64)
+
+_SUIT_PERMS = np.array(list(permutations(range(4))), dtype=np.int64)
+
+
+# --- Matrix task ---
+
+def _bits(cards: np.ndarray) -> np.ndarray:
+    """52-bit card mask of each row of ``cards``."""
+    return np.bitwise_or.reduce(np.left_shift(np.int64(1), cards), axis=-1)
+
+
+def _strengths(combos: np.ndarray, boards: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """(runouts, combos) strengths of every combo on every board; invalid cells are meaningless."""
+    r, n = len(boards), len(combos)
+    hands = np.concatenate([
+        np.broadcast_to(combos[None, :, :], (r, n, 2)),
+        np.broadcast_to(boards[:, None, :], (r, n, 5)),
+    ], axis=2).reshape(r * n, 7)
+    # The evaluator assumes distinct cards; blocked combos get a harmless hand
+    hands = np.where(valid.reshape(-1, 1), hands, _FILLER)
+    return evaluate_batch(hands).reshape(r, n).astype(np.int32)
+
+
+def _matrix_task(hero, villain, board, runouts, deadline):
+    """
+    Worker task: every hero combo against every villain combo on each
+    runout completing ``board``. Returns (twice the hero wins, counted
+    runouts, runouts scored), the matrices (hero, villain); a tie counts 1
+    and a pair of combos sharing a card never counts.
+    """
+    hero, villain = np.asarray(hero), np.asarray(villain)
+    board, runouts = np.asarray(board, dtype=np.int64), np.asarray(runouts, dtype=np.int64)
+    nh, nv = len(hero), len(villain)
+    w2 = np.zeros((nh, nv), dtype=np.int32)
+    count = np.zeros((nh, nv), dtype=np.int32)
+    hero_bits, villain_bits = _bits(hero), _bits(villain)
+    apart = (hero_bits[:, None] & villain_bits[None, :]) == 0
+
+    step = max(1, CELLS // (nh * nv))
+    scored = 0
+    for start in range(0, len(runouts), step):
+        if deadline is not None and time.time() >= deadline:
+            break
+        chunk = runouts[start:start + step]
+        r = len(chunk)
+        boards = np.concatenate([np.broadcast_to(board, (r, len(board))), chunk], axis=1)
+        board_bits = _bits(boards)
+        hero_ok = (board_bits[:, None] & hero_bits[None, :]) == 0
+        villain_ok = (board_bits[:, None] & villain_bits[None, :]) == 0
+        sh = _strengths(hero, boards, hero_ok)
+        sv = _strengths(villain, boards, villain_ok)
+        valid = hero_ok[:, :, None] & villain_ok[:, None, :] & apart
+        # 2 win, 1 tie, 0 loss
+        score = (np.sign(sh[:, :, None] - sv[:, None, :]) + 1).astype(np.int8)
+        w2 += np.where(valid, score, 0).sum(axis=0, dtype=np.int32)
+        count += valid.sum(axis=0, dtype=np.int32)
+        scored += r
+    return w2, count, scored
+
+
+# --- Canonical spots ---
+
+def _relabel(cards: np.ndarray, perm: np.ndarray) -> np.ndarray:
+    return (cards & ~3) | perm[cards & 3]
+
+
+def _canonical_combos(combos: np.ndarray, perm: np.ndarray) -> np.ndarray:
+    c = np.sort(_relabel(combos, perm), axis=1)[:, ::-1]
+    return np.ascontiguousarray(c[np.lexsort((c[:, 1], c[:, 0]))])
+
+
+def canonicalize(board: Sequence[int], dead: Sequence[int], hero: np.ndarray, villain: np.ndarray):
+    """
+    The representative of a spot under suit relabeling and seat swap.
+
+    Of the 24 suit permutations, those giving the smallest (sorted board,
+    sorted dead cards) are tried on both ranges; the smallest pair of
+    sorted combo lists wins, with the smaller range first. Returns
+    (perm, swapped, board, dead, first range, second range), all relabeled.
+    """
+    spots = []
+    for perm in _SUIT_PERMS:
+        b = tuple(sorted(int(c) for c in _relabel(np.asarray(board, dtype=np.int64), perm)))
+        d = tuple(sorted(int(c) for c in _relabel(np.asarray(dead, dtype=np.int64), perm)))
+        spots.append(((b, d), perm))
+    smallest = min(s for s, _ in spots)
+
+    best = None
+    for spot, perm in spots:
+        if spot != smallest:
+            continue
+        h, v = _canonical_combos(hero, perm), _canonical_combos(villain, perm)
+        hk, vk = (len(h), h.tobytes()), (len(v), v.tobytes())
+        swapped = vk < hk
+        rank = (vk, hk) if swapped else (hk, vk)
+        if best is None or rank < best[0]:
+            best = (rank, perm, swapped, (v, h) if swapped else (h, v))
+    _, perm, swapped, (first, second) = best
+    return perm, swapped, list(smallest[0]), list(smallest[1]), first, second
+
+
+def spot_key(board: Sequence[int], dead: Sequence[int], first: np.ndarray, second: np.ndarray,
+             method: str) -> str:
+    h = hashlib.sha256(f"v{CACHE_VERSION}|{method}|{list(board)}|{list(dead)}|{len(first)}|{len(second)}|".encode())
+    h.update(first.tobytes())
+    h.update(second.tobytes())
+    return h.hexdigest()
+
+
+# --- Cache ---
+
+class RangeEquityCache:
+    """
+    Combo-vs-combo matrices of canonical spots, in an LRU bounded by entry
+    count and by matrix bytes. Weights are not part of the key: they are
+    applied when a matrix is read, so re-weighting a range is a hit too.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, np.ndarray, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "RangeEquityCache":
+        return cls(
+            max_entries=int(os.getenv("RANGE_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(os.getenv("RANGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        )
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, w2: np.ndarray, count: np.ndarray, meta: Dict[str, Any]):
+        size = w2.nbytes + count.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[0].nbytes + old[1].nbytes
+            self._entries[key] = (w2, count, meta)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (ow, oc, _) = self._entries.popitem(last=False)
+                self._bytes -= ow.nbytes + oc.nbytes
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# --- Service ---
+
+class RangeEquityService:
+    """
+    Range-versus-range all-in equity, e.g. the top 15% against a 3-bet
+    range on K72 rainbow.
+
+    Both ranges are expanded to combos, those holding a board or dead card
+    are removed, and every hero combo is scored against every villain combo
+    on each runout: one evaluator call per range and runout chunk, the
+    comparisons broadcast over the whole matrix, runouts split over the
+    shared process pool. Flops, turns and rivers are enumerated exactly
+    (in a shuffled order, so a run cut short by the time budget is still an
+    unbiased sample); preflop boards are sampled.
+
+    Matrices are cached per canonical spot, so the same question asked with
+    other suits, with the ranges swapped or with other weights is answered
+    without scoring a runout.
+    """
+
+    DEFAULT_ITERATIONS = 2000  # sampled boards when there are too many runouts to enumerate
+    MAX_ITERATIONS = 1_000_000
+    EXACT_RUNOUTS = 5000  # enumerate when there are at most this many runouts
+    DEFAULT_BUDGET_MS = 10000
+    MAX_BUDGET_MS = 120000
+    MATRIX_MAX_CELLS = 250000  # combo pairs returned with "matrix": true
+
+    def __init__(self, cache: RangeEquityCache, ranking: Optional[List[int]] = None):
+        self.cache = cache
+        self.ranking = ranking  # preflop class order, for percent ranges
+
+    def calculate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+        """Returns (result, "hit" | "miss")."""
+        board = parse_cards(data.get("board", []))
+        dead = parse_cards(data.get("dead", []))
+        iterations = min(int(data.get("iterations", self.DEFAULT_ITERATIONS)), self.MAX_ITERATIONS)
+        budget_ms = min(float(data.get("time_budget_ms") or self.DEFAULT_BUDGET_MS), self.MAX_BUDGET_MS)
+        if len(board) not in (0, 3, 4, 5):
+            raise ValueError("The board has 0, 3, 4 or 5 cards")
+        if len(set(board + dead)) != len(board + dead):
+            raise ValueError("Duplicate cards in board or dead cards")
+        if iterations < 1:
+            raise ValueError("iterations must be positive")
+        if "hero" not in data or "villain" not in data:
+            raise ValueError('"hero" and "villain" ranges are required')
+
+        board_cards, dead_cards = encode_cards(board), encode_cards(dead)
+        sides = []
+        for name in ("hero", "villain"):
+            combos, removed = remove_cards(parse_range(data[name], self.ranking), board_cards + dead_cards)
+            if not combos:
+                raise ValueError(f"No {name} combo is left after removing the board and dead cards")
+            sides.append((data[name], removed, *to_arrays(combos)))
+        (_, _, hero, hero_w), (_, _, villain, villain_w) = sides
+
+        perm, swapped, c_board, c_dead, first, second = canonicalize(board_cards, dead_cards, hero, villain)
+        missing = 5 - len(board)
+        deck = np.array([c for c in range(CARD_COUNT) if c not in set(c_board + c_dead)], dtype=np.int64)
+        exact = math.comb(len(deck), missing) <= self.EXACT_RUNOUTS
+        key = spot_key(c_board, c_dead, first, second, "exact" if exact else f"sampled:{iterations}")
+
+        started = time.perf_counter()
+        entry = self.cache.get(key)
+        status = "hit"
+        if entry is None:
+            status = "miss"
+            dealer = Dealer(data.get("seed"))
+            entry = self._compute(first, second, c_board, deck, missing, exact, iterations, dealer,
+                                  time.time() + budget_ms / 1000)
+            if entry[2]["complete"]:
+                self.cache.put(key, *entry)
+        w2, count, meta = entry
+
+        # Back from the canonical spot to the request's combo order
+        if swapped:
+            w2, count = (2 * count - w2).T, count.T
+        rows = _positions(hero, perm, second if swapped else first)
+        cols = _positions(villain, perm, first if swapped else second)
+        w2, count = w2[np.ix_(rows, cols)], count[np.ix_(rows, cols)]
+
+        result = self._summarize(sides, w2, count, data.get("matrix", False))
+        result.update({
+            "method": meta["method"],
+            "runouts": meta["runouts"],
+            "complete": meta["complete"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "compute_ms": meta["compute_ms"],
+            "seed": meta["seed"],
+            "board": board,
+            "dead": dead,
+        })
+        return result, status
+
+    # --- Scoring ---
+
+    def _compute(self, first, second, board, deck, missing, exact, iterations, dealer, deadline):
+        started = time.perf_counter()
+        if exact:
+            idx = np.array(list(combinations(range(len(deck)), missing)), dtype=np.int64)
+            runouts = deck[idx.reshape(-1, missing)]
+            # Shuffled, so a time-limited enumeration is still a uniform sample
+            runouts = runouts[dealer.rng.permutation(len(runouts))]
+        else:
+            runouts = dealer.deal_batch(iterations, missing, deck)
+
+        cells = len(first) * len(second) * len(runouts)
+        tasks = max(1, min(pool_size(), math.ceil(cells / MIN_TASK_CELLS), len(runouts)))
+        jobs = [(first, second, board, part, deadline) for part in np.array_split(runouts, tasks)]
+        if len(jobs) == 1:
+            # Not worth the round trip to a worker process
+            parts = [_matrix_task(*jobs[0])]
+        else:
+            parts = run_tasks((_matrix_task, *job) for job in jobs)
+
+        w2 = sum(p[0] for p in parts)
+        count = sum(p[1] for p in parts)
+        scored = sum(p[2] for p in parts)
+        complete = scored == len(runouts)
+        return w2, count, {
+            "method": "exact" if exact and complete else "monte_carlo",
+            "runouts": scored,
+            "complete": complete,
+            "compute_ms": round((time.perf_counter() - started) * 1000, 3),
+            # A complete enumeration does not depend on the seed
+            "seed": None if exact and complete else dealer.seed,
+        }
+
+    def _summarize(self, sides, w2: np.ndarray, count: np.ndarray, matrix: bool) -> Dict[str, Any]:
+        (hero_text, hero_removed, hero, hero_w), (villain_text, villain_removed, villain, villain_w) = sides
+        with np.errstate(invalid="ignore", divide="ignore"):
+            equity = w2 / (2 * count)
+        # Each pair of combos that can meet weighs the product of their weights
+        weight = np.where(count > 0, hero_w[:, None] * villain_w[None, :], 0.0)
+        won = np.where(count > 0, equity, 0.0) * weight
+        total = float(weight.sum())
+        if total == 0:
+            raise ValueError("The ranges have no combos that can meet")
+        hero_equity = float(won.sum() / total)
+
+        result = {
+            "hero": _side(hero_text, hero, hero_w, hero_removed, hero_equity,
+                          won.sum(axis=1), weight.sum(axis=1)),
+            "villain": _side(villain_text, villain, villain_w, villain_removed, 1.0 - hero_equity,
+                             (weight - won).sum(axis=0), weight.sum(axis=0)),
+            "matchups": int((count > 0).sum()),
+        }
+        if matrix:
+            if equity.size > self.MATRIX_MAX_CELLS:
+                raise ValueError(f"The matrix has {equity.size} cells, at most {self.MATRIX_MAX_CELLS} are returned")
+            result["matrix"] = {
+                "hero": [combo_label(tuple(c)) for c in hero.tolist()],
+                "villain": [combo_label(tuple(c)) for c in villain.tolist()],
+                # Hero's equity per combo pair; null where the combos share a card
+                "equity": [[None if math.isnan(x) else round(x, 5) for x in row] for row in equity.tolist()],
+            }
+        return result
+
+
+def _positions(combos: np.ndarray, perm: np.ndarray, canonical: np.ndarray) -> List[int]:
+    """Row of each of ``combos`` (in request order) in its canonical combo list."""
+    index = {(a, b): i for i, (a, b) in enumerate(canonical.tolist())}
+    relabeled = np.sort(_relabel(combos, perm), axis=1)[:, ::-1]
+    return [index[(a, b)] for a, b in relabeled.tolist()]
+
+
+def _side(text, combos: np.ndarray, weights: np.ndarray, removed: int, equity: float,
+          won: np.ndarray, weight: np.ndarray) -> Dict[str, Any]:
+    """One range's summary, with the equity of each starting-hand class in it."""
+    classes = np.array([combo_class(tuple(c)) for c in combos.tolist()])
+    class_won = np.bincount(classes, won, minlength=CLASS_COUNT)
+    class_weight = np.bincount(classes, weight, minlength=CLASS_COUNT)
+    class_combos = np.bincount(classes, minlength=CLASS_COUNT)
+    hands = [
+        {"hand": class_label(int(c)), "combos": int(class_combos[c]),
+         "equity": round(float(class_won[c] / class_weight[c]), 5) if class_weight[c] > 0 else None}
+        for c in np.nonzero(class_combos)[0]
+    ]
+    hands.sort(key=lambda h: -1.0 if h["equity"] is None else h["equity"], reverse=True)
+    return {
+        "range": text,
+        "combos": len(combos),
+        "weighted_combos": round(float(weights.sum()), 3),
+        "removed": removed,
+        "equity": round(equity, 5),
+        "hands": hands,
+    }
@@ -0,0 +1,160 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from poker_backend.evaluator.cards import CARD_COUNT, RANKS, encode_cards, int_to_card
+from poker_backend.services.preflop_table import class_combos, class_index
+
+# Hand ranges in the usual notation, e.g. "AKs, TT+, A2s+, 98s-65s, KQo:0.5":
+#
+#   TT, AKs, AKo, AK     one class (AK = suited and offsuit)
+#   TT+, A2s+            a pair and every higher pair; a kicker up to one below the high card
+#   TT-77, 98s-65s       pairs between two ranks; classes sliding at the same gap
+#   A5s-A2s              kickers between two ranks under the same high card
+#   AhKh                 one concrete combo
+#   15%                  the strongest 15% of combos (needs the preflop table's ranking)
+#   random / any         all 1326 combos
+#   <token>:0.5          weight of the token's combos (0 < weight <= 1, default 1)
+#
+# A combo is a (high card, low card) tuple of card ints; later tokens
+# override the weight of combos listed earlier.
+
+Combo = Tuple[int, int]
+TOTAL_COMBOS = CARD_COUNT * (CARD_COUNT - 1) // 2
+
+_CLASS_RE = re.compile(r"([2-9TJQKA])([2-9TJQKA])([so]?)")
+_COMBO_RE = re.compile(r"[2-9TJQKA]{2}[cdhs]{2}")  # ranks first, then suits
+_SEPARATORS = re.compile(r"[,;\s]+")
+
+
+def _combo(a: int, b: int) -> Combo:
+    return (a, b) if a > b else (b, a)
+
+
+def combo_label(combo: Combo) -> str:
+    return int_to_card(combo[0]) + int_to_card(combo[1])
+
+
+def combo_class(combo: Combo) -> int:
+    """Starting-hand class index of a combo (see preflop_table.class_index)."""
+    return class_index(combo[0] >> 2, combo[1] >> 2, (combo[0] & 3) == (combo[1] & 3))
+
+
+def _class_spec(text: str, token: str) -> Tuple[int, int, str]:
+    """"AKs" -> (12, 11, "s"): high rank, low rank, "s" / "o" / "" (both)."""
+    m = _CLASS_RE.fullmatch(text[:2].upper() + text[2:].lower())
+    if not m:
+        raise ValueError(f"Invalid range token {token!r}")
+    high, low, kind = RANKS.index(m.group(1)), RANKS.index(m.group(2)), m.group(3)
+    if high < low:
+        high, low = low, high
+    if high == low and kind:
+        raise ValueError(f"Pairs are neither suited nor offsuit: {token!r}")
+    return high, low, kind
+
+
+def _classes(high: int, low: int, kind: str) -> List[int]:
+    if high == low:
+        return [class_index(high, high, False)]
+    kinds = (True, False) if not kind else (kind == "s",)
+    return [class_index(high, low, suited) for suited in kinds]
+
+
+def _expand_classes(body: str, token: str) -> List[int]:
+    if body.endswith("+"):
+        high, low, kind = _class_spec(body[:-1], token)
+        if high == low:
+            return [c for r in range(high, len(RANKS)) for c in _classes(r, r, "")]
+        return [c for k in range(low, high) for c in _classes(high, k, kind)]
+
+    if "-" in body:
+        left, _, right = body.partition("-")
+        h1, l1, k1 = _class_spec(left, token)
+        h2, l2, k2 = _class_spec(right, token)
+        if k1 != k2:
+            raise ValueError(f"Both ends of {token!r} must be suited, offsuit or unspecified alike")
+        if h1 == l1 and h2 == l2:
+            return [c for r in range(min(h1, h2), max(h1, h2) + 1) for c in _classes(r, r, "")]
+        if h1 == h2:
+            return [c for k in range(min(l1, l2), max(l1, l2) + 1) for c in _classes(h1, k, k1)]
+        if h1 - l1 == h2 - l2 and h1 != l1:
+            gap = h1 - l1
+            return [c for h in range(min(h1, h2), max(h1, h2) + 1) for c in _classes(h, h - gap, k1)]
+        raise ValueError(f"Invalid span {token!r} (use e.g. 'TT-77', 'A5s-A2s' or '98s-65s')")
+
+    return _classes(*_class_spec(body, token))
+
+
+def _top_percent(percent: float, ranking: Optional[Sequence[int]], token: str) -> List[int]:
+    if ranking is None:
+        raise ValueError(f"{token!r} needs the preflop equity table (python -m poker_backend.services.preflop_table)")
+    if not 0 < percent <= 100:
+        raise ValueError(f"Percent ranges are between 0 and 100%: {token!r}")
+    target = percent / 100 * TOTAL_COMBOS
+    classes, combos = [], 0
+    for c in ranking:
+        if combos >= target:
+            break
+        classes.append(c)
+        combos += len(class_combos(c))
+    return classes
+
+
+def _expand(body: str, token: str, ranking: Optional[Sequence[int]]) -> Iterable[Combo]:
+    if body.lower() in ("random", "any"):
+        return [(a, b) for a in range(CARD_COUNT) for b in range(a)]
+    if body.endswith("%"):
+        try:
+            percent = float(body[:-1])
+        except ValueError:
+            raise ValueError(f"Invalid range token {token!r}")
+        classes = _top_percent(percent, ranking, token)
+    elif _COMBO_RE.fullmatch(body[::2].upper() + body[1::2].lower() if len(body) == 4 else ""):
+        a, b = encode_cards(body)
+        if a == b:
+            raise ValueError(f"A combo needs two different cards: {token!r}")
+        return [_combo(a, b)]
+    else:
+        classes = _expand_classes(body, token)
+    return [_combo(int(a), int(b)) for c in classes for a, b in class_combos(c)]
+
+
+def parse_range(text: str, ranking: Optional[Sequence[int]] = None) -> Dict[Combo, float]:
+    """
+    Combos and weights of a range in the notation above. ``ranking`` orders
+    the 169 classes from strongest to weakest, for percent tokens.
+    """
+    if not isinstance(text, str):
+        raise ValueError("A range is a string such as 'AKs, TT+, 98s-65s'")
+    combos: Dict[Combo, float] = {}
+    for token in filter(None, _SEPARATORS.split(text.strip())):
+        body, sep, weight_text = token.partition(":")
+        weight = 1.0
+        if sep:
+            try:
+                weight = float(weight_text)
+            except ValueError:
+                raise ValueError(f"Invalid weight in {token!r}")
+            if not 0 < weight <= 1:
+                raise ValueError(f"Weights are between 0 and 1: {token!r}")
+        for combo in _expand(body, token, ranking):
+            combos[combo] = weight
+    if not combos:
+        raise ValueError("Empty range")
+    return combos
+
+
+def remove_cards(combos: Dict[Combo, float], cards: Iterable[int]) -> Tuple[Dict[Combo, float], int]:
+    """The combos that hold none of ``cards`` (board and dead cards), and how many were removed."""
+    blocked = set(cards)
+    kept = {c: w for c, w in combos.items() if c[0] not in blocked and c[1] not in blocked}
+    return kept, len(combos) - len(kept)
+
+
+def to_arrays(combos: Dict[Combo, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, 2) int64 combos and (n,) weights, in sorted combo order."""
+    items = sorted(combos.items())
+    return (np.array([c for c, _ in items], dtype=np.int64).reshape(len(items), 2),
+            np.array([w for _, w in items], dtype=np.float64))
+
@@ -0,0 +1,355 @@
+"""
+Self-play: bots play many consecutive hands at one or more tables.
+
+    python -m poker_backend.services.self_play --seats equity random fixed:fold=0.1,call=0.6,raise=0.3 \\
+        --tables 8 --hands 10000 --seed 42 [--sample-every 1000] [--out report.json]
+
+Each table keeps its seats for the whole run: the button moves one seat per
+hand and stacks carry over (busted seats rebuy unless ``rebuy`` is off).
+All cards come from a per-table Dealer seeded from the run seed (dealt in
+batches; the same generator drives the bots), so a run is reproducible for
+a given seed and table count. Tables run in parallel on the shared process
+pool.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pokerkit import Automation
+
+from poker_backend.evaluator.cards import int_to_card
+from poker_backend.evaluator.pokerkit_hands import FastNoLimitTexasHoldem
+from poker_backend.services.bot_policies import (
+    FOLD, RAISE, BotPolicy, Decision, make_policies,
+)
+from poker_backend.services.dealer import Dealer, new_seed
+from poker_backend.services.worker_pool import run_tasks
+
+MAX_SEATS = 9
+DEAL_BATCH = 256  # hands dealt per Dealer.deal_batch call
+STREET_NAMES = ("preflop", "flop", "turn", "river")
+
+# Everything except dealing (cards come from our seeded generator) and
+# player decisions is left to pokerkit.
+AUTOMATIONS = (
+    Automation.ANTE_POSTING,
+    Automation.BET_COLLECTION,
+    Automation.BLIND_OR_STRADDLE_POSTING,
+    Automation.RUNOUT_COUNT_SELECTION,
+    Automation.HAND_KILLING,
+    Automation.CHIPS_PUSHING,
+    Automation.CHIPS_PULLING,
+)
+
+
+class _SeatStats:
+    __slots__ = ("hands", "net", "won", "vpip", "pfr", "rebuys", "busts", "actions")
+
+    def __init__(self):
+        self.hands = self.net = self.won = self.vpip = self.pfr = 0
+        self.rebuys = self.busts = self.actions = 0
+
+
+class SelfPlayTable:
+    def __init__(self, policies: List[BotPolicy], starting_stacks: List[int], blinds, antes: int,
+                 rng: np.random.Generator, rebuy: bool = True):
+        self.policies = policies
+        self.starting_stacks = list(starting_stacks)
+        self.stacks = list(starting_stacks)
+        self.blinds = tuple(blinds)
+        self.antes = antes
+        self.rng = rng
+        self.dealer = Dealer.from_generator(rng)
+        self._deals = np.empty((0, 0), dtype=np.int8)
+        self._dealt = 0
+        self.rebuy = rebuy
+        self.button = len(policies) - 1
+        self.hands_played = 0
+        self.stats = [_SeatStats() for _ in policies]
+
+    def _next_deal(self) -> np.ndarray:
+        """Cards for one hand: hole cards for every seat, then the board (dealt DEAL_BATCH hands at a time)."""
+        if self._dealt == len(self._deals):
+            self._deals = self.dealer.deal_batch(DEAL_BATCH, 2 * len(self.policies) + 5)
+            self._dealt = 0
+        self._dealt += 1
+        return self._deals[self._dealt - 1]
+
+    def _seat_order(self) -> Optional[List[int]]:
+        """Seats dealt into the next hand, in pokerkit order (button last)."""
+        for seat, stack in enumerate(self.stacks):
+            if stack <= 0 and self.rebuy:
+                self.stacks[seat] = self.starting_stacks[seat]
+                self.stats[seat].rebuys += 1
+        active = [s for s in range(len(self.stacks)) if self.stacks[s] > 0]
+        if len(active) < 2:
+            return None
+        self.button = next((s for s in active if s > self.button), active[0])
+        i = active.index(self.button)
+        return active[i + 1:] + active[:i + 1]
+
+    def play_hand(self, log: bool = False) -> Optional[Dict[str, Any]]:
+        """Plays one hand; returns its log when ``log`` is set. ``None`` if the table is finished."""
+        order = self._seat_order()
+        if order is None:
+            return None
+        n = len(order)
+        state = FastNoLimitTexasHoldem.create_state(
+            AUTOMATIONS, True, self.antes, self.blinds, self.blinds[-1],
+            tuple(self.stacks[s] for s in order), n,
+        )
+        cards = self._next_deal()
+        hole = cards[:2 * n].reshape(n, 2)
+        board = cards[2 * n:2 * n + 5]
+        dealt = 0
+        actions: List[Dict[str, Any]] = []
+        vpip, pfr = set(), set()
+
+        while state.status:
+            if state.can_burn_card("??"):
+                state.burn_card("??")
+            elif state.can_deal_hole():
+                i = state.hole_dealee_index
+                state.deal_hole(int_to_card(hole[i][0]) + int_to_card(hole[i][1]))
+            elif state.can_deal_board():
+                count = state.street.board_dealing_count
+                # Read before dealing: the last deal of an all-in runout can end the hand
+                street = state.street_index
+                state.deal_board("".join(int_to_card(c) for c in board[dealt:dealt + count]))
+                dealt += count
+                if log:
+                    actions.append({
+                        "deal_board": "".join(int_to_card(c) for c in board[dealt - count:dealt]),
+                        "street": STREET_NAMES[street],
+                    })
+            elif state.can_show_or_muck_hole_cards():
+                state.show_or_muck_hole_cards(True)
+            elif state.actor_index is not None:
+                actions.append(self._act(state, order, hole, board[:dealt], vpip, pfr))
+            else:
+                break
+
+        for i, seat in enumerate(order):
+            st = self.stats[seat]
+            payoff = int(state.payoffs[i])
+            self.stacks[seat] = int(state.stacks[i])
+            st.hands += 1
+            st.net += payoff
+            st.won += payoff > 0
+            st.vpip += seat in vpip
+            st.pfr += seat in pfr
+            st.busts += self.stacks[seat] == 0
+        self.hands_played += 1
+
+        if not log:
+            return None
+        payoffs = {seat: int(state.payoffs[i]) for i, seat in enumerate(order)}
+        return {
+            "hand_number": self.hands_played,
+            "button": self.button,
+            "seats": order,
+            "players": ["".join(int_to_card(c) for c in hole[i]) for i in range(n)],
+            "actions": actions,
+            "board_cards": [int_to_card(c) for c in board[:dealt]],
+            "stacks": [self.stacks[s] for s in order],
+            "payoffs": [payoffs[s] for s in order],
+            "winner_index": max(range(n), key=lambda i: payoffs[order[i]]),
+        }
+
+    def _act(self, state, order, hole, board, vpip, pfr) -> Dict[str, Any]:
+        i = state.actor_index
+        seat = order[i]
+        to_call = state.checking_or_calling_amount or 0
+        can_raise = state.can_complete_bet_or_raise_to()
+        decision = Decision(
+            hole=(int(hole[i][0]), int(hole[i][1])),
+            board=tuple(int(c) for c in board),
+            street=state.street_index,
+            opponents=sum(state.statuses) - 1,
+            to_call=to_call,
+            pot=state.total_pot_amount,
+            stack=state.stacks[i],
+            min_raise_to=state.min_completion_betting_or_raising_to_amount if can_raise else 0,
+            max_raise_to=state.max_completion_betting_or_raising_to_amount if can_raise else 0,
+        )
+        kind, amount = self.policies[seat].decide(decision, self.rng)
+        preflop = decision.street == 0
+        self.stats[seat].actions += 1
+        record = {"seat": seat, "street": STREET_NAMES[decision.street]}
+
+        if kind == RAISE and can_raise:
+            amount = max(decision.min_raise_to, min(decision.max_raise_to, int(amount)))
+            state.complete_bet_or_raise_to(amount)
+            record.update(type="raise" if to_call else "bet", amount=amount)
+            if preflop:
+                vpip.add(seat)
+                pfr.add(seat)
+        elif kind == FOLD and to_call:
+            state.fold()
+            record["type"] = "fold"
+        else:
+            state.check_or_call()
+            record["type"] = "call" if to_call else "check"
+            if to_call:
+                record["amount"] = to_call
+                if preflop:
+                    vpip.add(seat)
+        return record
+
+    def results(self) -> List[Dict[str, Any]]:
+        big_blind = self.blinds[-1]
+        seats = []
+        for seat, (policy, st) in enumerate(zip(self.policies, self.stats)):
+            hands = st.hands or 1
+            seats.append({
+                "seat": seat,
+                "policy": policy.describe(),
+                "hands": st.hands,
+                "net": st.net,
+                "bb_per_100": round(st.net / big_blind / hands * 100, 3),
+                "won_pct": round(st.won / hands, 4),
+                "vpip": round(st.vpip / hands, 4),
+                "pfr": round(st.pfr / hands, 4),
+                "actions": st.actions,
+                "busts": st.busts,
+                "rebuys": st.rebuys,
+                "final_stack": self.stacks[seat],
+            })
+        return seats
+
+
+def _normalize(config: Dict[str, Any]) -> Dict[str, Any]:
+    seats = config.get("seats") or ["random", "random"]
+    if not 2 <= len(seats) <= MAX_SEATS:
+        raise ValueError(f"Self-play needs 2 to {MAX_SEATS} seats")
+    make_policies(seats)  # fail fast on bad specs
+    blinds = [int(b) for b in config.get("blinds", (50, 100))]
+    stacks = config.get("stacks", 100 * blinds[-1])
+    stacks = [int(stacks)] * len(seats) if not isinstance(stacks, list) else [int(s) for s in stacks]
+    if len(stacks) != len(seats) or min(stacks) <= 0:
+        raise ValueError("'stacks' must be one positive number or one per seat")
+    tables = int(config.get("tables", 1))
+    hands = int(config.get("hands_per_table", 1000))
+    if tables < 1 or hands < 1:
+        raise ValueError("'tables' and 'hands_per_table' must be positive")
+    seed = config.get("seed")
+    return {
+        "seats": seats,
+        "blinds": blinds,
+        "antes": int(config.get("antes", 0)),
+        "stacks": stacks,
+        "tables": tables,
+        "hands_per_table": hands,
+        "seed": int(seed) if seed is not None else new_seed(),
+        "rebuy": bool(config.get("rebuy", True)),
+        "sample_every": int(config.get("sample_every", 0)),
+    }
+
+
+def _play_table(table_index: int, config: Dict[str, Any], seed_seq: np.random.SeedSequence) -> Dict[str, Any]:
+    """Runs inside a worker process: plays one table to completion."""
+    table = SelfPlayTable(
+        make_policies(config["seats"]), config["stacks"], config["blinds"], config["antes"],
+        np.random.default_rng(seed_seq), config["rebuy"],
+    )
+    sample_every = config["sample_every"]
+    logs = []
+    started = time.perf_counter()
+    for hand_number in range(1, config["hands_per_table"] + 1):
+        sample = bool(sample_every) and hand_number % sample_every == 0
+        entry = table.play_hand(log=sample)
+        if table.hands_played < hand_number:
+            break  # fewer than 2 seats with chips left (rebuy off)
+        if entry is not None:
+            entry["table"] = table_index
+            logs.append(entry)
+    elapsed = time.perf_counter() - started
+    return {
+        "table": table_index,
+        "hands": table.hands_played,
+        "elapsed_s": round(elapsed, 3),
+        "hands_per_second": round(table.hands_played / elapsed, 1) if elapsed > 0 else None,
+        "seats": table.results(),
+        "hand_logs": logs,
+    }
+
+
+class SelfPlayService:
+    @staticmethod
+    def run(config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Plays ``tables`` independent tables of ``hands_per_table`` hands each
+        and returns per-table and per-policy aggregates. Per-action output is
+        never printed; ``sample_every`` N keeps the log of every Nth hand.
+        """
+        config = _normalize(config)
+        seeds = np.random.SeedSequence(config["seed"]).spawn(config["tables"])
+        started = time.perf_counter()
+        if config["tables"] == 1:
+            tables = [_play_table(0, config, seeds[0])]
+        else:
+            tables = run_tasks((_play_table, t, config, seeds[t]) for t in range(config["tables"]))
+        elapsed = time.perf_counter() - started
+
+        total_hands = sum(t["hands"] for t in tables)
+        by_policy: Dict[str, Dict[str, Any]] = {}
+        for t in tables:
+            for s in t["seats"]:
+                key = json.dumps(s["policy"], sort_keys=True)
+                agg = by_policy.setdefault(key, {"policy": s["policy"], "seats": 0, "hands": 0, "net": 0})
+                agg["seats"] += 1
+                agg["hands"] += s["hands"]
+                agg["net"] += s["net"]
+        for agg in by_policy.values():
+            agg["bb_per_100"] = round(agg["net"] / config["blinds"][-1] / max(agg["hands"], 1) * 100, 3)
+
+        return {
+            "config": config,
+            "hands": total_hands,
+            "elapsed_s": round(elapsed, 3),
+            "hands_per_second": round(total_hands / elapsed, 1) if elapsed > 0 else None,
+            "by_policy": list(by_policy.values()),
+            "tables": [{k: v for k, v in t.items() if k != "hand_logs"} for t in tables],
+            "hand_logs": [log for t in tables for log in t["hand_logs"]],
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seats", nargs="+", default=["random", "random"],
+                        help='policy per seat: random, fixed:fold=..,call=..,raise=..,size=.., equity:call=..,raise=..')
+    parser.add_argument("--tables", type=int, default=1)
+    parser.add_argument("--hands", type=int, default=1000, help="hands per table")
+    parser.add_argument("--blinds", type=int, nargs=2, default=[50, 100])
+    parser.add_argument("--antes", type=int, default=0)
+    parser.add_argument("--stack", type=int, default=None, help="starting stack (default 100 big blinds)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-rebuy", action="store_true")
+    parser.add_argument("--sample-every", type=int, default=0, help="keep the log of every Nth hand")
+    parser.add_argument("--out", help="write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    config = {
+        "seats": args.seats, "tables": args.tables, "hands_per_table": args.hands,
+        "blinds": args.blinds, "antes": args.antes, "seed": args.seed,
+        "rebuy": not args.no_rebuy, "sample_every": args.sample_every,
+    }
+    if args.stack:
+        config["stacks"] = args.stack
+    report = SelfPlayService.run(config)
+
+    print(f"🎲 seed {report['config']['seed']}: {report['hands']} hands on {args.tables} table(s) "
+          f"in {report['elapsed_s']}s ({report['hands_per_second']} hands/s)")
+    for agg in report["by_policy"]:
+        print(f"   {json.dumps(agg['policy'])}: {agg['bb_per_100']:+.2f} bb/100 over {agg['hands']} hands")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
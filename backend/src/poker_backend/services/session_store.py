@@ -0,0 +1,150 @@
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Rough per-action cost of a cached state's history, added to its measured base size
+ACTION_BYTES = 512
+
+
+@dataclass
+class TableSession:
+    session_id: str
+    config: Dict[str, Any]        # simulate payload without actions
+    hole_cards: List[List[str]]   # dealt cards, so a rebuild deals the same hand
+    actions: List[Dict[str, Any]] = field(default_factory=list)
+    state: Any = None             # cached pokerkit State, None once evicted
+    players: Optional[List[Any]] = None
+    base_bytes: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def estimated_bytes(self) -> int:
+        return self.base_bytes + ACTION_BYTES * len(self.actions)
+
+
+class SessionStore:
+    """
+    In-memory table sessions with two tiers.
+
+    Every session keeps its small action log until it has been idle for
+    ``ttl`` seconds (or ``max_sessions`` is exceeded). The expensive part, the
+    live pokerkit state, is held only for the most recently used sessions,
+    bounded by ``max_states`` and ``max_bytes``; evicted sessions are rebuilt
+    from their log on next use.
+    """
+
+    def __init__(self, ttl: float, max_sessions: int, max_states: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, TableSession]" = OrderedDict()  # LRU order
+        self._live: "OrderedDict[str, int]" = OrderedDict()  # session_id -> bytes, LRU order
+        self._live_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.rebuilds = 0
+        self.expired = 0
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        return cls(
+            ttl=float(os.getenv("SESSION_TTL_SECONDS", "1800")),
+            max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "100000")),
+            max_states=int(os.getenv("SESSION_MAX_STATES", "5000")),
+            max_bytes=int(os.getenv("SESSION_MAX_STATE_BYTES", str(256 * 1024 * 1024))),
+        )
+
+    def create(self, config: Dict[str, Any], hole_cards, state, players) -> TableSession:
+        session = TableSession(
+            session_id=str(uuid.uuid4()),
+            config=config,
+            hole_cards=hole_cards,
+            state=state,
+            players=players,
+            base_bytes=len(pickle.dumps(state)),
+        )
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._expire()
+            self._track(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[TableSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(session_id)
+                if session_id in self._live:
+                    self._live.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._untrack(session)
+            return session is not None
+
+    def touch(self, session: TableSession):
+        """Re-accounts a session after its state changed or was rebuilt."""
+        with self._lock:
+            if session.session_id in self._sessions:
+                self._untrack(session)
+                self._track(session)
+
+    def record_rebuild(self):
+        with self._lock:
+            self.rebuilds += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "live_states": len(self._live),
+                "live_state_bytes": self._live_bytes,
+                "max_states": self.max_states,
+                "max_state_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "rebuilds": self.rebuilds,
+                "expired": self.expired,
+            }
+
+    # --- internals (caller holds self._lock) ---
+
+    def _track(self, session: TableSession):
+        if session.state is None:
+            return
+        size = session.estimated_bytes()
+        self._live[session.session_id] = size
+        self._live_bytes += size
+        while self._live and (len(self._live) > self.max_states or self._live_bytes > self.max_bytes):
+            victim_id, victim_size = self._live.popitem(last=False)
+            self._live_bytes -= victim_size
+            victim = self._sessions.get(victim_id)
+            if victim is not None:
+                victim.state = None
+                victim.players = None
+            self.evictions += 1
+
+    def _untrack(self, session: TableSession):
+        size = self._live.pop(session.session_id, None)
+        if size is not None:
+            self._live_bytes -= size
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used >= cutoff and len(self._sessions) <= self.max_sessions:
+                break
+            self._sessions.popitem(last=False)
+            self._untrack(oldest)
+            self.expired += 1
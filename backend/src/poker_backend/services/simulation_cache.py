@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from poker_backend.repositories.simulation_cache_repository import SimulationCacheRepository
+
+logger = logging.getLogger(__name__)
+
+# Bump when simulate_hand's output for the same input changes, so stale
+# shared entries are never served.
+CACHE_VERSION = 2
+SEATS = 6
+
+
+def cache_key(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Canonical hash of a simulate payload, or ``None`` when the result is not
+    deterministic (a seat without two explicit hole cards gets random cards
+    and no "seed" says which) or the caller asked for a trace. Defaults and
+    seat padding are applied the same way ``create_state`` does, so
+    equivalent payloads share a key.
+    """
+    if data.get("trace"):
+        return None
+    players = list(data.get("players", []))[:SEATS]
+    players += ["????"] * (SEATS - len(players))
+    explicit = [isinstance(p, list) and len(p) == 2 and all(isinstance(c, str) for c in p) for p in players]
+    seed = data.get("seed")
+    if not all(explicit) and not isinstance(seed, int):
+        return None
+    # Dealt seats only depend on the seed, whatever placeholder they were sent with
+    players = [p if e else None for p, e in zip(players, explicit)]
+    stacks = list(data.get("stacks", []))
+    stacks += [50000] * (SEATS - len(stacks))
+    canonical = {
+        "v": CACHE_VERSION,
+        "antes": data.get("antes", 0),
+        "blinds": list(data.get("blinds", (20, 40))),
+        "min_bet": data.get("min_bet", 40),
+        "stacks": stacks,
+        "players": players,
+        "actions": data.get("actions", []),
+    }
+    if not all(explicit):
+        canonical["seed"] = seed
+    try:
+        encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SimulationCache:
+    """
+    Result cache for deterministic ``/hand/simulate`` payloads.
+
+    The first tier is an in-process LRU bounded by entry count and by the
+    JSON size of the cached results. The optional second tier is a Postgres
+    table shared by every API worker; a hit there is promoted into the LRU.
+    Shared-tier failures are logged and treated as misses.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, shared: Optional[SimulationCacheRepository] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.shared_errors = 0
+
+    @classmethod
+    def from_env(cls, pool) -> "SimulationCache":
+        shared = None
+        if os.getenv("SIM_CACHE_SHARED", "0") in ("1", "true", "yes"):
+            shared = SimulationCacheRepository(pool)
+            shared.create_table()
+            # The shared table has no size bound of its own; age it out on startup
+            ttl = float(os.getenv("SIM_CACHE_SHARED_TTL_SECONDS", str(7 * 24 * 3600)))
+            if ttl > 0:
+                shared.prune(ttl)
+        return cls(
+            max_entries=int(os.getenv("SIM_CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(os.getenv("SIM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            shared=shared,
+        )
+
+    def get_or_simulate(self, data: Dict[str, Any],
+                        simulate: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """Returns (result, "hit" | "miss" | "bypass")."""
+        key = cache_key(data)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return simulate(data), "bypass"
+
+        cached = self._get_memory(key)
+        if cached is not None:
+            return cached, "hit"
+        cached = self._get_shared(key)
+        if cached is not None:
+            self._put_memory(key, cached)
+            return cached, "hit"
+
+        with self._lock:
+            self.misses += 1
+        result = simulate(data)
+        self._put_memory(key, result)
+        self._put_shared(key, result)
+        return result, "miss"
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "shared_tier": self.shared is not None,
+                "memory_hits": self.memory_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_ratio": round((self.memory_hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "shared_errors": self.shared_errors,
+            }
+
+    # --- tiers ---
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return entry[0]
+
+    def _put_memory(self, key: str, result: Dict[str, Any]):
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.shared is None:
+            return None
+        try:
+            result = self.shared.get(key)
+        except Exception:
+            logger.warning("Shared simulation cache lookup failed", exc_info=True)
+            with self._lock:
+                self.shared_errors += 1
+            return None
+        if result is not None:
+            with self._lock:
+                self.shared_hits += 1
+        return result
+
+    def _put_shared(self, key: str, result: Dict[str, Any]):
+        if self.shared is None:
+            return
+        try:
+            self.shared.put(key, result)
+        except Exception:
+            logger.warning("Shared simulation cache store failed", exc_info=True)
+            with self._lock:
+                self.shared_errors += 1
@@ -0,0 +1,96 @@
+from typing import Any, Callable, Dict, Optional
+
+from poker_backend.services.poker_service import PokerSimulationService
+from poker_backend.services.session_store import SessionStore, TableSession
+
+
+class SessionNotFound(KeyError):
+    pass
+
+
+View = Callable[[TableSession, Any], Dict[str, Any]]
+
+
+class TableSessionService:
+    """
+    Incremental hands: the client creates a session once and then posts one
+    action at a time. Each action is applied to the cached pokerkit state, so
+    a hand costs O(n) engine work instead of replaying the full action list
+    on every click. Responses have the same shape as ``/hand/simulate``.
+
+    ``view`` renders the response from (session, state) instead, e.g. the
+    compact table view the live WebSocket channel diffs.
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+
+    def create(self, data: Dict[str, Any], view: Optional[View] = None) -> Dict[str, Any]:
+        config = PokerSimulationService.with_seed({k: v for k, v in data.items() if k != "actions"})
+        state, players, hole_cards = PokerSimulationService.create_state(config)
+        session = self.store.create(config, hole_cards, state, players)
+        with session.lock:
+            for a in data.get("actions", []):
+                self._apply(session, state, players, a)
+            self.store.touch(session)
+            return (view or self._snapshot)(session, state)
+
+    def act(self, session_id: str, action: Dict[str, Any], view: Optional[View] = None) -> Dict[str, Any]:
+        session = self._get(session_id)
+        with session.lock:
+            state, players = self._live_state(session)
+            self._apply(session, state, players, action)
+            self.store.touch(session)
+            return (view or self._snapshot)(session, state)
+
+    def get(self, session_id: str, view: Optional[View] = None) -> Dict[str, Any]:
+        session = self._get(session_id)
+        with session.lock:
+            state, _ = self._live_state(session)
+            return (view or self._snapshot)(session, state)
+
+    def close(self, session_id: str):
+        if not self.store.delete(session_id):
+            raise SessionNotFound(session_id)
+
+    def _get(self, session_id: str) -> TableSession:
+        session = self.store.get(session_id)
+        if session is None:
+            raise SessionNotFound(session_id)
+        return session
+
+    def _live_state(self, session: TableSession):
+        """The cached state, rebuilt from the action log if it was evicted."""
+        state, players = session.state, session.players
+        if state is None:
+            state, players = self._rebuild(session)
+            session.state, session.players = state, players
+            self.store.record_rebuild()
+            self.store.touch(session)
+        return state, players
+
+    @staticmethod
+    def _rebuild(session: TableSession):
+        state, players, _ = PokerSimulationService.create_state(session.config, session.hole_cards)
+        for idx, a in enumerate(session.actions):
+            PokerSimulationService.apply_action(state, idx, a)
+            PokerSimulationService.settle(state, players)
+        return state, players
+
+    @staticmethod
+    def _apply(session: TableSession, state, players, action: Dict[str, Any]):
+        PokerSimulationService.apply_action(state, len(session.actions), action)
+        # Settling after every action mirrors what /hand/simulate returns for
+        # the same prefix of actions (showdown runs as soon as it is reached)
+        PokerSimulationService.settle(state, players)
+        session.actions.append(action)
+        session.state, session.players = state, players
+
+    @staticmethod
+    def _snapshot(session: TableSession, state) -> Dict[str, Any]:
+        snapshot = PokerSimulationService.snapshot(state, session.hole_cards, list(session.actions))
+        snapshot["session_id"] = session.session_id
+        snapshot["actor_index"] = getattr(state, "actor_index", None)
+        if "seed" in session.config:
+            snapshot["seed"] = session.config["seed"]
+        return snapshot
@@ -0,0 +1,124 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+STREET_NAMES = ("preflop", "flop", "turn", "river")
+
+
+def street_name(index: Optional[int]) -> Optional[str]:
+    if index is None:
+        return None
+    return STREET_NAMES[index] if index < len(STREET_NAMES) else str(index)
+
+
+class HandTrace:
+    """
+    Per-hand trace for ``simulate_hand``: one event per action with its
+    duration and outcome, street transitions and engine errors. Only built
+    when tracing was asked for; the untraced path never touches it.
+    """
+
+    __slots__ = ("started", "events", "errors")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.errors = 0
+
+    def _at(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 3)
+
+    def phase(self, name: str, started: float, **fields):
+        """A non-action step (dealing, settlement) that began at ``started``."""
+        self.events.append({
+            "event": name,
+            "at_ms": self._at(),
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            **fields,
+        })
+
+    def action(self, index: int, action: Dict[str, Any], started: float, outcome: Optional[str],
+               error: Optional[BaseException], street_before: Optional[int], street_after: Optional[int]):
+        event = {
+            "event": "action",
+            "index": index,
+            "action": action,
+            "at_ms": self._at(),
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "outcome": outcome,
+        }
+        if error is not None:
+            self.errors += 1
+            event["error"] = f"{type(error).__name__}: {error}"
+        self.events.append(event)
+        if street_before != street_after:
+            self.events.append({
+                "event": "street",
+                "at_ms": event["at_ms"],
+                "from": street_name(street_before),
+                "to": street_name(street_after),
+            })
+
+    def error(self, where: str, error: BaseException, **fields):
+        self.errors += 1
+        self.events.append({"event": "error", "at_ms": self._at(), "where": where,
+                            "error": f"{type(error).__name__}: {error}", **fields})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total_ms": self._at(), "errors": self.errors, "events": self.events}
+
+
+class TraceBuffer:
+    """
+    The most recent traced hands of this process, for /ops/traces. Hands
+    are traced when the request asks for it ("trace": true) or, with
+    ``sample_rate`` > 0, for that fraction of all simulations.
+    """
+
+    def __init__(self, size: int, sample_rate: float):
+        self.sample_rate = sample_rate
+        self._traces: "deque[Dict[str, Any]]" = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    @classmethod
+    def from_env(cls) -> "TraceBuffer":
+        return cls(
+            size=int(os.getenv("SIM_TRACE_BUFFER", "200")),
+            sample_rate=float(os.getenv("SIM_TRACE_SAMPLE_RATE", "0")),
+        )
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, trace: Dict[str, Any], actions: int):
+        entry = {"recorded_at": datetime.now(timezone.utc).isoformat(), "actions": actions, **trace}
+        with self._lock:
+            self._traces.append(entry)
+            self.recorded += 1
+
+    def recent(self, limit: int = 50, min_ms: float = 0.0, errors_only: bool = False) -> List[Dict[str, Any]]:
+        """Newest first."""
+        with self._lock:
+            traces = list(self._traces)
+        matching = [
+            t for t in reversed(traces)
+            if t["total_ms"] >= min_ms and (t["errors"] or not errors_only)
+        ]
+        return matching[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "buffered": len(self._traces),
+                "capacity": self._traces.maxlen,
+                "recorded": self.recorded,
+                "sample_rate": self.sample_rate,
+            }
+
+
+trace_buffer = TraceBuffer.from_env()
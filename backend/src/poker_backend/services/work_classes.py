@@ -0,0 +1,150 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
+
+
+class WorkQueueFull(Exception):
+    """More requests of one work class are waiting than its queue allows."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.name = name
+
+
+class _Timings:
+    """Count/total/max plus a window of recent samples for percentiles (ms)."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: "deque[float]" = deque(maxlen=window)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.recent.append(ms)
+
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self.recent)
+
+        def pct(p: float) -> float:
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 3) if recent else 0.0
+
+        return {
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": round(self.max, 3),
+        }
+
+
+class WorkClass:
+    """
+    One class of blocking work (e.g. simulations) with its own threads.
+
+    At most ``concurrency`` calls run at once, each on this class's own
+    executor, so a burst of slow simulations cannot take the threads that
+    cheap requests use. Up to ``max_queue`` more callers wait their turn on
+    the event loop; beyond that ``run`` raises ``WorkQueueFull`` (503).
+    """
+
+    def __init__(self, name: str, concurrency: int, max_queue: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"work-{name}")
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_ms = _Timings()
+        self.run_ms = _Timings()
+
+    @classmethod
+    def from_env(cls, name: str, concurrency: int, max_queue: int) -> "WorkClass":
+        prefix = f"WORK_{name.upper()}"
+        return cls(
+            name,
+            concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", str(max_queue))),
+        )
+
+    def check_capacity(self):
+        """Raises ``WorkQueueFull`` now rather than after a response has started."""
+        if self.waiting >= self.max_queue and self._semaphore.locked():
+            with self._lock:
+                self.rejected += 1
+            raise WorkQueueFull(self.name)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one of the ``concurrency`` slots, for work that is awaited rather than run on a thread."""
+        self.check_capacity()
+        enqueued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.queue_ms.add((started - enqueued) * 1000)
+        try:
+            yield
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.run_ms.add((time.perf_counter() - started) * 1000)
+            self._semaphore.release()
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Runs ``fn(*args)`` on this class's executor once a slot is free."""
+        async with self.slot():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queue_ms": self.queue_ms.summary(),
+                "run_ms": self.run_ms.summary(),
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_work_classes() -> Dict[str, WorkClass]:
+    """
+    ``simulate``: single-hand pokerkit work (/hand/simulate, table sessions).
+    ``heavy``: long jobs that fan out to the process pool (batches, equity, self-play).
+    Reads and writes go through the async DB pool and need no class.
+    """
+    return {
+        "simulate": WorkClass.from_env("simulate", concurrency=4, max_queue=200),
+        "heavy": WorkClass.from_env("heavy", concurrency=2, max_queue=16),
+    }
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Shared process pool for CPU-bound simulation work. Workers are spawned
+# (not forked) so they never inherit the web server's threads or sockets.
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def pool_size() -> int:
+    """Number of worker processes, from SIM_POOL_WORKERS (default: all cores)."""
+    configured = int(os.getenv("SIM_POOL_WORKERS", "0"))
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=pool_size(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def reset_process_pool(broken: ProcessPoolExecutor):
+    """
+    Drops ``broken`` after one of its workers died (every later submit to it
+    raises BrokenProcessPool); the next ``get_process_pool`` starts a new one.
+    """
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit(fn: Callable, *args) -> Tuple[ProcessPoolExecutor, Future]:
+    """
+    ``fn(*args)`` on the shared pool, replacing the pool first if it is
+    broken. Returns the pool with the future, to reset if the future fails
+    with BrokenProcessPool.
+    """
+    pool = get_process_pool()
+    try:
+        return pool, pool.submit(fn, *args)
+    except BrokenProcessPool:
+        reset_process_pool(pool)
+        pool = get_process_pool()
+        return pool, pool.submit(fn, *args)
+
+
+def iter_tasks(calls: Iterable[Tuple]) -> Iterator[Any]:
+    """
+    Results of ``(fn, *args)`` calls run on the shared pool, in order. When a
+    worker dies, the unfinished calls are submitted once more to a new pool.
+    """
+    calls = list(calls)
+    submitted = [submit(*call) for call in calls]
+    try:
+        for i, call in enumerate(calls):
+            pool, future = submitted[i]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                reset_process_pool(pool)
+                for j in range(i, len(calls)):
+                    if submitted[j][0] is pool:
+                        submitted[j] = submit(*calls[j])
+                result = submitted[i][1].result()
+            yield result
+    finally:
+        for _, future in submitted:
+            future.cancel()
+
+
+def run_tasks(calls: Iterable[Tuple]) -> List[Any]:
+    return list(iter_tasks(calls))
+
+
+def shutdown_process_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import psycopg
+
+from poker_backend.models.hand import Hand
+from poker_backend.repositories.hand_repository import HandRepository
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindFull(Exception):
+    """The queue stayed full for the whole enqueue timeout."""
+
+
+def _unavailable(error: BaseException) -> bool:
+    """
+    Postgres is down, restarting or out of connections (pool timeouts are
+    OperationalErrors too), as opposed to rejecting rows of the batch.
+    """
+    return isinstance(error, psycopg.OperationalError)
+
+
+class HandWriteBehind:
+    """
+    Buffered hand ingestion: ``submit`` assigns the hand_id/created_at in the
+    app and queues the hand; a background thread flushes the queue with one
+    COPY per batch when ``batch_size`` hands are waiting or ``flush_interval``
+    seconds have passed since the first one arrived.
+
+    The queue is bounded: when Postgres falls behind, ``submit`` blocks for up
+    to ``enqueue_timeout`` and then raises ``WriteBehindFull``. Queued hands
+    are acknowledged before they are durable, and a freshly saved hand may
+    take up to one flush interval to appear in listings.
+
+    While Postgres is unreachable a batch is retried until it goes through.
+    A batch Postgres rejects is retried ``max_attempts`` times, then split in
+    halves until the offending hands are isolated; those are appended to
+    ``quarantine_path`` (NDJSON in the bulk importer's JSON dump format, so
+    they can be fixed and re-imported) and the rest of the batch is saved.
+    """
+
+    def __init__(self, repo: HandRepository, max_queue: int, batch_size: int,
+                 flush_interval: float, enqueue_timeout: float, max_attempts: int = 3,
+                 quarantine_path: Optional[str] = None):
+        self.repo = repo
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.quarantine_path = quarantine_path
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.failed = 0
+        self.quarantined = 0
+        self.retries = 0
+        self.splits = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    @classmethod
+    def from_env(cls, repo: HandRepository) -> Optional["HandWriteBehind"]:
+        if os.getenv("HAND_WRITE_BEHIND", "0") not in ("1", "true", "yes"):
+            return None
+        return cls(
+            repo,
+            max_queue=int(os.getenv("HAND_WRITE_BEHIND_QUEUE", "10000")),
+            batch_size=int(os.getenv("HAND_WRITE_BEHIND_BATCH", "500")),
+            flush_interval=float(os.getenv("HAND_WRITE_BEHIND_INTERVAL_MS", "200")) / 1000,
+            enqueue_timeout=float(os.getenv("HAND_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS", "1000")) / 1000,
+            max_attempts=int(os.getenv("HAND_WRITE_BEHIND_ATTEMPTS", "3")),
+            quarantine_path=os.getenv("HAND_WRITE_BEHIND_QUARANTINE", "write_behind_quarantine.ndjson") or None,
+        )
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="hand-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Flushes everything still queued, then stops the flusher thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, hand: Hand) -> Hand:
+        hand.hand_id = uuid.uuid4()
+        hand.created_at = datetime.now(timezone.utc)
+        try:
+            self._queue.put(hand, timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            raise WriteBehindFull()
+        with self._stats_lock:
+            self.enqueued += 1
+        return hand
+
+    def try_submit(self, hand: Hand) -> Optional[Hand]:
+        """``submit`` without waiting: ``None`` when the queue is full right now."""
+        hand.hand_id = uuid.uuid4()
+        hand.created_at = datetime.now(timezone.utc)
+        try:
+            self._queue.put_nowait(hand)
+        except queue.Full:
+            return None
+        with self._stats_lock:
+            self.enqueued += 1
+        return hand
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "rejected": self.rejected,
+                "flushed": self.flushed,
+                "failed": self.failed,
+                "quarantined": self.quarantined,
+                "retries": self.retries,
+                "splits": self.splits,
+                "batches": self.batches,
+                "last_batch_size": self.last_batch_size,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "max_flush_ms": round(self.max_flush_ms, 3),
+                "avg_flush_ms": round(self.total_flush_ms / self.batches, 3) if self.batches else 0.0,
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._drain()
+                break
+            batch: List[Hand] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    # Drain whatever is left, then exit after this flush
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch, final=stopping)
+            if stopping:
+                self._drain()
+
+    def _drain(self):
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+            if not batch:
+                return
+            self._flush(batch, final=True)
+
+    def _flush(self, batch: List[Hand], final: bool, attempts: Optional[int] = None):
+        """Saves ``batch``, isolating and quarantining the hands Postgres rejects."""
+        error = self._save(batch, final, self.max_attempts if attempts is None else attempts)
+        if error is None:
+            return
+        if _unavailable(error) or len(batch) == 1:
+            # Only reached on shutdown for an unreachable database
+            self._quarantine(batch, error)
+            return
+        # Rejected rows fail the same way on every retry: bisect down to them,
+        # one attempt per half, and keep the flusher draining
+        with self._stats_lock:
+            self.splits += 1
+        middle = len(batch) // 2
+        self._flush(batch[:middle], final, attempts=1)
+        self._flush(batch[middle:], final, attempts=1)
+
+    def _save(self, batch: List[Hand], final: bool, attempts: int) -> Optional[Exception]:
+        """One COPY of ``batch``, retried with backoff; the last error when it never went through."""
+        failures = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                self.repo.save_hands(batch)
+            except Exception as e:
+                failures += 1
+                logger.warning("Write-behind flush of %d hands failed (attempt %d): %s", len(batch), failures, e)
+                # An unreachable database is waited out while running (the bounded
+                # queue pushes back on clients); anything else gets ``attempts`` tries
+                if failures >= attempts and not (_unavailable(e) and not final):
+                    return e
+                with self._stats_lock:
+                    self.retries += 1
+                time.sleep(min(0.1 * 2 ** failures, 5.0))
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self.flushed += len(batch)
+                self.batches += 1
+                self.last_batch_size = len(batch)
+                self.last_flush_ms = elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+                self.total_flush_ms += elapsed_ms
+            return None
+
+    def _quarantine(self, batch: List[Hand], error: Exception):
+        with self._stats_lock:
+            self.failed += len(batch)
+        records = [
+            json.dumps({
+                **hand.to_dict(),
+                "hand_id": str(hand.hand_id),
+                "created_at": hand.created_at.isoformat() if hand.created_at else None,
+                "error": f"{type(error).__name__}: {error}",
+            }, default=str)
+            for hand in batch
+        ]
+        if self.quarantine_path:
+            try:
+                with open(self.quarantine_path, "a") as f:
+                    f.write("".join(r + "\n" for r in records))
+                with self._stats_lock:
+                    self.quarantined += len(batch)
+                logger.error("Quarantined %d unsaved hands to %s: %s", len(batch), self.quarantine_path, error)
+                return
+            except OSError:
+                logger.exception("Could not write the write-behind quarantine file")
+        logger.error("Dropping %d unsaved hands (%s): %s", len(batch), error, records)
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# The evaluator's lookup tables are built once per run into a scratch directory, not ~/.cache
+os.environ.setdefault("EVALUATOR_CACHE_DIR", tempfile.mkdtemp(prefix="poker_backend_tests_"))
@@ -0,0 +1,61 @@
+from poker_backend.models.hand import Hand
+from poker_backend.services.branching import ACTION_BYTES, BranchService
+
+# Everyone limps, the big blind checks, then the flop comes and the blinds check
+FLOP_HAND = Hand(
+    hand_id="00000000-0000-0000-0000-000000000001",
+    players=["AhKh", "QsQd", "9c9d", "8s7s", "5c4c", "TcTd"],
+    actions=[{"type": "call"}] * 5 + [{"type": "check"}, {"deal_board": "Jh7c2h"},
+                                      {"type": "check"}, {"type": "check"}],
+    board_cards=[],
+    stacks=[],
+    winner_index=None,
+)
+
+
+def _expected_bytes(service: BranchService) -> int:
+    blobs = {id(b): len(b) for line in service._lines.values() for _, b in line.snapshots}
+    return sum(blobs.values()) + sum(line.action_bytes() for line in service._lines.values())
+
+
+def test_shared_snapshots_are_counted_once():
+    service = BranchService(max_lines=10, max_bytes=1 << 30)
+    first = service.branch_from_hand(FLOP_HAND, 8, [{"type": "fold"}])
+    service.branch(first["branch_id"], 7, [{"type": "check"}])
+
+    assert len(service._lines) == 3
+    assert service.stats()["bytes"] == _expected_bytes(service)
+    assert service.stats()["snapshots"] == len({id(b) for l in service._lines.values() for _, b in l.snapshots})
+
+
+def test_evicting_a_parent_keeps_the_bytes_its_branches_still_hold():
+    service = BranchService(max_lines=2, max_bytes=1 << 30)
+    first = service.branch_from_hand(FLOP_HAND, 8, [{"type": "fold"}])
+    service.branch(first["branch_id"], 7, [{"type": "check"}])
+
+    # The stored hand was evicted; its deal and flop snapshots live on in the branches
+    assert service.stats()["evictions"] == 1
+    assert service.stats()["bytes"] == _expected_bytes(service)
+    assert service.stats()["bytes"] > sum(line.action_bytes() for line in service._lines.values())
+
+
+def test_evicting_every_holder_releases_a_snapshot():
+    service = BranchService(max_lines=1, max_bytes=1 << 30)
+    service.branch_from_hand(FLOP_HAND, 8, [{"type": "fold"}])
+    service.branch_from_hand(FLOP_HAND, 8, [{"type": "fold"}])
+
+    (line,) = service._lines.values()
+    assert service.stats()["bytes"] == _expected_bytes(service)
+    assert service.stats()["snapshots"] == len(line.snapshots)
+    assert ACTION_BYTES * len(line.actions) < service.stats()["bytes"]
+
+
+def test_evicted_replays_leave_the_hand_index():
+    service = BranchService(max_lines=2, max_bytes=1 << 30)
+    for i in range(5):
+        hand = Hand(**{**FLOP_HAND.to_dict(), "hand_id": f"00000000-0000-0000-0000-00000000000{i + 2}"})
+        service.branch_from_hand(hand, 8, [{"type": "fold"}])
+
+    assert len(service._hand_lines) <= len(service._lines)
+    assert all(service._hand_lines[line.cache_key] == line.line_id
+               for line in service._lines.values() if line.cache_key)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from poker_backend.services.dealer import MAX_SEED, Dealer
+
+
+def test_same_seed_deals_same_cards():
+    a, b = Dealer(1234), Dealer(1234)
+    assert a.deal_cards(9) == b.deal_cards(9)
+    assert a.deal(5, exclude=range(10)) == b.deal(5, exclude=range(10))
+    holes_a, boards_a = a.deal_hands(500, 6)
+    holes_b, boards_b = b.deal_hands(500, 6)
+    assert np.array_equal(holes_a, holes_b) and np.array_equal(boards_a, boards_b)
+
+
+def test_different_seeds_deal_differently():
+    assert Dealer(1).deal_batch(100, 7).tolist() != Dealer(2).deal_batch(100, 7).tolist()
+
+
+def test_reported_seed_reproduces_deal():
+    dealer = Dealer()
+    assert 0 <= dealer.seed < MAX_SEED
+    cards = dealer.deal(7)
+    assert Dealer(dealer.seed).deal(7) == cards
+
+
+def test_spawned_children_are_reproducible_and_independent():
+    children = [Dealer(seq).deal_batch(50, 7) for seq in Dealer(99).spawn(3)]
+    again = [Dealer(seq).deal_batch(50, 7) for seq in Dealer(99).spawn(3)]
+    assert all(np.array_equal(x, y) for x, y in zip(children, again))
+    assert not np.array_equal(children[0], children[1])
+
+
+def test_deals_are_distinct_and_respect_exclude():
+    excluded = {0, 5, 51}
+    for row in Dealer(7).deal_batch(2000, 9, np.array([c for c in range(52) if c not in excluded], dtype=np.int8)):
+        assert len(set(row.tolist())) == 9 and not excluded & set(row.tolist())
+    holes, boards = Dealer(7).deal_hands(2000, 4, exclude=excluded)
+    cards = np.concatenate([holes.reshape(2000, 8), boards], axis=1)
+    assert all(len(set(r)) == 13 and not excluded & set(r) for r in cards.tolist())
+    assert not excluded & set(Dealer(7).deal(49, exclude=excluded))
+
+
+@pytest.mark.parametrize("seed", [-1, MAX_SEED])
+def test_rejects_out_of_range_seed(seed):
+    with pytest.raises(ValueError):
+        Dealer(seed)
+
+
+def test_rejects_dealing_past_the_deck():
+    with pytest.raises(ValueError):
+        Dealer(1).deal(3, exclude=range(50))
+    with pytest.raises(ValueError):
+        Dealer(1).deal_batch(1, 53)
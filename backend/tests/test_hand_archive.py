@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from poker_backend.models.hand import Hand
+from poker_backend.repositories.partition_repository import ArchiveEntry
+from poker_backend.services.hand_archive import HandArchive
+
+DAY = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def hands(n: int):
+    # One hand every 10 minutes, oldest first
+    for i in range(n):
+        yield Hand(
+            hand_id=str(uuid.UUID(int=i + 1)), players=["AhKh", "QsQd"], actions=[{"type": "call"}],
+            board_cards=[], stacks=[100.0, 100.0], winner_index=0,
+            created_at=DAY + timedelta(minutes=10 * i),
+        )
+
+
+@pytest.fixture
+def archived(tmp_path):
+    archive = HandArchive(str(tmp_path), row_group_size=4)
+    path, rows, size = archive.export("hands_2024_01_01", hands(20))
+    entry = ArchiveEntry("hands_2024_01_01", DAY, DAY + timedelta(days=1), path, rows, size)
+    return archive, [entry]
+
+
+def test_naive_bounds_are_read_as_utc(archived):
+    archive, entries = archived
+    since, until = datetime(2024, 1, 1, 1, 0), datetime(2024, 1, 1, 2, 0)
+
+    page = archive.read(entries, since, until, limit=100)
+
+    assert [h.created_at for h in page] == [DAY + timedelta(minutes=m) for m in (110, 100, 90, 80, 70, 60)]
+    assert page == archive.read(entries, since.replace(tzinfo=timezone.utc),
+                                until.replace(tzinfo=timezone.utc), limit=100)
+
+
+def test_pages_follow_the_cursor(archived):
+    archive, entries = archived
+    first = archive.read(entries, None, None, limit=7)
+    last = first[-1]
+    second = archive.read(entries, None, None, limit=100, after=(last.created_at.replace(tzinfo=None), last.hand_id))
+
+    assert len(first) + len(second) == 20
+    assert [h.hand_id for h in first + second] == [str(uuid.UUID(int=i)) for i in range(20, 0, -1)]
@@ -0,0 +1,72 @@
+import pytest
+
+from poker_backend.models.hand_codec import F_EXTRAS, HEADER, decode, encode
+
+PLAYERS = ["AhKh", "7c2d", "QsQd", "????"]
+ACTIONS = [
+    {"type": "raise", "seat": 0, "street": "preflop", "amount": 300},
+    {"type": "call", "seat": 1, "street": "preflop", "amount": 2.5},
+    {"type": "allin", "seat": 2, "street": "preflop", "amount": 9750, "all_in": True},
+    {"type": "fold", "seat": 3},
+    {"deal_board": "Jh7c2h", "street": "flop"},
+    {"type": "check", "seat": 1, "street": "flop"},
+    {"deal_board": "9s"},
+    {"type": "show", "seat": 0, "street": "showdown"},
+]
+
+
+def round_trip(players, actions, board_cards, stacks, winner_index):
+    hand = decode(encode(players, actions, board_cards, stacks, winner_index), hand_id=42)
+    assert hand.hand_id == 42
+    return hand.players, hand.actions, hand.board_cards, hand.stacks, hand.winner_index
+
+
+def test_round_trip_fixed_layout():
+    columns = (PLAYERS, ACTIONS, ["Jh", "7c", "2h", "9s", "Ad"], [10000.0, 9875.5, 0.0, 0.1234], 2)
+    blob = encode(*columns)
+    assert not HEADER.unpack_from(blob)[1] & F_EXTRAS
+    assert round_trip(*columns) == columns
+
+
+def test_round_trip_empty_hand():
+    columns = ([], [], [], [], None)
+    assert round_trip(*columns) == columns
+
+
+@pytest.mark.parametrize("columns", [
+    # stringified player list, as stored for non-list input
+    (["['Ah', 'Kh']"], [], [], [100.0], 0),
+    # board entries that are not single cards
+    (["AhKh"], [], ["Jh7c", "10h"], [100.0], None),
+    # unknown action type, extra keys, sub-cent and huge amounts, non-dict actions
+    (["AhKh", "QsQd"], [
+        {"type": "straddle", "seat": 0, "amount": 200},
+        {"type": "bet", "seat": 1, "amount": 100, "note": "tank"},
+        {"type": "bet", "seat": 0, "amount": 0.001},
+        {"type": "bet", "seat": 0, "amount": 2 ** 70},
+        {"type": "call", "seat": True},
+        "fold",
+    ], [], [100.0, 100.0], 1),
+])
+def test_round_trip_through_extras(columns):
+    assert HEADER.unpack_from(encode(*columns))[1] & F_EXTRAS
+    assert round_trip(*columns) == columns
+
+
+def test_round_trip_float_stacks():
+    # No decimal scale stores these exactly, so they go in as float64
+    columns = (["AhKh", "QsQd"], [], [], [1 / 3, float("inf")], 0)
+    assert round_trip(*columns) == columns
+
+
+def test_amount_types_survive():
+    _, actions, _, _, _ = round_trip(["AhKh"], ACTIONS[:2], [], [1.0], 0)
+    assert type(actions[0]["amount"]) is int
+    assert type(actions[1]["amount"]) is float
+
+
+def test_rejects_unknown_version():
+    blob = bytearray(encode(PLAYERS, ACTIONS, [], [1.0], 0))
+    blob[0] = 99
+    with pytest.raises(ValueError):
+        decode(bytes(blob))
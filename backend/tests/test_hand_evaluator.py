@@ -0,0 +1,66 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+from pokerkit import Card, StandardHighHand
+
+from poker_backend.evaluator.cards import encode_cards, int_to_card
+from poker_backend.evaluator.crosscheck import check_hands
+from poker_backend.evaluator.hand_evaluator import category, evaluate, evaluate_batch
+from poker_backend.evaluator.pokerkit_hands import FastHighHand
+
+
+def random_hands(n: int, size: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.argsort(rng.random((n, 52)), axis=1)[:, :size]
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_order_matches_pokerkit(size):
+    assert check_hands(random_hands(5000, size, seed=size)) == 0
+
+
+def test_order_matches_pokerkit_on_every_category():
+    # Hands near each category boundary, where an off-by-one in the tables would show
+    hands = [
+        "2c3d4h5s7c", "Ac2d3h4s5c", "2c3d4h5s6c", "As2s3s4s5s", "9hThJhQhKh", "AhKhQhJhTh",
+        "AcAdKhQsJc", "AcAdKhKsJc", "2c2d2h3s4c", "AcAdAhKsKc", "2c2d2h2s3c", "AcAdAhAsKc",
+        "2h3h4h5h7h", "AhKhQhJh9h", "KcKdKhAsAc", "3c3d4h4s5c",
+    ]
+    assert check_hands(np.array([encode_cards(h) for h in hands])) == 0
+
+
+def test_exhaustive_five_card_slice_matches_pokerkit():
+    # Every 5-card hand from 18 cards: all categories, including straights and flushes
+    deck = [c for c in range(52) if c >> 2 in (0, 1, 2, 3, 12, 11) and c & 3 != 2]
+    assert check_hands(np.array(list(combinations(deck, 5)))) == 0
+
+
+def test_scalar_and_batch_agree_and_accept_compact_decks():
+    hands = random_hands(2000, 7, seed=11)
+    batch = evaluate_batch(hands.astype(np.int8))
+    assert [evaluate(h.tolist()) for h in hands] == batch.tolist()
+
+
+def test_categories_and_ties():
+    assert category(evaluate("AhKhQhJhTh")) == "straight_flush"
+    assert category(evaluate("Ac2d3h4s5c")) == "straight"
+    assert evaluate("Ac2d3h4s5c") < evaluate("2c3d4h5s6c")
+    assert evaluate("AhKdQc9s7h2c3d") == evaluate("AsKcQd9h7c2h3s")
+    with pytest.raises(ValueError):
+        evaluate("AhAhKdQc9s")
+
+
+def test_fast_high_hand_ranks_like_pokerkit():
+    deck = list(Card.parse("".join(int_to_card(i) for i in range(52))))
+    for row in random_hands(300, 14, seed=3):
+        board = [deck[i] for i in row[:5]]
+        a, b = [deck[i] for i in row[5:7]], [deck[i] for i in row[7:9]]
+        fast = FastHighHand.from_game(a, board), FastHighHand.from_game(b, board)
+        slow = StandardHighHand.from_game(a, board), StandardHighHand.from_game(b, board)
+        assert (fast[0] < fast[1], fast[0] == fast[1]) == (slow[0] < slow[1], slow[0] == slow[1])
+        assert fast[0].cards == tuple(a + board)
+
+
+def test_fast_high_hand_rejects_unknown_cards():
+    assert FastHighHand.from_game_or_none("????", "AhKhQh") is None
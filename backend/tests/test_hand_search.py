@@ -0,0 +1,50 @@
+import pytest
+
+from poker_backend.repositories.hand_search import HandSearch, search_actions
+
+ACTIONS = [
+    {"type": "raise", "seat": 0, "street": "preflop", "amount": 300},
+    {"type": "call", "seat": 1, "street": "preflop", "amount": 300},
+    {"type": "call", "seat": 2, "street": "preflop", "amount": 300},
+    {"deal_board": "Jh7c2h", "street": "flop"},
+    {"type": "bet", "seat": 0, "street": "flop", "amount": 500, "all_in": True, "note": "snap"},
+    {"type": "fold"},
+    "check",
+    {"deal_board": "9s"},
+]
+
+
+def test_search_actions_keeps_distinct_searchable_keys():
+    assert search_actions(ACTIONS) == [
+        {"street": "preflop", "type": "raise"},
+        {"street": "preflop", "type": "call"},
+        {"street": "flop", "type": "bet", "all_in": True},
+        {"type": "fold"},
+    ]
+    assert search_actions([]) == [] and search_actions([{"seat": 1, "amount": 5}]) == []
+
+
+def contains(stored, obj):
+    """Postgres' ``actions @> '[obj]'`` on a list of flat objects."""
+    return any(all(a.get(k) == v for k, v in obj.items()) for a in stored)
+
+
+@pytest.mark.parametrize("params", [
+    {"street": "preflop", "action_type": "call"},
+    {"street": "flop", "all_in": True},
+    {"action_type": "fold"},
+    {"action": '{"street": "flop", "type": "bet"}'},
+    {"street": "river"},
+    {"action_type": "check"},
+])
+def test_projection_answers_filters_like_the_full_actions(params):
+    search = HandSearch.from_params(**params)
+    for group in search.action_groups:
+        full = any(contains([a for a in ACTIONS if isinstance(a, dict) and "deal_board" not in a], o) for o in group)
+        assert any(contains(search_actions(ACTIONS), o) for o in group) == full
+
+
+@pytest.mark.parametrize("action", ['{"amount": 300}', '{"street": "flop", "seat": 0}', "[]", "{}", "not json"])
+def test_rejects_action_filters_outside_the_projection(action):
+    with pytest.raises(ValueError):
+        HandSearch.from_params(action=action)
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+from poker_backend.models.hand import Hand
+from poker_backend.services.hand_stats import StatsBuffer, StatsDelta
+
+HOUR = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+class FakeStatsRepo:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.applied = StatsDelta()
+        self.calls = 0
+
+    def apply(self, delta: StatsDelta):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database down")
+        self.applied.merge(delta)
+
+
+def hands(n: int, minute: int = 0):
+    return [
+        Hand(None, ["AhKh", "7c2d"], [{"type": "fold", "seat": 0, "street": "preflop"}], [], [100.0, 100.0], 1,
+             created_at=HOUR.replace(minute=minute))
+        for _ in range(n)
+    ]
+
+
+def test_buffered_counts_match_direct_counts():
+    repo = FakeStatsRepo()
+    buffer = StatsBuffer(repo, interval=60)
+    buffer.add(hands(3))
+    buffer.add(hands(2, minute=30))
+    buffer.add([])
+    assert repo.calls == 0 and buffer.stats()["pending_hands"] == 5
+
+    assert buffer.flush() == 5
+    direct = StatsDelta.from_hands(hands(3) + hands(2, minute=30))
+    assert repo.applied.bucket_rows() == direct.bucket_rows() == [(HOUR, 5, 0, 0.0)]
+    assert repo.applied.seat_rows() == direct.seat_rows()
+    assert repo.applied.action_rows() == direct.action_rows()
+    # One transaction per flush, however many inserts fed it
+    assert repo.calls == 1 and buffer.flush() == 0 and repo.calls == 1
+
+
+def test_failed_flush_keeps_counts():
+    repo = FakeStatsRepo(failures=1)
+    buffer = StatsBuffer(repo, interval=60)
+    buffer.add(hands(4))
+    assert buffer.flush() == 0
+    buffer.add(hands(1))
+    assert buffer.stats()["pending_hands"] == 5 and buffer.stats()["failures"] == 1
+    assert buffer.flush() == 5
+    assert repo.applied.bucket_rows() == [(HOUR, 5, 0, 0.0)]
+
+
+def test_background_flush_and_stop():
+    repo = FakeStatsRepo()
+    buffer = StatsBuffer(repo, interval=0.01)
+    buffer.start()
+    buffer.add(hands(2))
+    buffer.stop()
+    buffer.add(hands(1))
+    buffer.stop()
+    assert repo.applied.bucket_rows() == [(HOUR, 3, 0, 0.0)]
+    assert buffer.stats()["pending_hands"] == 0
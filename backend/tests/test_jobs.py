@@ -0,0 +1,92 @@
+import threading
+import time
+
+import psycopg
+
+from poker_backend.repositories.job_repository import ClaimedTask
+from poker_backend.services.jobs import JobWorker
+
+
+class FakeRepo:
+    """One task whose failed attempts are queued again after ``backoff`` seconds."""
+
+    def __init__(self, backoff: float):
+        self.backoff = backoff
+        self.available_at = time.monotonic()
+        self.attempts = 0
+        self.done = False
+
+    def reap(self):
+        return 0
+
+    def claim(self, worker, limit, visibility):
+        if self.done or time.monotonic() < self.available_at:
+            return []
+        self.attempts += 1
+        return [ClaimedTask("job", 0, self.attempts, "flaky", 3, {})]
+
+    def fail(self, worker, task, error, retry_after):
+        self.available_at = time.monotonic() + self.backoff
+        return "queued"
+
+    def complete(self, worker, task, entries):
+        self.done = True
+        return True
+
+    def extend(self, worker, tasks, visibility):
+        return len(tasks)
+
+    def next_available(self):
+        return None if self.done else self.available_at - time.monotonic()
+
+
+class FakeListener:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query):
+        pass
+
+    def notifies(self, timeout, stop_after):
+        time.sleep(timeout)
+        return iter(())
+
+
+def test_draining_worker_waits_for_a_retry_in_backoff(monkeypatch):
+    from poker_backend.services import jobs
+
+    def flaky(payload):
+        if repo.attempts == 1:
+            raise RuntimeError("boom")
+        return [{"index": 0, "ok": True, "result": 1}]
+
+    monkeypatch.setitem(jobs.JOB_KINDS, "flaky", jobs.JobKind(None, flaky))
+    monkeypatch.setattr(psycopg, "connect", lambda *a, **k: FakeListener())
+    repo = FakeRepo(backoff=0.3)
+    worker = JobWorker(repo, "w", visibility=3, poll_interval=5)
+
+    started = time.monotonic()
+    worker.run_forever(threading.Event(), "", drain=True)
+
+    assert (worker.failed, worker.completed, repo.attempts) == (1, 1, 2)
+    # Slept until the retry was due, not for the whole poll interval
+    assert 0.3 <= time.monotonic() - started < 2
+
+
+def test_idle_timeout():
+    repo = FakeRepo(backoff=0)
+    worker = JobWorker(repo, "w", poll_interval=2)
+    assert worker._idle_timeout(drain=False) == 2
+
+    repo.available_at = time.monotonic() + 60  # a lease held elsewhere
+    assert worker._idle_timeout(drain=True) == 2
+
+    repo.available_at = time.monotonic() - 1  # due now: reap on the next claim
+    worker._next_reap = float("inf")
+    assert worker._idle_timeout(drain=True) == 0.1 and worker._next_reap == 0
+
+    repo.done = True
+    assert worker._idle_timeout(drain=True) is None
@@ -0,0 +1,52 @@
+import io
+import json
+
+import pytest
+
+from poker_backend.importers import json_dump
+from poker_backend.importers.json_dump import iter_json_records
+
+
+def hand(i: int) -> str:
+    # Strings with brackets, braces and escaped quotes must not end an element early
+    return json.dumps({
+        "players": [f'p{i} "}}]', "b"], "actions": [{"type": "call"}], "stacks": [100, 100],
+        "board_cards": [], "winner_index": 0,
+    })
+
+
+@pytest.fixture(params=[1 << 20, 7], ids=["one-read", "small-reads"])
+def read_size(request, monkeypatch):
+    monkeypatch.setattr(json_dump, "READ_SIZE", request.param)
+
+
+def records(data: str, start: int = 0):
+    return list(iter_json_records(io.BytesIO(data.encode()), start))
+
+
+def test_malformed_element_is_quarantined_alone(read_size):
+    data = "[" + ", ".join([hand(0), '{"actions": [}', hand(1), hand(2), hand(3)]) + "]"
+    out = records(data)
+
+    assert [r.hand is not None for r in out] == [True, False, True, True, True]
+    bad = out[1]
+    assert bad.raw == '{"actions": [}' and bad.error
+    assert data.encode()[bad.start:bad.end].decode() == bad.raw
+    assert [r.hand.players[0] for r in out if r.hand] == ['p0 "}]', 'p1 "}]', 'p2 "}]', 'p3 "}]']
+
+
+def test_invalid_scalar_and_stray_brace_are_quarantined(read_size):
+    out = records("[" + ", ".join([hand(0), "nope", "}", hand(1)]) + "]")
+    assert [r.hand is not None for r in out] == [True, False, False, True]
+
+
+def test_truncated_tail_is_reported(read_size):
+    out = records("[" + hand(0) + ", " + hand(1)[:-10])
+    assert [r.hand is not None for r in out] == [True, False]
+    assert out[1].error == "Truncated JSON array element"
+
+
+def test_resumes_from_a_record_end(read_size):
+    data = "[" + ", ".join(hand(i) for i in range(3)) + "]"
+    first = records(data)[0]
+    assert [r.hand.players[0] for r in records(data, first.end)] == ['p1 "}]', 'p2 "}]']
@@ -0,0 +1,57 @@
+import asyncio
+
+from poker_backend.routes.live_routes import _send
+from poker_backend.services.live_tables import Subscriber
+
+
+class SlowSocket:
+    """A client that reads nothing until ``release`` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.sent = []
+        self.closed = None
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = code
+
+
+def test_overflow_closes_without_sending_the_backlog():
+    async def scenario():
+        socket, sub = SlowSocket(), Subscriber(max_queue=3)
+        sub.sender = asyncio.create_task(_send(socket, sub))
+        assert sub.push("m0")
+        await asyncio.sleep(0)  # the sender takes m0 and blocks writing it
+        assert all(sub.push(f"m{i}") for i in range(1, 4))
+        assert not sub.push("m4")
+        assert sub.dropped and sub.queue.empty()
+
+        socket.release.set()
+        await asyncio.wait_for(sub.sender, 1)
+        return socket, sub
+
+    socket, sub = asyncio.run(scenario())
+    assert socket.closed == 1013
+    assert socket.sent == []
+    assert not sub.push("late")
+
+
+def test_sender_keeps_order_while_under_the_limit():
+    async def scenario():
+        socket, sub = SlowSocket(), Subscriber(max_queue=8)
+        socket.release.set()
+        sub.sender = asyncio.create_task(_send(socket, sub))
+        for i in range(20):
+            assert sub.push(f"m{i}")
+            await asyncio.sleep(0)
+        while not sub.queue.empty():
+            await asyncio.sleep(0)
+        sub.sender.cancel()
+        return socket
+
+    socket = asyncio.run(scenario())
+    assert socket.sent == [f"m{i}" for i in range(20)] and socket.closed is None
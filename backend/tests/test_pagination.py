@@ -0,0 +1,33 @@
+import base64
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from poker_backend.routes.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc)
+    hand_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, hand_id)) == (created_at, str(hand_id))
+    assert decode_cursor(None) is None and decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor("2026-03-01T12:00:00+00:00"),
+    raw_cursor("yesterday|" + str(uuid.uuid4())),
+    raw_cursor("2026-03-01T12:00:00+00:00|not-a-uuid"),
+    raw_cursor("2026-03-01T12:00:00+00:00|"),
+    raw_cursor("2026-03-01T12:00:00+00:00|1; DROP TABLE hands"),
+])
+def test_bad_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
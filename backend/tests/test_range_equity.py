@@ -0,0 +1,81 @@
+import pytest
+
+from poker_backend.services.range_equity import RangeEquityCache, RangeEquityService
+
+SPOT = {"board": ["Kh", "7c", "2d"], "hero": "AA, KQs, 77", "villain": "KK-QQ, AKo, T9s"}
+
+
+@pytest.fixture
+def service():
+    return RangeEquityService(RangeEquityCache(max_entries=16, max_bytes=16 * 1024 * 1024))
+
+
+def classes(side):
+    return {h["hand"]: h["equity"] for h in side["hands"]}
+
+
+def test_isomorphic_board_is_a_cache_hit(service):
+    first, status = service.calculate(SPOT)
+    assert status == "miss" and first["method"] == "exact" and first["complete"]
+
+    # The same flop with the suits relabeled
+    second, status = service.calculate({**SPOT, "board": ["Ks", "7d", "2c"]})
+    assert status == "hit"
+    assert second["hero"]["equity"] == first["hero"]["equity"]
+    assert classes(second["hero"]) == classes(first["hero"])
+    assert classes(second["villain"]) == classes(first["villain"])
+    assert second["board"] == ["Ks", "7d", "2c"]
+    assert service.cache.stats()["entries"] == 1
+
+
+def test_swapped_ranges_are_a_cache_hit(service):
+    first, _ = service.calculate(SPOT)
+    swapped, status = service.calculate({**SPOT, "board": ["2s", "7h", "Kc"],
+                                         "hero": SPOT["villain"], "villain": SPOT["hero"]})
+    assert status == "hit"
+    assert swapped["hero"]["equity"] == pytest.approx(1 - first["hero"]["equity"], abs=1e-5)
+    assert classes(swapped["hero"]) == classes(first["villain"])
+    assert classes(swapped["villain"]) == classes(first["hero"])
+
+
+def test_weights_are_applied_on_read(service):
+    first, _ = service.calculate(SPOT)
+    weighted, status = service.calculate({**SPOT, "hero": "AA:0.5, KQs, 77:0.25"})
+    assert status == "hit"
+    assert weighted["hero"]["equity"] != first["hero"]["equity"]
+    assert classes(weighted["hero"]) == classes(first["hero"])
+
+
+def test_matrix_rows_follow_request_order(service):
+    first, _ = service.calculate({**SPOT, "matrix": True})
+    relabeled, _ = service.calculate({**SPOT, "board": ["Ks", "7d", "2c"], "matrix": True})
+    assert len(first["matrix"]["hero"]) == first["hero"]["combos"]
+
+    # Kh7c2d -> Ks7d2c relabels h->s, c->d, d->c, s->h; each cell moves with its combos
+    suits = str.maketrans("hcds", "sdch")
+
+    def cells(result, relabel=False):
+        m = result["matrix"]
+        hero = [h.translate(suits) if relabel else h for h in m["hero"]]
+        villain = [v.translate(suits) if relabel else v for v in m["villain"]]
+        return {(frozenset((h[:2], h[2:])), frozenset((v[:2], v[2:]))): x
+                for h, row in zip(hero, m["equity"]) for v, x in zip(villain, row)}
+
+    assert cells(first, relabel=True) == cells(relabeled)
+
+
+def test_other_spot_is_a_miss(service):
+    service.calculate(SPOT)
+    _, status = service.calculate({**SPOT, "board": ["Kh", "7h", "2d"]})
+    assert status == "miss"
+
+
+@pytest.mark.parametrize("data", [
+    {**SPOT, "board": ["Kh", "7c"]},
+    {**SPOT, "board": ["Kh", "7c", "Kh"]},
+    {**SPOT, "hero": "KhKs"},
+    {"board": SPOT["board"], "hero": "AA"},
+])
+def test_rejects_bad_spots(service, data):
+    with pytest.raises(ValueError):
+        service.calculate(data)
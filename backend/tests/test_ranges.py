@@ -0,0 +1,62 @@
+import pytest
+
+from poker_backend.evaluator.cards import encode_cards
+from poker_backend.services.ranges import TOTAL_COMBOS, combo_label, parse_range, remove_cards, to_arrays
+
+
+def labels(text, ranking=None):
+    return {combo_label(c) for c in parse_range(text, ranking)}
+
+
+@pytest.mark.parametrize("text, count", [
+    ("AA", 6), ("AKs", 4), ("AKo", 12), ("AK", 16), ("ka", 16),
+    ("TT+", 30), ("A2s+", 48), ("K9o+", 48),
+    ("TT-77", 24), ("77-TT", 24), ("A5s-A2s", 16), ("98s-65s", 16), ("T9-76", 64),
+    ("AhKh", 1), ("random", TOTAL_COMBOS), ("any", TOTAL_COMBOS),
+    ("AA, KK; QQ  JJ", 24), ("AKs, AK", 16),
+])
+def test_token_sizes(text, count):
+    assert len(parse_range(text)) == count
+
+
+def test_token_contents():
+    assert labels("QQ+") == labels("QQ, KK, AA")
+    assert labels("A5s-A3s") == labels("A5s, A4s, A3s")
+    assert labels("98s-76s") == labels("98s, 87s, 76s")
+    assert labels("KTs+") == labels("KQs, KJs, KTs")
+    assert labels("KhAh") == {"AhKh"}
+    assert labels("AhKh") == {"AhKh"}
+
+
+def test_weights():
+    combos = parse_range("AA:0.5, AsAh, KK")
+    assert combos[tuple(sorted(encode_cards("AsAh"), reverse=True))] == 1.0
+    assert sorted(set(combos.values())) == [0.5, 1.0]
+    assert sum(combos.values()) == 5 * 0.5 + 1 + 6
+
+
+def test_percent_tokens_follow_ranking():
+    # Classes taken in ranking order until the share is covered: 22 alone is 0.45%
+    ranking = list(range(169))
+    assert labels("0.4%", ranking) == labels("22")
+    assert labels("0.5%", ranking) == labels("22, 32o")
+    assert labels("0.4%", ranking[::-1]) == labels("AA")
+    with pytest.raises(ValueError, match="preflop equity table"):
+        parse_range("15%")
+
+
+@pytest.mark.parametrize("text", [
+    "", " , ", "AKx", "AAs", "AKs-QJo", "AKs-Q9s", "TT-AKs", "AK+s", "XX", "AhAh",
+    "AA:0", "AA:1.5", "AA:x", "x%", "0%", "101%", "AhKhQh", None, 42,
+])
+def test_rejects_invalid_ranges(text):
+    with pytest.raises(ValueError):
+        parse_range(text, list(range(169)))
+
+
+def test_remove_cards_and_arrays():
+    kept, removed = remove_cards(parse_range("AA, AKs"), encode_cards("Ah"))
+    assert removed == 3 + 1 and len(kept) == 3 + 3
+    combos, weights = to_arrays(kept)
+    assert combos.shape == (6, 2) and (combos[:, 0] > combos[:, 1]).all()
+    assert weights.tolist() == [1.0] * 6
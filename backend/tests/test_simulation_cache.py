@@ -0,0 +1,52 @@
+import json
+
+from poker_backend.services.poker_service import PokerSimulationService
+from poker_backend.services.simulation_cache import SimulationCache
+
+# Everyone limps, the big blind checks, then the flop comes
+FLOP_HAND = {
+    "players": [["Ah", "Kh"], ["Qs", "Qd"], ["9c", "9d"], ["8s", "7s"], ["5c", "4c"], ["Tc", "Td"]],
+    "actions": [{"type": "call"}] * 5 + [{"type": "check"}, {"deal_board": "Jh7c2h"}],
+}
+
+
+class FakeSharedRepo:
+    """Stands in for SimulationCacheRepository: results round-trip through JSON like the JSONB column."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def get(self, key):
+        text = self.rows.get(key)
+        return json.loads(text) if text is not None else None
+
+    def put(self, key, result):
+        self.rows.setdefault(key, json.dumps(result))
+
+
+def test_flop_hand_is_stored_in_the_shared_tier():
+    repo = FakeSharedRepo()
+    cache = SimulationCache(max_entries=10, max_bytes=1 << 20, shared=repo)
+
+    result, status = cache.get_or_simulate(FLOP_HAND, PokerSimulationService.simulate_hand)
+
+    assert status == "miss"
+    assert result["board"] == ["Jh", "7c", "2h"]
+    assert cache.stats()["shared_errors"] == 0
+    assert len(repo.rows) == 1
+
+
+def test_shared_hit_has_the_same_shape_as_a_miss():
+    repo = FakeSharedRepo()
+    first = SimulationCache(max_entries=10, max_bytes=1 << 20, shared=repo)
+    missed, _ = first.get_or_simulate(FLOP_HAND, PokerSimulationService.simulate_hand)
+    remembered, status = first.get_or_simulate(FLOP_HAND, PokerSimulationService.simulate_hand)
+    assert status == "hit"
+
+    # Another worker: empty LRU, same shared table
+    second = SimulationCache(max_entries=10, max_bytes=1 << 20, shared=repo)
+    shared, status = second.get_or_simulate(FLOP_HAND, PokerSimulationService.simulate_hand)
+
+    assert status == "hit"
+    assert second.stats()["shared_hits"] == 1
+    assert shared == missed == remembered
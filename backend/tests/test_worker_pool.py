@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from poker_backend.services import batch_service, worker_pool
+from poker_backend.services.batch_service import BatchSimulationService
+
+HAND = {
+    "players": [["Ah", "Kh"], ["Qs", "Qd"], ["9c", "9d"]],
+    "actions": [{"type": "call"}] * 2 + [{"type": "check"}, {"deal_board": "Jh7c2h"}],
+}
+
+
+def crash_once(marker: str, value: int) -> int:
+    """Kills its worker process the first time any task runs it with ``marker``."""
+    try:
+        fd = os.open(marker, os.O_CREAT | os.O_EXCL)
+    except FileExistsError:
+        return value * 2
+    os.close(fd)
+    os._exit(1)
+
+
+def always_crash(value: int) -> int:
+    os._exit(1)
+
+
+def crash_chunk_once(start, hands):
+    crash_once(os.environ["CRASH_MARKER"], 0)
+    return [{"index": start + i, "ok": True, "result": None} for i in range(len(hands))]
+
+
+@pytest.fixture(autouse=True)
+def small_pool(monkeypatch):
+    monkeypatch.setenv("SIM_POOL_WORKERS", "2")
+    worker_pool.shutdown_process_pool()
+    yield
+    worker_pool.shutdown_process_pool()
+
+
+def test_run_tasks_retries_on_a_new_pool(tmp_path):
+    first = worker_pool.get_process_pool()
+    marker = str(tmp_path / "crashed")
+    assert worker_pool.run_tasks((crash_once, marker, v) for v in range(6)) == [0, 2, 4, 6, 8, 10]
+    assert worker_pool.get_process_pool() is not first
+    assert worker_pool.run_tasks([(pow, 2, 10)]) == [1024]
+
+
+def test_run_tasks_gives_up_after_one_retry():
+    with pytest.raises(worker_pool.BrokenProcessPool):
+        worker_pool.run_tasks([(always_crash, 1)])
+    # The next caller gets a working pool, not the broken one
+    assert worker_pool.run_tasks([(pow, 3, 2)]) == [9]
+
+
+def test_submit_replaces_a_broken_pool():
+    broken = worker_pool.get_process_pool()
+    with pytest.raises(worker_pool.BrokenProcessPool):
+        broken.submit(always_crash, 1).result()
+    pool, future = worker_pool.submit(pow, 2, 5)
+    assert pool is not broken and future.result() == 32
+
+
+def test_batch_after_a_broken_pool():
+    broken = worker_pool.get_process_pool()
+    with pytest.raises(worker_pool.BrokenProcessPool):
+        broken.submit(always_crash, 1).result()
+    entries = BatchSimulationService.simulate_batch([HAND] * 4, chunk_size=2)
+    assert [e["index"] for e in entries] == [0, 1, 2, 3]
+    assert all(e["ok"] for e in entries), entries
+
+
+def test_batch_retries_chunks_lost_with_a_worker(monkeypatch, tmp_path):
+    monkeypatch.setenv("CRASH_MARKER", str(tmp_path / "crashed"))
+    monkeypatch.setattr(batch_service, "_simulate_chunk", crash_chunk_once)
+    entries = BatchSimulationService.simulate_batch([HAND] * 6, chunk_size=1)
+    assert [e["index"] for e in entries] == list(range(6))
+    assert all(e["ok"] for e in entries), entries
@@ -0,0 +1,74 @@
+import json
+import time
+
+import psycopg
+
+from poker_backend.importers.json_dump import hand_from_dict
+from poker_backend.models.hand import Hand
+from poker_backend.services.write_behind import HandWriteBehind
+
+
+class FakeRepo:
+    """save_hands that rejects any batch holding a hand whose first stack is negative."""
+
+    def __init__(self, outages: int = 0):
+        self.saved = []
+        self.outages = outages
+
+    def save_hands(self, hands):
+        if self.outages:
+            self.outages -= 1
+            raise psycopg.OperationalError("connection refused")
+        if any(h.stacks[0] < 0 for h in hands):
+            raise psycopg.errors.CheckViolation("stacks must be positive")
+        self.saved.extend(hands)
+
+
+def hand(i: int, stack: float = 1000.0) -> Hand:
+    return Hand(None, [f"p{i}"], [{"type": "call"}], [], [stack, 1000.0], 0)
+
+
+def run(writer: HandWriteBehind, hands):
+    writer.start()
+    for h in hands:
+        writer.submit(h)
+    writer.stop(timeout=30)
+
+
+def test_rejected_hands_are_isolated_and_quarantined(tmp_path):
+    repo = FakeRepo()
+    quarantine = tmp_path / "quarantine.ndjson"
+    writer = HandWriteBehind(repo, max_queue=100, batch_size=16, flush_interval=5.0, enqueue_timeout=1.0,
+                             max_attempts=2, quarantine_path=str(quarantine))
+    hands = [hand(i, stack=-1.0 if i in (3, 11) else 1000.0) for i in range(16)]
+
+    run(writer, hands)
+
+    assert sorted(h.players[0] for h in repo.saved) == sorted(f"p{i}" for i in range(16) if i not in (3, 11))
+    records = [json.loads(line) for line in quarantine.read_text().splitlines()]
+    assert sorted(r["players"][0] for r in records) == ["p11", "p3"]
+    assert all("CheckViolation" in r["error"] for r in records)
+    # Quarantined records re-import as the same hands
+    assert {str(hand_from_dict(r).hand_id) for r in records} == {str(hands[3].hand_id), str(hands[11].hand_id)}
+    stats = writer.stats()
+    assert stats["flushed"] == 14 and stats["quarantined"] == 2 and stats["failed"] == 2
+
+
+def test_unreachable_database_is_retried_not_quarantined(tmp_path):
+    repo = FakeRepo(outages=4)
+    quarantine = tmp_path / "quarantine.ndjson"
+    writer = HandWriteBehind(repo, max_queue=100, batch_size=8, flush_interval=0.01, enqueue_timeout=1.0,
+                             max_attempts=2, quarantine_path=str(quarantine))
+
+    writer.start()
+    for i in range(8):
+        writer.submit(hand(i))
+    # Let the running flusher wait out the outage (more failures than max_attempts)
+    deadline = time.monotonic() + 30
+    while writer.stats()["flushed"] < 8 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    writer.stop(timeout=30)
+
+    assert len(repo.saved) == 8
+    assert not quarantine.exists()
+    assert writer.stats()["failed"] == 0